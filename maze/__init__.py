@@ -1,4 +1,13 @@
-from .mainwindow import MainWindow
+from typing import Any
 
 
 __all__ = ["MainWindow"]
+
+
+def __getattr__(name: str) -> Any:
+    # Графический интерфейс импортируется только по запросу, чтобы пакет можно было использовать без PyQt5
+    if name == "MainWindow":
+        from .mainwindow import MainWindow
+        return MainWindow
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,21 +1,32 @@
-import heapq
-import math
-from typing import List, Optional, Set
-from PyQt5.QtCore import pyqtSignal, QPointF, QThread
+import threading
+from typing import Dict, Optional
+from PyQt5.QtCore import pyqtSignal, QObject
 from .cell import Cell
+from .core import (create_solver, PathCache, SearchCancelled, SearchJob, SearchProgress, SearchStats, Solver,
+                   SolverService)
 from .maze import Maze
 
 
-class AStar(QThread):
+class AStar(QObject):
     """
-    Класс, в котором происходит поиск выхода из лабиринта методом A*.
+    Класс, через который графический интерфейс запускает поиск выхода из лабиринта. Сами алгоритмы реализованы в
+    maze.core, а поиск выполняется в рабочем потоке SolverService, так что этот класс только передает результаты в
+    интерфейс. Ход поиска записывается в объект SearchProgress, который интерфейс читает по таймеру, а статистика
+    поиска, найденный путь и ошибки поиска передаются через сигналы. Новый поиск отменяет предыдущий, если тот еще не
+    завершился.
     """
 
-    SLEEP_TIME_MS: int = 10
-    TIMEOUT_MS: int = 100
-    current_cell_signal: pyqtSignal = pyqtSignal(Cell)
+    # Количество ячеек, раскрываемых за один кадр анимации. None - без ограничений, 0 - без анимации
+    ANIMATION_SPEEDS: Dict[str, Optional[int]] = {"Без анимации": 0,
+                                                  "Медленно": 1,
+                                                  "Средне": 20,
+                                                  "Быстро": 500,
+                                                  "Без ограничений": None}
+    DEFAULT_ALGORITHM: str = "astar"
+    DEFAULT_ANIMATION_SPEED: str = "Средне"
+    error_signal: pyqtSignal = pyqtSignal(str)
     final_path_signal: pyqtSignal = pyqtSignal(list)
-    neighbor_cell_signal: pyqtSignal = pyqtSignal(Cell)
+    stats_signal: pyqtSignal = pyqtSignal(SearchStats)
 
     def __init__(self, maze: Maze) -> None:
         """
@@ -23,134 +34,167 @@ class AStar(QThread):
         """
 
         super().__init__()
-        self._closed_cells: Set[QPointF] = set()
-        self._is_alive: bool = True
-        self._is_running: bool = False
+        self._algorithm: str = AStar.DEFAULT_ALGORITHM
+        self._cells_per_batch: Optional[int] = AStar.ANIMATION_SPEEDS[AStar.DEFAULT_ANIMATION_SPEED]
+        self._job: Optional[SearchJob] = None
+        # Защищает пару из текущего поиска и его хода поиска, которую читают обратные вызовы в рабочем потоке
+        self._lock: threading.Lock = threading.Lock()
         self._maze: Maze = maze
-        self._open_cells: List[Cell] = []
+        self._progress: Optional[SearchProgress] = None
+        self._service: SolverService = SolverService(self._create_solver(), cache=PathCache())
 
-    def _add_new_cell(self, cell: Cell, new_g: int, current_cell: Cell) -> None:
+    @property
+    def cache(self) -> PathCache:
         """
-        Добавляем соседний узел в очередь с приоритетами и вычисляем значения g, h и f.
-        :param cell: ячейка, которую нужно добавить в очередь с приоритетами;
-        :param new_g:
-        :param current_cell: текущая ячейка, которая является родительской.
+        :return: кэш найденных путей. Повторный поиск на неизмененной карте тем же алгоритмом возвращает запомненный
+        путь, а после изменения препятствий через Maze меняется хэш карты, и путь ищется заново.
         """
 
-        cell.g = new_g
-        cell.h = math.sqrt((self._maze.finish_cell.x - cell.x) ** 2 + (self._maze.finish_cell.y - cell.y) ** 2)
-        cell.f = cell.g + cell.h
-        cell.parent = current_cell
-        heapq.heappush(self._open_cells, cell)
-        self.neighbor_cell_signal.emit(cell)
+        return self._service.cache
 
-    @staticmethod
-    def _create_path_for_final_cell(cell: Optional[Cell] = None) -> List[Cell]:
+    @property
+    def is_running(self) -> bool:
         """
-        :param cell: финальная ячейка, до которой нужно построить путь.
-        :return: список из ячеек до финальной ячейки.
+        :return: Истина, если поиск запущен и еще не завершился.
         """
 
-        path = []
-        while cell is not None:
-            path.append(cell)
-            cell = cell.parent
+        return self._job is not None and not self._job.done()
 
-        return path[::-1]
+    def _create_solver(self) -> Solver:
+        """
+        :return: объект выбранного алгоритма поиска. Если анимация включена, алгоритм записывает ход поиска в
+        SearchProgress, иначе работает без обратных вызовов.
+        """
+
+        if self._cells_per_batch == 0:
+            return create_solver(self._algorithm)
+
+        return create_solver(self._algorithm, on_current=self._send_current_cell,
+                             on_neighbor=self._send_neighbor_cell)
 
-    def _get_neighbors(self, cell: Cell) -> List[Cell]:
+    def _cancel_search(self) -> None:
+        if self._job is not None:
+            self._job.cancel()
+
+        # Отмененный поиск может ждать, пока интерфейс заберет очередную порцию хода поиска
+        if self._progress is not None:
+            self._progress.release()
+
+    def _get_progress(self) -> Optional[SearchProgress]:
         """
-        :param cell: ячейка, для которой нужно вернуть соседние ячейки.
-        :return: список соседних ячеек.
+        :return: ход текущего поиска или None, если обратный вызов пришел от отмененного поиска. Такой поиск может еще
+        работать в рабочем потоке, когда find_path уже запустил новый, и его ячейки не должны попасть в ход нового
+        поиска.
         """
 
-        neighbors = []
-        for y in range(cell.y - 1, cell.y + 2):
-            for x in range(cell.x - 1, cell.x + 2):
-                if (x == cell.x and y == cell.y or (x != cell.x and y != cell.y) or (x, y) in self._closed_cells or
-                        not self._maze.check_valid_position(x, y)):
-                    continue
+        with self._lock:
+            job, progress = self._job, self._progress
 
-                neighbors.append(Cell(x, y))
+        return progress if job is not None and job is self._service.current_job else None
 
-        return neighbors
+    def _send_path(self, job: SearchJob) -> None:
+        """
+        :param job: завершенный поиск. Вызывается в рабочем потоке сервиса, сигнал передается в поток интерфейса.
+        """
 
-    def _run_astar(self) -> None:
-        self._closed_cells = set()
-        self._open_cells = []
-        if self._maze.start_cell is None or self._maze.finish_cell is None:
-            self._send_path()
-            return
+        with self._lock:
+            current_job = self._job
 
-        heapq.heappush(self._open_cells, self._maze.start_cell)
-        while self._open_cells:
-            current_cell = heapq.heappop(self._open_cells)  # Извлекаем ячейку с наименьшей оценкой f
-            self.current_cell_signal.emit(current_cell)
+        # Отмененный поиск мог успеть завершиться, и его путь относится к прежней карте или прежним препятствиям
+        if job is not current_job or job.future.cancelled() or isinstance(job.future.exception(), SearchCancelled):
+            return
 
-            if current_cell == self._maze.finish_cell:
-                self._send_path(current_cell)
-                return
+        # Исключение из обратного вызова Future никуда не попадает, поэтому ошибка передается в интерфейс явно
+        if job.future.exception() is not None:
+            self.error_signal.emit(str(job.future.exception()))
+            return
 
-            self._closed_cells.add((current_cell.x, current_cell.y))
-            neighbors = self._get_neighbors(current_cell)
-            for neighbor in neighbors:
-                self._update_open_cells(current_cell, neighbor)
+        path = [Cell(x, y) for x, y in job.result().path]
+        self.stats_signal.emit(job.stats)
+        self.final_path_signal.emit(path)
 
-            QThread.msleep(AStar.SLEEP_TIME_MS)
+    def _send_current_cell(self, x: int, y: int) -> None:
+        """
+        :param x: горизонтальная координата раскрытой ячейки;
+        :param y: вертикальная координата раскрытой ячейки.
+        """
 
-        self._send_path()
+        progress = self._get_progress()
+        if progress is not None:
+            progress.add_current(x, y)
 
-    def _send_path(self, cell: Optional[Cell] = None) -> None:
+    def _send_neighbor_cell(self, x: int, y: int) -> None:
         """
-        Метод отправляет путь из лабиринта.
-        :param cell: финальная ячейка из лабиринта.
+        :param x: горизонтальная координата ячейки, добавленной в очередь;
+        :param y: вертикальная координата ячейки, добавленной в очередь.
         """
 
-        path = self._create_path_for_final_cell(cell)
-        self.final_path_signal.emit(path)
+        progress = self._get_progress()
+        if progress is not None:
+            progress.add_neighbor(x, y)
 
-    def _update_old_cell(self, cell: Cell, new_g: int, current_cell: Cell) -> None:
+    def cancel(self) -> None:
         """
-        :param cell: ячейка, которую нужно обновить в очереди с приоритетами;
-        :param new_g:
-        :param current_cell: текущая ячейка, которая является родительской.
+        Метод отменяет идущий поиск, например перед заменой карты. Ход и результат отмененного поиска в интерфейс не
+        передаются.
         """
 
-        # Если новое расстояние до соседнего ячейки меньше, чем старое, обновляем значения g, h и f
-        cell.g = new_g
-        cell.h = math.sqrt((self._maze.finish_cell.x - cell.x) ** 2 + (self._maze.finish_cell.y - cell.y) ** 2)
-        cell.f = cell.g + cell.h
-        cell.parent = current_cell
-        # Обновляем приоритет соседней ячейки в очереди с приоритетами
-        heapq.heapify(self._open_cells)
+        self._cancel_search()
+        with self._lock:
+            self._job, self._progress = None, None
 
-    def _update_open_cells(self, current_cell: Cell, neighbor: Cell) -> None:
+    def find_path(self) -> Optional[SearchProgress]:
         """
-        :param current_cell: текущая ячейка;
-        :param neighbor: соседняя ячейка, которую нужно добавить в очередь с приоритетами.
+        :return: объект, в который будет записываться ход поиска, или None, если анимация выключена или поиск не
+        запущен. Если выбранный алгоритм не может искать путь на карте, поиск не запускается, а ошибка передается
+        через error_signal.
         """
 
-        # Вычисляем расстояние от начального узла до соседнего узла
-        new_g = current_cell.g + 1
+        self.cancel()
+        if self._maze.grid is None:
+            self.final_path_signal.emit([])
+            return None
+
+        # Карту, на которой выбранный алгоритм не работает (например, со стоимостями ячеек для bfs), отклоняем до поиска
+        try:
+            self._service.solver.check_grid(self._maze.grid)
+        except ValueError as exc:
+            self.error_signal.emit(str(exc))
+            return None
 
-        # Если соседний узел уже находится в очереди с приоритетами
-        for cell in self._open_cells:
-            if cell == neighbor and new_g < neighbor.g:
-                self._update_old_cell(cell, new_g, current_cell)
-                return
+        progress = None
+        if self._cells_per_batch != 0:
+            progress = SearchProgress(self._maze.grid.width, self._maze.grid.height, self._cells_per_batch)
 
-        self._add_new_cell(neighbor, new_g, current_cell)
+        # Поиск может начаться сразу после постановки в очередь, поэтому его обратные вызовы ждут, пока поиск и его ход
+        # не будут запомнены
+        with self._lock:
+            self._job = self._service.submit(self._maze.grid, stats=SearchStats())
+            self._progress = progress
+
+        self._job.add_done_callback(self._send_path)
+        return progress
+
+    def set_algorithm(self, name: str) -> None:
+        """
+        :param name: название алгоритма поиска, который будет использоваться при следующем поиске.
+        """
 
-    def find_path(self) -> None:
-        self._is_running = True
+        self._algorithm = name
+        self._service.solver = self._create_solver()
 
-    def run(self) -> None:
-        while self._is_alive:
-            if self._is_running:
-                self._run_astar()
-                self._is_running = False
+    def set_animation_speed(self, name: str) -> None:
+        """
+        :param name: название скорости анимации из ANIMATION_SPEEDS. Новая скорость применяется со следующего поиска.
+        """
 
-            QThread.msleep(AStar.TIMEOUT_MS)
+        self._cells_per_batch = AStar.ANIMATION_SPEEDS[name]
+        self._service.solver = self._create_solver()
 
     def stop(self) -> None:
-        self._is_alive = False
+        """
+        Метод отменяет идущий поиск и останавливает рабочий поток.
+        """
+
+        self._cancel_search()
+        self._service.stop()
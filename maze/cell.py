@@ -3,21 +3,20 @@ from PyQt5.QtCore import QPointF
 
 class Cell:
     """
-    Класс для ячейки.
+    Класс для ячейки. Поиск пути работает с индексами ячеек, поэтому объекты этого класса создаются только для
+    отображения найденного пути и хода поиска.
     """
 
+    __slots__ = ("x", "y")
+
     def __init__(self, x: int, y: int) -> None:
         """
         :param x: горизонтальная координата;
         :param y: вертикальная координата.
         """
 
-        self.parent = None
         self.x: int = x
         self.y: int = y
-        self.g = 0  # Расстояние от начального узла до текущего узла
-        self.h = 0  # Примерное расстояние от текущего узла до конечного узла
-        self.f = 0  # Сумма g и h
 
     def __eq__(self, other) -> bool:
         if hasattr(other, "x") and hasattr(other, "y"):
@@ -25,9 +24,6 @@ class Cell:
 
         return False
 
-    def __lt__(self, other) -> bool:
-        return self.f < other.f
-
     @property
     def point(self) -> QPointF:
         """
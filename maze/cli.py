@@ -0,0 +1,590 @@
+import argparse
+import glob
+import json
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from .core import (BatchSolver, BINARY_EXTENSION, compare_benchmarks, create_solver, format_grid, generate_maze,
+                   get_components, get_generator_names, get_heuristic_names, get_solver_names, Grid, is_binary_map,
+                   MultiTargetSolver, Neighborhood, Position, read_benchmark, read_binary_map, read_grid, read_queries,
+                   run_benchmark, SearchResult, SearchStats, write_benchmark, write_binary_map, write_grid)
+from .core.stats import measure_phase
+from .core.benchmark import (DEFAULT_GENERATORS, DEFAULT_SIZES, DEFAULT_THRESHOLD, run_startup_benchmark,
+                             STARTUP_TARGETS)
+
+
+PHASE_TITLES = {"components": "поиск областей", "parse": "чтение карты", "search": "поиск", "solve": "решение"}
+
+
+def _add_solver_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    :param parser: разборщик аргументов, в который нужно добавить параметры алгоритмов поиска.
+    """
+
+    parser.add_argument("--connectivity", type=int, default=4, choices=(4, 8),
+                        help="количество соседей ячейки (по умолчанию 4)")
+    parser.add_argument("--corner-cutting", default="never", choices=Neighborhood.CORNER_CUTTING_POLICIES,
+                        help="правило срезания углов при диагональных шагах (по умолчанию never)")
+    parser.add_argument("--heuristic", choices=get_heuristic_names(),
+                        help="эвристика (по умолчанию manhattan для 4 соседей и octile для 8 соседей; manhattan "
+                             "допускается только для 4 соседей)")
+    parser.add_argument("--weight", type=float, default=1.0,
+                        help="вес эвристики; при весе больше 1 путь может быть длиннее кратчайшего (по умолчанию 1)")
+
+
+def _components(args: argparse.Namespace) -> int:
+    """
+    :param args: аргументы командной строки.
+    :return: код завершения: 0, если вход и выход находятся в одной области.
+    """
+
+    try:
+        grid = read_grid(args.map)
+    except (OSError, ValueError) as exc:
+        print(f"ошибка: {_format_file_error(args.map, exc)}", file=sys.stderr)
+        return 2
+
+    components = get_components(grid, Neighborhood(args.connectivity, args.corner_cutting))
+    marks = {}
+    for name, positions in (("A", grid.starts), ("B", grid.finishes)):
+        for position in positions:
+            marks.setdefault(components.get_label(*position), []).append(name)
+
+    print(f"областей: {components.count}")
+    order = sorted(range(components.count), key=lambda label: -components.sizes[label])
+    for label in order[:args.limit]:
+        suffix = f" ({', '.join(marks[label])})" if label in marks else ""
+        print(f"область {label}: ячеек {components.sizes[label]}{suffix}")
+
+    if len(order) > args.limit:
+        print(f"... и еще {len(order) - args.limit}")
+
+    return 0 if grid.start and grid.finish and components.are_connected(grid.start, grid.finish) else 1
+
+
+def _convert(args: argparse.Namespace) -> int:
+    """
+    :param args: аргументы командной строки.
+    :return: код завершения.
+    """
+
+    try:
+        if is_binary_map(args.source):
+            grid, path = read_binary_map(args.source)
+        else:
+            grid, path = read_grid(args.source), []
+    except (OSError, ValueError) as exc:
+        print(f"ошибка: {_format_file_error(args.source, exc)}", file=sys.stderr)
+        return 2
+
+    try:
+        _write_map(args.destination, grid, path, args.format)
+    except (OSError, ValueError) as exc:
+        print(f"ошибка: {_format_file_error(args.destination, exc)}", file=sys.stderr)
+        return 2
+
+    return 0
+
+
+def _create_parser() -> argparse.ArgumentParser:
+    """
+    :return: разборщик аргументов командной строки.
+    """
+
+    parser = argparse.ArgumentParser(prog="python -m maze",
+                                     description="Поиск выхода из лабиринта без графического интерфейса.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    solve_parser = subparsers.add_parser("solve", help="найти путь из лабиринта")
+    solve_parser.add_argument("map", help="файл с картой лабиринта")
+    solve_parser.add_argument("-a", "--algorithm", default="astar", choices=get_solver_names(),
+                              help="алгоритм поиска (по умолчанию astar)")
+    solve_parser.add_argument("--draw", action="store_true", help="вывести карту с нарисованным путем")
+    solve_parser.add_argument("--each-start", action="store_true",
+                              help="одним поиском найти путь от каждого входа (A) до ближайшего к нему выхода (B); "
+                                   "ключ -a при этом не используется")
+    solve_parser.add_argument("--stats", action="store_true",
+                              help="вывести статистику поиска: счетчики, размеры множеств и время этапов")
+    solve_parser.add_argument("--stats-json", help="сохранить статистику поиска в файл в формате JSON")
+    solve_parser.add_argument("--trace", help="сохранить время этапов в файл в формате Trace Event (открывается в "
+                                              "chrome://tracing, Perfetto или speedscope)")
+    _add_solver_arguments(solve_parser)
+    solve_parser.set_defaults(handler=_solve)
+
+    compare_parser = subparsers.add_parser("compare", help="найти путь всеми алгоритмами и сравнить длины путей")
+    compare_parser.add_argument("map", help="файл с картой лабиринта")
+    _add_solver_arguments(compare_parser)
+    compare_parser.set_defaults(handler=_compare)
+
+    components_parser = subparsers.add_parser("components", help="вывести связные области лабиринта")
+    components_parser.add_argument("map", help="файл с картой лабиринта")
+    components_parser.add_argument("--limit", type=int, default=10,
+                                   help="сколько самых больших областей вывести (по умолчанию 10)")
+    _add_solver_arguments(components_parser)
+    components_parser.set_defaults(handler=_components)
+
+    convert_parser = subparsers.add_parser("convert", help="сохранить карту в текстовом или двоичном формате")
+    convert_parser.add_argument("source", help="файл с картой лабиринта в любом формате")
+    convert_parser.add_argument("destination", help="файл, в который сохранить карту")
+    convert_parser.add_argument("--format", choices=("binary", "text"),
+                                help=f"формат результата (по умолчанию binary для файлов с расширением "
+                                     f"{BINARY_EXTENSION}, иначе text)")
+    convert_parser.set_defaults(handler=_convert)
+
+    batch_parser = subparsers.add_parser("batch", help="решить много запросов на многих картах, результаты выводятся "
+                                                       "построчно в формате JSON")
+    batch_parser.add_argument("maps", nargs="+", help="файлы с картами (можно использовать шаблоны, например "
+                                                      "maps/*.txt)")
+    batch_parser.add_argument("-a", "--algorithm", default="astar", choices=get_solver_names(),
+                              help="алгоритм поиска (по умолчанию astar)")
+    batch_parser.add_argument("--workers", type=int, help="количество рабочих процессов (по умолчанию количество "
+                                                          "процессоров, 0 - без рабочих процессов)")
+    batch_parser.add_argument("--queries", help="файл с запросами: в каждой строке JSON-объект с полями start и finish "
+                                                "(по умолчанию решается запрос от A до B)")
+    batch_parser.add_argument("--random-queries", type=int, default=0,
+                              help="количество случайных запросов для каждой карты")
+    batch_parser.add_argument("--seed", type=int, help="начальное значение генератора случайных запросов")
+    batch_parser.add_argument("--chunk-size", type=int, default=64,
+                              help="количество запросов в одной задаче для рабочего процесса (по умолчанию 64)")
+    batch_parser.add_argument("--paths", action="store_true", help="добавить найденные пути в результаты")
+    batch_parser.add_argument("--cache", help="каталог кэша путей: при повторном запуске на неизмененных картах "
+                                              "запросы решаются без поиска")
+    _add_solver_arguments(batch_parser)
+    batch_parser.set_defaults(handler=_batch)
+
+    generate_parser = subparsers.add_parser("generate", help="создать карту лабиринта")
+    generate_parser.add_argument("generator", choices=get_generator_names(), help="генератор лабиринта")
+    generate_parser.add_argument("size", type=_parse_size, help="размер карты: WIDTHxHEIGHT или одно число для "
+                                                                "квадратной карты")
+    generate_parser.add_argument("destination", help="файл, в который сохранить карту")
+    generate_parser.add_argument("--seed", type=int, help="начальное значение генератора случайных чисел")
+    generate_parser.add_argument("--density", type=float,
+                                 help="доля препятствий для генератора random (по умолчанию 0.3)")
+    generate_parser.add_argument("--format", choices=("binary", "text"),
+                                 help=f"формат карты (по умолчанию binary для файлов с расширением "
+                                      f"{BINARY_EXTENSION}, иначе text)")
+    generate_parser.set_defaults(handler=_generate)
+
+    benchmark_parser = subparsers.add_parser("benchmark", help="измерить скорость алгоритмов на созданных картах и "
+                                                               "сравнить с прошлым запуском")
+    benchmark_parser.add_argument("-g", "--generators", nargs="+", default=list(DEFAULT_GENERATORS),
+                                  choices=get_generator_names(), help="генераторы лабиринтов (по умолчанию все)")
+    benchmark_parser.add_argument("-s", "--sizes", nargs="+", type=_parse_size, default=list(DEFAULT_SIZES),
+                                  help="размеры карт: WIDTHxHEIGHT или одно число (по умолчанию 64 256 1024)")
+    benchmark_parser.add_argument("-a", "--algorithms", nargs="+", default=["astar"], choices=get_solver_names(),
+                                  help="алгоритмы поиска (по умолчанию astar)")
+    benchmark_parser.add_argument("--seed", type=int, default=0,
+                                  help="начальное значение генераторов лабиринтов (по умолчанию 0)")
+    benchmark_parser.add_argument("--repeats", type=_parse_repeats, default=3,
+                                  help="количество повторов каждого измерения (по умолчанию 3)")
+    benchmark_parser.add_argument("--no-memory", action="store_true", help="не измерять память")
+    benchmark_parser.add_argument("-o", "--output", help="файл, в который сохранить результаты в формате JSON")
+    benchmark_parser.add_argument("--baseline", help="файл с результатами прошлого запуска для поиска ухудшений")
+    benchmark_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                  help=f"допустимое относительное ухудшение (по умолчанию {DEFAULT_THRESHOLD})")
+    _add_solver_arguments(benchmark_parser)
+    benchmark_parser.set_defaults(handler=_benchmark)
+
+    startup_parser = subparsers.add_parser("startup", help="измерить время запуска приложения в новом интерпретаторе")
+    startup_parser.add_argument("-t", "--targets", nargs="+", choices=list(STARTUP_TARGETS),
+                                help="способы запуска: core, cli, gui (импорт интерфейса) и window (создание окна); "
+                                     "по умолчанию все")
+    startup_parser.add_argument("--repeats", type=_parse_repeats, default=5,
+                                help="количество повторов каждого измерения (по умолчанию 5)")
+    startup_parser.add_argument("-o", "--output", help="файл, в который сохранить результаты в формате JSON")
+    startup_parser.set_defaults(handler=_startup)
+
+    return parser
+
+
+def _batch(args: argparse.Namespace) -> int:
+    """
+    :param args: аргументы командной строки.
+    :return: код завершения.
+    """
+
+    map_files = []
+    for pattern in args.maps:
+        # В Windows командная строка не раскрывает шаблоны имен файлов
+        map_files.extend(sorted(glob.glob(pattern)) or [pattern])
+
+    try:
+        queries = read_queries(args.queries) if args.queries else None
+    except (OSError, ValueError) as exc:
+        print(f"ошибка: {_format_file_error(args.queries, exc)}", file=sys.stderr)
+        return 2
+
+    try:
+        batch_solver = BatchSolver(args.algorithm, _get_solver_options(args), args.workers, queries,
+                                   args.random_queries, args.seed, args.chunk_size, args.paths, args.cache)
+    except ValueError as exc:
+        print(f"ошибка: {exc}", file=sys.stderr)
+        return 2
+
+    for record in batch_solver.solve(map_files):
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+
+    return 0
+
+
+def _benchmark(args: argparse.Namespace) -> int:
+    """
+    :param args: аргументы командной строки.
+    :return: код завершения: 1, если по сравнению с прошлым запуском есть ухудшения.
+    """
+
+    try:
+        baseline = read_benchmark(args.baseline) if args.baseline else None
+    except (OSError, ValueError) as exc:
+        print(f"ошибка: {_format_file_error(args.baseline, exc)}", file=sys.stderr)
+        return 2
+
+    print(f"{'генератор':<13}{'размер':>12}{'алгоритм':>15}{'чтение, мс':>12}{'поиск, мс':>12}{'раскрыто':>11}"
+          f"{'память, КиБ':>13}{'длина':>9}")
+
+    def print_record(record: Dict[str, Any]) -> None:
+        size = f"{record['width']}x{record['height']}"
+        if "error" in record:
+            print(f"{record['generator']:<13}{size:>12}{record['algorithm']:>15} пропущен: {record['error']}")
+            return
+
+        memory = f"{record['peak_memory'] / 1024:.1f}" if "peak_memory" in record else "-"
+        length = record["length"] if record["found"] else "-"
+        print(f"{record['generator']:<13}{size:>12}{record['algorithm']:>15}{record['parse_time'] * 1000:>12.3f}"
+              f"{record['search_time'] * 1000:>12.3f}{record['expanded']:>11}{memory:>13}{length:>9}", flush=True)
+
+    data = run_benchmark(args.generators, args.sizes, args.algorithms, args.seed, args.repeats,
+                         _get_solver_options(args), not args.no_memory, print_record)
+    if args.output:
+        write_benchmark(args.output, data)
+
+    if baseline is None:
+        return 0
+
+    regressions = compare_benchmarks(baseline, data, args.threshold)
+    for regression in regressions:
+        generator, width, height, _, algorithm = regression["key"]
+        print(f"ухудшение: {generator} {width}x{height} {algorithm} {regression['metric']}: "
+              f"{regression['baseline']} -> {regression['current']}")
+
+    if not regressions:
+        print("ухудшений нет")
+
+    return 1 if regressions else 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    """
+    :param args: аргументы командной строки.
+    :return: код завершения: 0, если все точные алгоритмы нашли пути одинаковой длины, а приближенные нашли путь
+    тогда же, когда и точные.
+    """
+
+    try:
+        grid = read_grid(args.map)
+    except (OSError, ValueError) as exc:
+        print(f"ошибка: {_format_file_error(args.map, exc)}", file=sys.stderr)
+        return 2
+
+    costs = set()
+    approximate_results = []
+    baselines = []
+    expanded = {}
+    print(f"{'алгоритм':<15}{'найден':>7}{'длина':>10}{'стоимость':>10}{'раскрыто':>12}{'время, мс':>12}")
+    for name in get_solver_names():
+        # Вход и выход передаются явно, чтобы nearest, как и остальные алгоритмы, искал путь от первого входа до первого
+        # выхода. Алгоритмы, которые не поддерживают параметры или стоимости ячеек карты, пропускаются
+        try:
+            solver = create_solver(name, **_get_solver_options(args))
+            result = solver.solve(grid, grid.start, grid.finish)
+        except ValueError as exc:
+            print(f"{name:<15} пропущен: {exc}")
+            continue
+
+        if solver.optimal:
+            costs.add(round(result.cost, 6) if result.found else None)
+        else:
+            approximate_results.append((name, result))
+
+        if solver.BASELINE:
+            baselines.append((name, solver.BASELINE))
+
+        expanded[name] = result.expanded
+
+        found = "да" if result.found else "нет"
+        print(f"{name:<15}{found:>7}{result.length:>10}{result.cost:>10.3f}{result.expanded:>12}"
+              f"{result.elapsed * 1000:>12.3f}")
+
+    if len(costs) > 1:
+        print("ошибка: точные алгоритмы нашли пути разной стоимости")
+        return 1
+
+    # Приближенные алгоритмы сравниваются с точными по стоимости пути, а не проверяются на равенство
+    best_cost = next(iter(costs), None)
+    for name, result in approximate_results:
+        if result.found != (best_cost is not None):
+            print(f"ошибка: {name} {'нашел' if result.found else 'не нашел'} путь, а точные алгоритмы "
+                  f"{'нашли' if best_cost is not None else 'не нашли'}")
+            return 1
+
+        if result.found and best_cost:
+            print(f"{name}: стоимость пути на {max(result.cost / best_cost - 1, 0) * 100:+.1f}% больше кратчайшего")
+
+    for name, baseline in baselines:
+        if expanded.get(baseline):
+            print(f"{name}: раскрыто на {(1 - expanded[name] / expanded[baseline]) * 100:.1f}% меньше ячеек, чем у "
+                  f"{baseline}")
+
+    return 0
+
+
+def _format_file_error(file_name: str, exc: Exception) -> str:
+    """
+    :param file_name: имя файла, который не удалось прочитать или записать;
+    :param exc: исключение, возникшее при чтении или записи.
+    :return: описание ошибки с именем файла.
+    """
+
+    # В тексте OSError имя файла уже есть, поэтому берется только описание причины
+    reason = exc.strerror if isinstance(exc, OSError) and exc.strerror else exc
+    return f"{file_name}: {reason}"
+
+
+def _format_position(position) -> str:
+    """
+    :param position: координаты ячейки.
+    :return: строка с координатами ячейки.
+    """
+
+    return f"({position[0]}, {position[1]})"
+
+
+def _generate(args: argparse.Namespace) -> int:
+    """
+    :param args: аргументы командной строки.
+    :return: код завершения.
+    """
+
+    options = {} if args.density is None else {"density": args.density}
+    try:
+        grid = generate_maze(args.generator, *args.size, args.seed, **options)
+    except (TypeError, ValueError) as exc:
+        print(f"ошибка: {exc}", file=sys.stderr)
+        return 2
+
+    try:
+        _write_map(args.destination, grid, [], args.format)
+    except OSError as exc:
+        print(f"ошибка: {_format_file_error(args.destination, exc)}", file=sys.stderr)
+        return 2
+
+    return 0
+
+
+def _get_solver_options(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    :param args: аргументы командной строки.
+    :return: параметры для конструктора алгоритма поиска.
+    """
+
+    return {"connectivity": args.connectivity,
+            "corner_cutting": args.corner_cutting,
+            "heuristic": args.heuristic,
+            "weight": args.weight}
+
+
+def _parse_repeats(value: str) -> int:
+    """
+    :param value: количество повторов измерения.
+    :return: количество повторов, не меньше 1.
+    """
+
+    try:
+        repeats = int(value)
+    except ValueError:
+        repeats = 0
+
+    if repeats < 1:
+        raise argparse.ArgumentTypeError(f"некорректное количество повторов '{value}', нужно целое число не меньше 1")
+
+    return repeats
+
+
+def _parse_size(value: str) -> Tuple[int, int]:
+    """
+    :param value: размер карты в виде WIDTHxHEIGHT или одного числа для квадратной карты.
+    :return: ширина и высота.
+    """
+
+    try:
+        sizes = [int(part) for part in value.lower().split("x")]
+    except ValueError:
+        sizes = []
+
+    if len(sizes) not in (1, 2) or min(sizes) < 1:
+        raise argparse.ArgumentTypeError(f"некорректный размер '{value}', нужно WIDTHxHEIGHT")
+
+    return sizes[0], sizes[-1]
+
+
+def _print_stats(stats: SearchStats) -> None:
+    """
+    :param stats: статистика поиска.
+    """
+
+    ratio = stats.expansion_ratio
+    print(f"добавлено в очередь: {stats.pushed}")
+    print(f"открыто повторно: {stats.reopened}")
+    print(f"наибольшая очередь: {stats.peak_open}")
+    print(f"наибольшее число закрытых ячеек: {stats.peak_closed}")
+    print(f"раскрыто на ячейку пути: {ratio:.3f}" if ratio is not None else "раскрыто на ячейку пути: -")
+    for name, _, duration, depth in stats.phases:
+        print(f"{'  ' * depth}{PHASE_TITLES.get(name, name)}: {duration * 1000:.3f} мс")
+
+
+def _print_timings(args: argparse.Namespace, result: SearchResult, stats: Optional[SearchStats],
+                   parse_time: float) -> None:
+    """
+    :param args: аргументы командной строки;
+    :param result: результат поиска;
+    :param stats: статистика поиска или None, если она не собиралась;
+    :param parse_time: время чтения карты в секундах.
+    """
+
+    print(f"раскрыто: {result.expanded}")
+    print(f"чтение карты: {parse_time * 1000:.3f} мс")
+    print(f"поиск: {result.elapsed * 1000:.3f} мс")
+    if args.stats:
+        _print_stats(stats)
+
+    if args.stats_json:
+        stats.write_json(args.stats_json)
+
+    if args.trace:
+        stats.write_trace(args.trace)
+
+
+def _solve(args: argparse.Namespace) -> int:
+    """
+    :param args: аргументы командной строки.
+    :return: код завершения.
+    """
+
+    stats = SearchStats() if args.stats or args.stats_json or args.trace else None
+    started_at = time.perf_counter()
+    try:
+        with measure_phase(stats, "parse"):
+            grid = read_grid(args.map)
+    except (OSError, ValueError) as exc:
+        print(f"ошибка: {_format_file_error(args.map, exc)}", file=sys.stderr)
+        return 2
+
+    parse_time = time.perf_counter() - started_at
+
+    try:
+        solver = create_solver("nearest" if args.each_start else args.algorithm, **_get_solver_options(args))
+        solver.check_grid(grid)
+    except ValueError as exc:
+        print(f"ошибка: {exc}", file=sys.stderr)
+        return 2
+
+    if args.each_start:
+        return _solve_each(args, grid, solver, stats, parse_time)
+
+    result = solver.solve(grid, stats=stats)
+    if result.found:
+        print("путь:", " ".join(_format_position(position) for position in result.path))
+        print(f"длина: {result.length}")
+        print(f"стоимость: {result.cost:.3f}")
+        if not solver.optimal:
+            print("путь может быть длиннее кратчайшего")
+    elif grid.start and grid.finish and not get_components(grid, solver.neighborhood).are_connected(
+            grid.start, grid.finish):
+        print("путь: не найден (вход и выход находятся в разных областях)")
+    else:
+        print("путь: не найден")
+
+    _print_timings(args, result, stats, parse_time)
+    if args.draw:
+        print(format_grid(grid, result.path))
+
+    return 0 if result.found else 1
+
+
+def _solve_each(args: argparse.Namespace, grid: Grid, solver: MultiTargetSolver, stats: Optional[SearchStats],
+                parse_time: float) -> int:
+    """
+    :param args: аргументы командной строки;
+    :param grid: сетка лабиринта;
+    :param solver: алгоритм поиска для нескольких входов и выходов;
+    :param stats: объект для статистики поиска;
+    :param parse_time: время чтения карты в секундах.
+    :return: код завершения: 0, если путь найден от каждого входа.
+    """
+
+    results = solver.solve_each(grid, stats=stats)
+    for start, result in zip(grid.starts, results):
+        if result.found:
+            print(f"{_format_position(start)} -> {_format_position(result.path[-1])}: длина {result.length}, "
+                  f"стоимость {result.cost:.3f}")
+        else:
+            print(f"{_format_position(start)}: не найден")
+
+    summary = results[0] if results else SearchResult([])
+    _print_timings(args, summary, stats, parse_time)
+    if args.draw:
+        print(format_grid(grid, [position for result in results for position in result.path]))
+
+    return 0 if results and all(result.found for result in results) else 1
+
+
+def _startup(args: argparse.Namespace) -> int:
+    """
+    :param args: аргументы командной строки.
+    :return: код завершения.
+    """
+
+    print(f"{'способ':<10}{'время, мс':>13}{'процесс, мс':>13}")
+
+    def print_record(record: Dict[str, Any]) -> None:
+        if "error" in record:
+            print(f"{record['target']:<10} пропущен: {record['error']}")
+            return
+
+        print(f"{record['target']:<10}{record['startup_time'] * 1000:>13.1f}{record['process_time'] * 1000:>13.1f}",
+              flush=True)
+
+    data = run_startup_benchmark(args.targets, args.repeats, print_record)
+    if args.output:
+        write_benchmark(args.output, data)
+
+    return 0
+
+
+def _write_map(file_name: str, grid: Grid, path: List[Position], output_format: Optional[str]) -> None:
+    """
+    :param file_name: имя файла, в который нужно сохранить карту;
+    :param grid: сетка лабиринта;
+    :param path: путь, который нужно сохранить вместе с картой;
+    :param output_format: формат карты: binary или text. Если не задан, выбирается по расширению файла.
+    """
+
+    output_format = output_format or ("binary" if file_name.lower().endswith(BINARY_EXTENSION) else "text")
+    if output_format == "binary":
+        write_binary_map(file_name, grid, path)
+    else:
+        write_grid(file_name, grid, path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    :param argv: аргументы командной строки.
+    :return: код завершения.
+    """
+
+    args = _create_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
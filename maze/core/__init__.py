@@ -0,0 +1,41 @@
+from .astar import AStarSolver, DijkstraSolver
+from .batch import BatchSolver, create_random_queries, get_default_queries, Query, read_queries
+from .benchmark import compare_benchmarks, read_benchmark, run_benchmark, write_benchmark
+from .bfs import BfsSolver
+from .bidirectional import BidirectionalAStarSolver
+from .binary import BINARY_EXTENSION, is_binary_map, parse_binary, read_binary_map, write_binary_map
+from .cancel import CancelToken, SearchCancelled, SearchTimeout
+from .components import Components, get_components, label_components, NO_COMPONENT
+from .contraction import CorridorGraph, CorridorSolver, get_corridor_graph
+from .distance import (compute_distance_field, DistanceField, DistanceFieldSolver, get_distance_field,
+                       UNREACHABLE, WavefrontSolver)
+from .dstarlite import DStarLiteSolver
+from .generators import generate_maze, GENERATORS, get_generator_names
+from .grid import Grid, Position
+from .heuristics import get_heuristic_names, Heuristic, HEURISTICS
+from .hpa import ClusterGraph, get_cluster_graph, HpaCorridorSolver, HpaSolver
+from .jps import JpsSolver
+from .landmarks import AltSolver, get_landmarks, Landmarks
+from .multitarget import MultiTargetSolver
+from .neighborhood import Neighborhood
+from .openset import OpenSet
+from .parser import format_grid, parse_bytes, parse_text, read_grid, write_grid
+from .pathcache import get_grid_hash, PathCache
+from .progress import SearchProgress
+from .service import SearchJob, SolverService
+from .solver import create_solver, get_path_cost, get_solver_names, register_solver, SearchResult, Solver, SOLVERS
+from .stats import SearchStats
+
+
+__all__ = ["AltSolver", "AStarSolver", "BatchSolver", "BfsSolver", "BidirectionalAStarSolver", "BINARY_EXTENSION",
+           "CancelToken", "ClusterGraph", "compare_benchmarks", "Components", "compute_distance_field", "CorridorGraph",
+           "CorridorSolver", "create_random_queries", "create_solver", "DijkstraSolver", "DistanceField",
+           "DistanceFieldSolver", "DStarLiteSolver", "format_grid", "generate_maze", "GENERATORS", "get_cluster_graph",
+           "get_components", "get_corridor_graph", "get_default_queries", "get_distance_field", "get_generator_names",
+           "get_grid_hash", "get_heuristic_names", "get_landmarks", "get_path_cost", "get_solver_names", "Grid",
+           "Heuristic", "HEURISTICS", "HpaCorridorSolver", "HpaSolver", "is_binary_map", "JpsSolver",
+           "label_components", "Landmarks", "MultiTargetSolver", "Neighborhood", "NO_COMPONENT", "OpenSet",
+           "parse_binary", "parse_bytes", "parse_text", "PathCache", "Position", "Query", "read_benchmark",
+           "read_binary_map", "read_grid", "read_queries", "register_solver", "run_benchmark", "SearchCancelled",
+           "SearchJob", "SearchProgress", "SearchResult", "SearchStats", "SearchTimeout", "Solver", "SOLVERS",
+           "SolverService", "UNREACHABLE", "WavefrontSolver", "write_benchmark", "write_binary_map", "write_grid"]
@@ -0,0 +1,98 @@
+from typing import List, Optional
+from .buffers import Buffer
+from .grid import Grid, Position
+from .openset import OpenSet
+from .solver import register_solver, SearchResult, Solver
+
+
+@register_solver("astar")
+class AStarSolver(Solver):
+    """
+    Класс, в котором происходит поиск выхода из лабиринта методом A*. Ячейки обозначаются индексами y * width + x,
+    значения g, h, родительские ячейки и признаки раскрытия хранятся в плоских хранилищах, а координаты создаются только
+    для итогового пути.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._closed_cells: Optional[Buffer] = None
+        self._finish: Optional[Position] = None
+        self._grid: Optional[Grid] = None
+        self._h_scores: Optional[Buffer] = None
+        self._open_cells: Optional[OpenSet] = None
+        self._parents: Optional[Buffer] = None
+
+    def _create_path_for_final_cell(self, cell: int) -> List[Position]:
+        """
+        :param cell: индекс финальной ячейки, до которой нужно построить путь.
+        :return: список из ячеек до финальной ячейки.
+        """
+
+        return self._create_path(self._grid, self._parents, cell)
+
+    def _get_heuristic(self, cell: int) -> float:
+        """
+        :param cell: индекс ячейки.
+        :return: примерное расстояние от ячейки до выхода. Значение вычисляется один раз для каждой ячейки.
+        """
+
+        h = self._h_scores[cell]
+        if h < 0:
+            x, y = self._grid.position(cell)
+            h = self._heuristic.estimate(x, y, *self._finish)
+            self._h_scores[cell] = h
+
+        return h
+
+    def _search(self, grid: Grid, start: Position, finish: Position) -> SearchResult:
+        self._closed_cells = self._create_buffer(grid, "B", 0)
+        self._finish = finish
+        self._grid = grid
+        self._h_scores = self._create_buffer(grid, "d", -1)
+        self._open_cells = OpenSet(self._get_buffer_size(grid), self._neighborhood.get_typecode(grid))
+        self._parents = self._create_buffer(grid, "i", -1)
+        finish_index = grid.index(*finish)
+        expanded = 0
+
+        start_index = grid.index(*start)
+        self._open_cells.push(start_index, 0, self._get_heuristic(start_index))
+        while self._open_cells:
+            current_cell, current_g = self._open_cells.pop()  # Извлекаем ячейку с наименьшей оценкой f
+            expanded += 1
+            if self._on_current:
+                self._on_current(*grid.position(current_cell))
+
+            if current_cell == finish_index:
+                return SearchResult(self._create_path_for_final_cell(current_cell), expanded)
+
+            self._closed_cells[current_cell] = 1
+            for neighbor, step_cost in self._neighborhood.get_neighbors(grid, current_cell):
+                if not self._closed_cells[neighbor]:
+                    self._update_open_cells(current_cell, current_g + step_cost, neighbor)
+
+        return SearchResult([], expanded)
+
+    def _update_open_cells(self, current_cell: int, new_g: float, neighbor: int) -> None:
+        """
+        :param current_cell: индекс текущей ячейки;
+        :param new_g: расстояние от входа до соседней ячейки через текущую ячейку;
+        :param neighbor: индекс соседней ячейки, которую нужно добавить в очередь с приоритетами.
+        """
+
+        # Если соседний узел уже находится в очереди с приоритетами с меньшим или равным расстоянием, очередь оставит
+        # его без изменений
+        if self._open_cells.push(neighbor, new_g, new_g + self._get_heuristic(neighbor)):
+            self._parents[neighbor] = current_cell
+            if self._on_neighbor:
+                self._on_neighbor(*self._grid.position(neighbor))
+
+
+@register_solver("dijkstra")
+class DijkstraSolver(AStarSolver):
+    """
+    Класс, в котором происходит поиск выхода из лабиринта алгоритмом Дейкстры, то есть методом A* без эвристики.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        kwargs["heuristic"] = "zero"
+        super().__init__(*args, **kwargs)
@@ -0,0 +1,371 @@
+import atexit
+import json
+import os
+import random
+from collections import OrderedDict
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+from typing import Any, Dict, Generator, Iterable, Iterator, List, Optional, Set, Tuple, TYPE_CHECKING
+from .grid import Grid, Position
+from .parser import read_grid
+from .pathcache import PathCache
+from .solver import create_solver, Solver
+
+# Пакет multiprocessing импортируется долго, поэтому импортируется только при пакетном поиске
+if TYPE_CHECKING:
+    from multiprocessing.shared_memory import SharedMemory
+
+
+Query = Tuple[Position, Position]
+_ATTACHED_GRIDS: "OrderedDict[str, Tuple[SharedMemory, List[memoryview], Grid]]" = OrderedDict()
+_MAX_ATTACHED_GRIDS: int = 4
+_WORKER_CACHES: Dict[str, PathCache] = {}
+
+
+class _SharedGrid:
+    """
+    Класс для сетки препятствий, скопированной в разделяемую память, чтобы рабочие процессы не читали карту заново.
+    Стоимости ячеек, если они заданы, копируются в тот же блок памяти сразу после сетки препятствий.
+    """
+
+    def __init__(self, grid: Grid) -> None:
+        """
+        :param grid: сетка лабиринта.
+        """
+
+        from multiprocessing.shared_memory import SharedMemory
+
+        size = len(grid.walls)
+        self.has_costs: bool = grid.costs is not None
+        self._memory: SharedMemory = SharedMemory(create=True, size=max(2 * size if self.has_costs else size, 1))
+        self._memory.buf[:size] = grid.walls
+        if self.has_costs:
+            self._memory.buf[size:2 * size] = grid.costs
+
+        self.height: int = grid.height
+        self.width: int = grid.width
+
+    @property
+    def name(self) -> str:
+        """
+        :return: имя блока разделяемой памяти.
+        """
+
+        return self._memory.name
+
+    def release(self) -> None:
+        self._memory.close()
+        self._memory.unlink()
+
+
+def _attach_grid(name: str, width: int, height: int, has_costs: bool = False) -> Grid:
+    """
+    Функция подключает рабочий процесс к сетке препятствий в разделяемой памяти. Последние подключенные сетки
+    запоминаются, чтобы не подключаться заново для каждой пачки запросов.
+    :param name: имя блока разделяемой памяти;
+    :param width: ширина лабиринта;
+    :param height: высота лабиринта;
+    :param has_costs: Истина, если после сетки препятствий в блоке памяти находятся стоимости ячеек.
+    :return: сетка лабиринта, которая читает препятствия и стоимости ячеек прямо из разделяемой памяти.
+    """
+
+    if name in _ATTACHED_GRIDS:
+        _ATTACHED_GRIDS.move_to_end(name)
+        return _ATTACHED_GRIDS[name][2]
+
+    if not _ATTACHED_GRIDS:
+        atexit.register(_detach_grids)
+
+    while len(_ATTACHED_GRIDS) >= _MAX_ATTACHED_GRIDS:
+        _detach_oldest_grid()
+
+    from multiprocessing.shared_memory import SharedMemory
+
+    memory = SharedMemory(name=name)
+    size = width * height
+    views = [memory.buf[:size]]
+    if has_costs:
+        views.append(memory.buf[size:2 * size])
+
+    grid = Grid(width, height, views[0], costs=views[1] if has_costs else None)
+    _ATTACHED_GRIDS[name] = memory, views, grid
+    return grid
+
+
+def _create_record(map_name: str, algorithm: str, start: Position, finish: Position, grid: Grid, solver: Solver,
+                   with_path: bool, cache: Optional[PathCache] = None) -> Dict[str, Any]:
+    """
+    :param map_name: имя файла с картой;
+    :param algorithm: название алгоритма поиска;
+    :param start: вход в лабиринт;
+    :param finish: выход из лабиринта;
+    :param grid: сетка лабиринта;
+    :param solver: объект алгоритма поиска;
+    :param with_path: если Истина, в результат добавляется сам путь;
+    :param cache: кэш найденных путей.
+    :return: результат поиска для одного запроса.
+    """
+
+    if cache is not None:
+        result = cache.solve(solver, grid, start, finish).to_dict()
+    else:
+        result = solver.solve(grid, start, finish).to_dict()
+
+    if not with_path:
+        del result["path"]
+
+    return {"map": map_name, "algorithm": algorithm, "start": list(start), "finish": list(finish), **result}
+
+
+def _detach_grids() -> None:
+    while _ATTACHED_GRIDS:
+        _detach_oldest_grid()
+
+
+def _detach_oldest_grid() -> None:
+    # Представление памяти нужно освободить до закрытия блока разделяемой памяти, иначе закрытие завершится ошибкой
+    _, (memory, views, _) = _ATTACHED_GRIDS.popitem(last=False)
+    for view in views:
+        view.release()
+
+    memory.close()
+
+
+def _get_worker_cache(directory: Optional[str]) -> Optional[PathCache]:
+    """
+    :param directory: каталог кэша путей на диске или None, если пути не запоминаются.
+    :return: кэш путей рабочего процесса. Кэш создается один раз для каждого процесса и каталога, поэтому пути,
+    найденные в памяти процесса, используются и в следующих пачках запросов.
+    """
+
+    if directory is None:
+        return None
+
+    if directory not in _WORKER_CACHES:
+        _WORKER_CACHES[directory] = PathCache(directory=directory)
+
+    return _WORKER_CACHES[directory]
+
+
+def _solve_chunk(memory_name: str, width: int, height: int, has_costs: bool, map_name: str, queries: List[Query],
+                 algorithm: str, solver_options: Dict[str, Any], with_path: bool,
+                 cache_directory: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Функция выполняется в рабочем процессе и решает пачку запросов для одной карты.
+    :param memory_name: имя блока разделяемой памяти с сеткой препятствий;
+    :param width: ширина лабиринта;
+    :param height: высота лабиринта;
+    :param has_costs: Истина, если в блоке разделяемой памяти есть стоимости ячеек;
+    :param map_name: имя файла с картой;
+    :param queries: пары из входа и выхода;
+    :param algorithm: название алгоритма поиска;
+    :param solver_options: параметры алгоритма поиска;
+    :param with_path: если Истина, в результаты добавляются сами пути;
+    :param cache_directory: каталог кэша путей на диске.
+    :return: результаты поиска.
+    """
+
+    grid = _attach_grid(memory_name, width, height, has_costs)
+    solver = create_solver(algorithm, **solver_options)
+    cache = _get_worker_cache(cache_directory)
+    return [_create_record(map_name, algorithm, start, finish, grid, solver, with_path, cache)
+            for start, finish in queries]
+
+
+def read_queries(file_name: str) -> List[Query]:
+    """
+    :param file_name: имя файла с запросами. Каждая строка файла - JSON-объект с полями start и finish, например
+    {"start": [0, 0], "finish": [5, 7]}.
+    :return: пары из входа и выхода. Если строка файла не является таким запросом, возникает исключение ValueError.
+    """
+
+    queries = []
+    with open(file_name, "r", encoding="utf-8") as file:
+        for number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+
+            try:
+                query = json.loads(line)
+                start, finish = tuple(query["start"]), tuple(query["finish"])
+            except (KeyError, TypeError, ValueError):
+                start = finish = ()
+
+            if len(start) != 2 or len(finish) != 2 or not all(isinstance(value, int) for value in start + finish):
+                raise ValueError(f"Некорректный запрос в строке {number}: {line.strip()}")
+
+            queries.append((start, finish))
+
+    return queries
+
+
+def create_random_queries(grid: Grid, count: int, seed: Optional[int] = None) -> List[Query]:
+    """
+    :param grid: сетка лабиринта;
+    :param count: количество запросов;
+    :param seed: начальное значение генератора случайных чисел.
+    :return: случайные пары из свободных ячеек.
+    """
+
+    free_cells = [index for index, wall in enumerate(grid.walls) if not wall]
+    if not free_cells:
+        return []
+
+    generator = random.Random(seed)
+    return [(grid.position(generator.choice(free_cells)), grid.position(generator.choice(free_cells)))
+            for _ in range(count)]
+
+
+def get_default_queries(grid: Grid) -> List[Query]:
+    """
+    :param grid: сетка лабиринта.
+    :return: запрос от входа до выхода, если они есть на карте.
+    """
+
+    if grid.start is None or grid.finish is None:
+        return []
+
+    return [(grid.start, grid.finish)]
+
+
+class BatchSolver:
+    """
+    Класс для решения большого количества запросов на многих картах. Каждая карта читается один раз, ее сетка
+    препятствий копируется в разделяемую память, а запросы пачками распределяются по рабочим процессам. Результаты
+    возвращаются по мере готовности, поэтому их порядок может отличаться от порядка запросов.
+    """
+
+    def __init__(self, algorithm: str = "astar", solver_options: Optional[Dict[str, Any]] = None,
+                 workers: Optional[int] = None, queries: Optional[List[Query]] = None, random_queries: int = 0,
+                 seed: Optional[int] = None, chunk_size: int = 64, with_path: bool = False,
+                 cache_directory: Optional[str] = None) -> None:
+        """
+        :param algorithm: название алгоритма поиска;
+        :param solver_options: параметры алгоритма поиска;
+        :param workers: количество рабочих процессов. По умолчанию равно количеству процессоров, 0 - решать запросы в
+        текущем процессе;
+        :param queries: пары из входа и выхода, которые нужно решить на каждой карте. По умолчанию решается запрос от A
+        до B;
+        :param random_queries: количество случайных запросов, которые нужно добавить для каждой карты;
+        :param seed: начальное значение генератора случайных запросов;
+        :param chunk_size: количество запросов в одной задаче для рабочего процесса;
+        :param with_path: если Истина, в результаты добавляются сами пути;
+        :param cache_directory: каталог кэша путей на диске. Если задан, найденные пути запоминаются, и при повторном
+        запуске на неизмененных картах запросы решаются без поиска (в результатах expanded равно 0).
+        """
+
+        self._algorithm: str = algorithm
+        self._cache_directory: Optional[str] = cache_directory
+        self._chunk_size: int = chunk_size
+        self._queries: Optional[List[Query]] = queries
+        self._random_queries: int = random_queries
+        self._seed: Optional[int] = seed
+        self._solver_options: Dict[str, Any] = solver_options or {}
+        self._with_path: bool = with_path
+        self._workers: int = (os.cpu_count() or 1) if workers is None else workers
+        # Параметры и карты проверяются до запуска рабочих процессов
+        self._solver: Solver = create_solver(algorithm, **self._solver_options)
+
+    def _read_map(self, map_name: str) -> Tuple[Optional[Grid], List[Query], Optional[Dict[str, Any]]]:
+        """
+        :param map_name: имя файла с картой.
+        :return: сетка лабиринта, запросы, которые нужно на ней решить, и запись об ошибке. Если карту не удалось
+        прочитать или алгоритм не может искать на ней путь (например, не поддерживает стоимости ячеек), вместо сетки и
+        запросов возвращаются None и пустой список, а запись об ошибке описывает причину. Запросы к такой карте не
+        решаются, а остальные карты обрабатываются как обычно.
+        """
+
+        try:
+            grid = read_grid(map_name)
+            self._solver.check_grid(grid)
+        except (OSError, ValueError) as exc:
+            # Имя карты уже есть в записи, поэтому для OSError берется только описание причины
+            reason = exc.strerror if isinstance(exc, OSError) and exc.strerror else str(exc)
+            return None, [], {"map": map_name, "algorithm": self._algorithm, "error": reason}
+
+        queries = list(self._queries) if self._queries is not None else get_default_queries(grid)
+        queries.extend(create_random_queries(grid, self._random_queries, self._seed))
+        return grid, queries, None
+
+    def _solve_in_pool(self, map_files: Iterable[str],
+                       shared_grids: Dict[_SharedGrid, Set[Future]]) -> Generator[Dict[str, Any], None, None]:
+        """
+        :param map_files: имена файлов с картами;
+        :param shared_grids: сетки в разделяемой памяти и задачи, которые их еще используют.
+        :yield: результаты поиска.
+        """
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        map_iterator: Iterator[str] = iter(map_files)
+        pending: Dict[Future, _SharedGrid] = {}
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            while True:
+                # Держим в разделяемой памяти не больше карт, чем нужно, чтобы загрузить все рабочие процессы
+                while len(shared_grids) < 2 * self._workers:
+                    map_name = next(map_iterator, None)
+                    if map_name is None:
+                        break
+
+                    grid, queries, error = self._read_map(map_name)
+                    if error is not None:
+                        yield error
+                    elif queries:
+                        shared_grid = _SharedGrid(grid)
+                        shared_grids[shared_grid] = set()
+                        for i in range(0, len(queries), self._chunk_size):
+                            future = executor.submit(_solve_chunk, shared_grid.name, grid.width, grid.height,
+                                                     shared_grid.has_costs, map_name,
+                                                     queries[i:i + self._chunk_size], self._algorithm,
+                                                     self._solver_options, self._with_path, self._cache_directory)
+                            pending[future] = shared_grid
+                            shared_grids[shared_grid].add(future)
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    shared_grid = pending.pop(future)
+                    shared_grids[shared_grid].discard(future)
+                    if not shared_grids[shared_grid]:
+                        del shared_grids[shared_grid]
+                        shared_grid.release()
+
+                    yield from future.result()
+
+    def _solve_in_process(self, map_files: Iterable[str]) -> Generator[Dict[str, Any], None, None]:
+        """
+        :param map_files: имена файлов с картами.
+        :yield: результаты поиска.
+        """
+
+        cache = PathCache(directory=self._cache_directory) if self._cache_directory is not None else None
+        for map_name in map_files:
+            grid, queries, error = self._read_map(map_name)
+            if error is not None:
+                yield error
+                continue
+
+            for start, finish in queries:
+                yield _create_record(map_name, self._algorithm, start, finish, grid, self._solver, self._with_path,
+                                     cache)
+
+    def solve(self, map_files: Iterable[str]) -> Generator[Dict[str, Any], None, None]:
+        """
+        :param map_files: имена файлов с картами.
+        :yield: результаты поиска для каждого запроса в виде словарей, пригодных для сериализации в JSON: карта, вход,
+        выход, длина и стоимость пути, количество раскрытых ячеек и время поиска. Для карт, которые не удалось прочитать
+        или на которых алгоритм не может искать путь, вместо результатов запросов возвращается одна запись с картой и
+        описанием ошибки (error).
+        """
+
+        if self._workers == 0:
+            yield from self._solve_in_process(map_files)
+            return
+
+        shared_grids: Dict[_SharedGrid, Set[Future]] = {}
+        try:
+            yield from self._solve_in_pool(map_files, shared_grids)
+        finally:
+            for shared_grid in shared_grids:
+                shared_grid.release()
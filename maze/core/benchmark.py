@@ -0,0 +1,279 @@
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from .generators import generate_maze
+from .grid import Grid
+from .parser import read_grid, write_grid
+from .solver import create_solver, Solver
+
+
+BENCHMARK_VERSION: int = 1
+DEFAULT_GENERATORS: Tuple[str, ...] = ("backtracker", "prim", "random", "rooms", "unreachable")
+DEFAULT_SIZES: Tuple[Tuple[int, int], ...] = ((64, 64), (256, 256), (1024, 1024))
+DEFAULT_THRESHOLD: float = 0.2
+MIN_TIME_DIFFERENCE: float = 0.001  # Разница во времени меньше миллисекунды считается шумом измерения
+Record = Dict[str, Any]
+# Код, время выполнения которого в новом интерпретаторе измеряется для каждого способа запуска приложения
+STARTUP_TARGETS: Dict[str, str] = {"core": "import maze.core",
+                                   "cli": "import maze.cli",
+                                   "gui": "import maze.mainwindow",
+                                   "window": "from PyQt5.QtWidgets import QApplication\n"
+                                             "from maze.mainwindow import MainWindow\n"
+                                             "app = QApplication([])\n"
+                                             "window = MainWindow()"}
+_PROJECT_DIR: str = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_STARTUP_SCRIPT: str = "import time\nstarted_at = time.perf_counter()\n{code}\nprint(time.perf_counter() - started_at)"
+
+
+def _get_record_key(record: Record) -> Tuple:
+    """
+    :param record: результат одного измерения.
+    :return: ключ, по которому сопоставляются результаты двух запусков.
+    """
+
+    return record["generator"], record["width"], record["height"], record["seed"], record["algorithm"]
+
+
+def _measure_parse_time(grid: Grid, repeats: int) -> float:
+    """
+    :param grid: сетка лабиринта;
+    :param repeats: количество повторов.
+    :return: наименьшее время чтения карты в текстовом формате в секундах.
+    """
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, "map.txt")
+        write_grid(file_name, grid)
+        parse_time = float("inf")
+        for _ in range(repeats):
+            started_at = time.perf_counter()
+            read_grid(file_name)
+            parse_time = min(parse_time, time.perf_counter() - started_at)
+
+    return parse_time
+
+
+def _measure_peak_memory(create: Callable[[], Solver], grid: Grid) -> int:
+    """
+    Память измеряется отдельным поиском, потому что tracemalloc сильно замедляет выполнение.
+    :param create: функция, которая создает объект алгоритма поиска;
+    :param grid: сетка лабиринта.
+    :return: наибольший объем памяти в байтах, выделенной во время поиска.
+    """
+
+    solver = create()
+    grid.cache.clear()
+    tracemalloc.start()
+    try:
+        solver.solve(grid)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _measure_search(grid: Grid, algorithm: str, solver_options: Dict[str, Any], repeats: int,
+                    measure_memory: bool) -> Record:
+    """
+    :param grid: сетка лабиринта;
+    :param algorithm: название алгоритма поиска;
+    :param solver_options: параметры алгоритма поиска;
+    :param repeats: количество повторов;
+    :param measure_memory: если Ложь, память не измеряется.
+    :return: показатели поиска или описание ошибки, если алгоритм не поддерживает заданные параметры.
+    """
+
+    def create() -> Solver:
+        return create_solver(algorithm, **solver_options)
+
+    try:
+        create()
+    except ValueError as exc:
+        return {"error": str(exc)}
+
+    search_time = float("inf")
+    for _ in range(repeats):
+        # Время измеряется вместе с разметкой связных областей, которую делает solve
+        grid.cache.clear()
+        solver = create()
+        started_at = time.perf_counter()
+        result = solver.solve(grid)
+        search_time = min(search_time, time.perf_counter() - started_at)
+
+    record = {"search_time": search_time, "expanded": result.expanded, "found": result.found,
+              "length": result.length, "cost": result.cost}
+    if measure_memory:
+        record["peak_memory"] = _measure_peak_memory(create, grid)
+
+    return record
+
+
+def _measure_startup(code: str, repeats: int) -> Record:
+    """
+    :param code: код, который выполняется в новом интерпретаторе;
+    :param repeats: количество повторов.
+    :return: наименьшее время выполнения кода и наименьшее время работы всего процесса вместе с запуском
+    интерпретатора или описание ошибки, если код не выполнился (например, не установлен PyQt5).
+    """
+
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(filter(None, [_PROJECT_DIR, environment.get("PYTHONPATH")]))
+    # Окно создается без вывода на экран, чтобы измерение работало и без графической среды
+    environment.setdefault("QT_QPA_PLATFORM", "offscreen")
+    startup_time = process_time = float("inf")
+    for _ in range(repeats):
+        started_at = time.perf_counter()
+        completed = subprocess.run([sys.executable, "-c", _STARTUP_SCRIPT.format(code=code)], capture_output=True,
+                                   cwd=_PROJECT_DIR, env=environment, text=True)
+        process_time = min(process_time, time.perf_counter() - started_at)
+        if completed.returncode != 0:
+            lines = completed.stderr.strip().splitlines()
+            return {"error": lines[-1] if lines else f"код завершения {completed.returncode}"}
+
+        startup_time = min(startup_time, float(completed.stdout.split()[-1]))
+
+    return {"startup_time": startup_time, "process_time": process_time}
+
+
+def compare_benchmarks(baseline: Dict[str, Any], current: Dict[str, Any],
+                       threshold: float = DEFAULT_THRESHOLD) -> List[Record]:
+    """
+    :param baseline: результаты предыдущего запуска;
+    :param current: результаты текущего запуска;
+    :param threshold: допустимое относительное ухудшение времени поиска, количества раскрытых ячеек и памяти.
+    :return: ухудшения: ключ измерения, показатель, прежнее и новое значения. Изменение длины пути или того, найден ли
+    путь, считается ухудшением при любой величине.
+    """
+
+    baseline_records = {_get_record_key(record): record for record in baseline["results"]}
+    regressions = []
+    for record in current["results"]:
+        old_record = baseline_records.get(_get_record_key(record))
+        if old_record is None or "error" in record or "error" in old_record:
+            continue
+
+        for metric in ("found", "length"):
+            if record[metric] != old_record[metric]:
+                regressions.append({"key": _get_record_key(record), "metric": metric, "baseline": old_record[metric],
+                                    "current": record[metric]})
+
+        for metric in ("search_time", "expanded", "peak_memory"):
+            old_value, value = old_record.get(metric), record.get(metric)
+            if old_value is None or value is None or value <= old_value * (1 + threshold):
+                continue
+
+            if metric == "search_time" and value - old_value < MIN_TIME_DIFFERENCE:
+                continue
+
+            regressions.append({"key": _get_record_key(record), "metric": metric, "baseline": old_value,
+                                "current": value})
+
+    return regressions
+
+
+def read_benchmark(file_name: str) -> Dict[str, Any]:
+    """
+    :param file_name: имя файла с результатами.
+    :return: результаты запуска.
+    """
+
+    with open(file_name, "r", encoding="utf-8") as file:
+        data = json.load(file)
+
+    if data.get("version") != BENCHMARK_VERSION:
+        raise ValueError(f"Неподдерживаемая версия результатов {data.get('version')} в файле '{file_name}'")
+
+    return data
+
+
+def run_benchmark(generators: Iterable[str] = DEFAULT_GENERATORS,
+                  sizes: Iterable[Tuple[int, int]] = DEFAULT_SIZES, algorithms: Iterable[str] = ("astar",),
+                  seed: int = 0, repeats: int = 3, solver_options: Optional[Dict[str, Any]] = None,
+                  measure_memory: bool = True, on_record: Optional[Callable[[Record], None]] = None) -> Dict[str, Any]:
+    """
+    Функция создает карты заданными генераторами и для каждой карты и каждого алгоритма измеряет время чтения карты,
+    время поиска, количество раскрытых ячеек, наибольший объем выделенной памяти и длину пути. Время - наименьшее из
+    нескольких повторов. Перед каждым поиском данные, запомненные в сетке (связные области, поля расстояний), и
+    состояние алгоритма сбрасываются, чтобы каждый повтор измерял поиск с нуля.
+    :param generators: названия генераторов лабиринтов;
+    :param sizes: размеры карт;
+    :param algorithms: названия алгоритмов поиска;
+    :param seed: начальное значение генераторов лабиринтов;
+    :param repeats: количество повторов каждого измерения, не меньше 1;
+    :param solver_options: параметры алгоритмов поиска;
+    :param measure_memory: если Ложь, память не измеряется;
+    :param on_record: функция, которая вызывается для каждого результата сразу после измерения.
+    :return: результаты в виде словаря, пригодного для сериализации в JSON.
+    """
+
+    if repeats < 1:
+        raise ValueError("Количество повторов должно быть не меньше 1")
+
+    solver_options = solver_options or {}
+    algorithms = list(algorithms)
+    results = []
+    for generator in generators:
+        for width, height in sizes:
+            grid = generate_maze(generator, width, height, seed)
+            parse_time = _measure_parse_time(grid, repeats)
+            for algorithm in algorithms:
+                record = {"generator": generator, "width": width, "height": height, "seed": seed,
+                          "algorithm": algorithm, "parse_time": parse_time}
+                record.update(_measure_search(grid, algorithm, solver_options, repeats, measure_memory))
+                results.append(record)
+                if on_record:
+                    on_record(record)
+
+    return {"version": BENCHMARK_VERSION,
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "solver_options": solver_options,
+            "repeats": repeats,
+            "results": results}
+
+
+def run_startup_benchmark(targets: Optional[Iterable[str]] = None, repeats: int = 5,
+                          on_record: Optional[Callable[[Record], None]] = None) -> Dict[str, Any]:
+    """
+    Функция измеряет время запуска приложения: каждый способ запуска из STARTUP_TARGETS выполняется в новом
+    интерпретаторе, чтобы модули импортировались с нуля. Время - наименьшее из нескольких повторов.
+    :param targets: названия способов запуска из STARTUP_TARGETS, по умолчанию все;
+    :param repeats: количество повторов каждого измерения, не меньше 1;
+    :param on_record: функция, которая вызывается для каждого результата сразу после измерения.
+    :return: результаты в виде словаря, пригодного для сериализации в JSON.
+    """
+
+    if repeats < 1:
+        raise ValueError("Количество повторов должно быть не меньше 1")
+
+    results = []
+    for target in targets or STARTUP_TARGETS:
+        record = {"target": target}
+        record.update(_measure_startup(STARTUP_TARGETS[target], repeats))
+        results.append(record)
+        if on_record:
+            on_record(record)
+
+    return {"version": BENCHMARK_VERSION,
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeats": repeats,
+            "results": results}
+
+
+def write_benchmark(file_name: str, data: Dict[str, Any]) -> None:
+    """
+    :param file_name: имя файла, в который нужно сохранить результаты;
+    :param data: результаты запуска.
+    """
+
+    with open(file_name, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False, indent=2)
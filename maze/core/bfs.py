@@ -0,0 +1,48 @@
+from collections import deque
+from .grid import Grid, Position
+from .solver import register_solver, SearchResult, Solver
+
+
+@register_solver("bfs")
+class BfsSolver(Solver):
+    """
+    Класс, в котором происходит поиск выхода из лабиринта поиском в ширину. Все шаги в лабиринте имеют одинаковую
+    стоимость, поэтому первый найденный путь является кратчайшим, а очередь с приоритетами не нужна. Диагональные шаги
+    стоят дороже остальных, поэтому поддерживается только движение по горизонтали и вертикали, а стоимости ячеек не
+    поддерживаются.
+    """
+
+    WEIGHTED: bool = False
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        if self._neighborhood.diagonal:
+            raise ValueError("Поиск в ширину поддерживает только движение по горизонтали и вертикали")
+
+    def _search(self, grid: Grid, start: Position, finish: Position) -> SearchResult:
+        parents = self._create_buffer(grid, "i", -1)
+        visited = self._create_buffer(grid, "B", 0)
+        start_index = grid.index(*start)
+        finish_index = grid.index(*finish)
+        expanded = 0
+
+        queue = deque([start_index])
+        visited[start_index] = 1
+        while queue:
+            cell = queue.popleft()
+            expanded += 1
+            if self._on_current:
+                self._on_current(*grid.position(cell))
+
+            if cell == finish_index:
+                return SearchResult(self._create_path(grid, parents, cell), expanded)
+
+            for neighbor in grid.get_neighbors(cell):
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    parents[neighbor] = cell
+                    queue.append(neighbor)
+                    if self._on_neighbor:
+                        self._on_neighbor(*grid.position(neighbor))
+
+        return SearchResult([], expanded)
@@ -0,0 +1,105 @@
+import math
+from typing import List
+from .buffers import Buffer, UNSEEN
+from .grid import Grid, Position
+from .openset import OpenSet
+from .solver import register_solver, SearchResult, Solver
+
+
+@register_solver("bidirectional")
+class BidirectionalAStarSolver(Solver):
+    """
+    Класс, в котором происходит поиск выхода из лабиринта двунаправленным методом A*: один поиск идет от входа к
+    выходу, другой - от выхода ко входу. На каждом шаге раскрывается ячейка из меньшей очереди. Поиск заканчивается,
+    когда наименьшая оценка f в одной из очередей не меньше длины лучшего найденного пути через точку встречи.
+    """
+
+    FORWARD: int = 0
+    BACKWARD: int = 1
+
+    def _get_heuristic(self, grid: Grid, h_scores: Buffer, cell: int, target: Position) -> float:
+        """
+        :param grid: сетка лабиринта;
+        :param h_scores: уже вычисленные оценки для поиска в этом направлении;
+        :param cell: индекс ячейки;
+        :param target: ячейка, к которой идет поиск.
+        :return: примерное расстояние от ячейки до цели поиска.
+        """
+
+        h = h_scores[cell]
+        if h < 0:
+            x, y = grid.position(cell)
+            h = self._heuristic.estimate(x, y, *target)
+            h_scores[cell] = h
+
+        return h
+
+    def _search(self, grid: Grid, start: Position, finish: Position) -> SearchResult:
+        start_index = grid.index(*start)
+        finish_index = grid.index(*finish)
+        if start_index == finish_index:
+            return SearchResult([start], 1)
+
+        size = self._get_buffer_size(grid)
+        typecode = self._neighborhood.get_typecode(grid)
+        closed_cells = [self._create_buffer(grid, "B", 0), self._create_buffer(grid, "B", 0)]
+        h_scores = [self._create_buffer(grid, "d", -1), self._create_buffer(grid, "d", -1)]
+        open_cells = [OpenSet(size, typecode), OpenSet(size, typecode)]
+        parents = [self._create_buffer(grid, "i", -1), self._create_buffer(grid, "i", -1)]
+        targets = [finish, start]
+        open_cells[self.FORWARD].push(start_index, 0, self._get_heuristic(grid, h_scores[self.FORWARD], start_index,
+                                                                          finish))
+        open_cells[self.BACKWARD].push(finish_index, 0, self._get_heuristic(grid, h_scores[self.BACKWARD], finish_index,
+                                                                            start))
+        best_length = math.inf
+        meeting_cell = -1
+        expanded = 0
+
+        while open_cells[self.FORWARD] and open_cells[self.BACKWARD]:
+            if max(open_cells[self.FORWARD].peek_f(), open_cells[self.BACKWARD].peek_f()) >= best_length:
+                break
+
+            # Раскрываем ячейку в том направлении, в котором очередь меньше
+            direction = self.FORWARD if len(open_cells[self.FORWARD]) <= len(open_cells[self.BACKWARD]) else \
+                self.BACKWARD
+            cell, g = open_cells[direction].pop()
+            closed_cells[direction][cell] = 1
+            expanded += 1
+            if self._on_current:
+                self._on_current(*grid.position(cell))
+
+            g_scores = open_cells[direction].g_scores
+            other_g_scores = open_cells[1 - direction].g_scores
+            for neighbor, step_cost in self._neighborhood.get_neighbors(grid, cell):
+                if closed_cells[direction][neighbor]:
+                    continue
+
+                new_g = g + step_cost
+                h = self._get_heuristic(grid, h_scores[direction], neighbor, targets[direction])
+                if open_cells[direction].push(neighbor, new_g, new_g + h):
+                    parents[direction][neighbor] = cell
+                    if self._on_neighbor:
+                        self._on_neighbor(*grid.position(neighbor))
+
+                # Если соседняя ячейка уже встречалась в поиске с другой стороны, получаем путь через нее
+                other_g = other_g_scores[neighbor]
+                if other_g != UNSEEN and g_scores[neighbor] + other_g < best_length:
+                    best_length = g_scores[neighbor] + other_g
+                    meeting_cell = neighbor
+
+        if meeting_cell == -1:
+            return SearchResult([], expanded)
+
+        return SearchResult(self._join_paths(grid, parents, meeting_cell), expanded)
+
+    def _join_paths(self, grid: Grid, parents: list, meeting_cell: int) -> List[Position]:
+        """
+        :param grid: сетка лабиринта;
+        :param parents: родительские ячейки для поиска от входа и для поиска от выхода;
+        :param meeting_cell: индекс ячейки, в которой встретились поиски.
+        :return: список из ячеек от входа до выхода.
+        """
+
+        forward_path = self._create_path(grid, parents[self.FORWARD], meeting_cell)
+        backward_path = self._create_path(grid, parents[self.BACKWARD], meeting_cell)
+        return forward_path + backward_path[-2::-1]
@@ -0,0 +1,200 @@
+import mmap
+import struct
+import sys
+from array import array
+from typing import List, Optional, Sequence, Tuple
+from .components import get_components
+from .grid import Grid, Position
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+BINARY_EXTENSION: str = ".maze"
+BINARY_MAGIC: bytes = b"MAZE"
+BINARY_VERSION: int = 1
+# Заголовок: сигнатура, версия, флаги, ширина, высота, координаты входа и выхода, количество ячеек пути
+_HEADER: struct.Struct = struct.Struct("<4sBB2xIIiiiiI")
+# Раздел после пути: количество дополнительных входов и выходов, затем их координаты. Старые версии программы его
+# пропускают и читают только первый вход и первый выход из заголовка
+_ENDPOINTS_HEADER: struct.Struct = struct.Struct("<II")
+# Последний раздел - стоимости ячеек, по байту на ячейку. Он есть, только если у сетки заданы стоимости
+_HAS_COSTS: int = 16
+_HAS_ENDPOINTS: int = 8
+_HAS_FINISH: int = 2
+_HAS_PATH: int = 4
+_HAS_START: int = 1
+# Таблицы для упаковки без NumPy: ячейка - в цифру двоичной записи, байт - в восемь ячеек
+_BIT_TABLE: bytes = bytes.maketrans(bytes((Grid.FREE, Grid.WALL)), b"01")
+_UNPACK_TABLE: List[bytes] = [bytes((byte >> shift) & 1 for shift in range(7, -1, -1)) for byte in range(256)]
+
+
+def _pack_walls(walls: Sequence[int]) -> bytes:
+    """
+    :param walls: сетка препятствий, по байту на ячейку.
+    :return: сетка препятствий, упакованная по биту на ячейку, старший бит байта соответствует первой ячейке.
+    """
+
+    if np is not None:
+        return np.packbits(np.frombuffer(walls, dtype=np.uint8)).tobytes()
+
+    size = (len(walls) + 7) // 8
+    if not size:
+        return b""
+
+    # Двоичная запись сетки переводится в число за линейное время, так как основание счисления - степень двойки
+    digits = bytes(walls).translate(_BIT_TABLE).ljust(size * 8, b"0")
+    return int(digits, 2).to_bytes(size, "big")
+
+
+def _read_coordinates(view: memoryview) -> List[Position]:
+    """
+    :param view: координаты ячеек: пары 32-битных беззнаковых чисел в порядке little-endian.
+    :return: список координат.
+    """
+
+    coordinates = array("I")
+    coordinates.frombytes(view)
+    if sys.byteorder == "big":
+        coordinates.byteswap()
+
+    return list(zip(coordinates[::2], coordinates[1::2]))
+
+
+def _unpack_walls(data, size: int) -> bytearray:
+    """
+    :param data: сетка препятствий, упакованная по биту на ячейку;
+    :param size: количество ячеек.
+    :return: сетка препятствий, по байту на ячейку.
+    """
+
+    if np is not None:
+        return bytearray(np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=size).tobytes())
+
+    walls = bytearray(b"".join(map(_UNPACK_TABLE.__getitem__, data)))
+    del walls[size:]
+    return walls
+
+
+def _write_coordinates(positions: Sequence[Position]) -> bytes:
+    """
+    :param positions: координаты ячеек.
+    :return: координаты в виде пар 32-битных беззнаковых чисел в порядке little-endian.
+    """
+
+    coordinates = array("I", (coordinate for position in positions for coordinate in position))
+    if sys.byteorder == "big":
+        coordinates.byteswap()
+
+    return coordinates.tobytes()
+
+
+def is_binary_map(file_name: str) -> bool:
+    """
+    :param file_name: имя файла с картой лабиринта.
+    :return: Истина, если карта сохранена в двоичном формате.
+    """
+
+    with open(file_name, "rb") as file:
+        return file.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def parse_binary(data) -> Tuple[Grid, List[Position]]:
+    """
+    Функция разбирает карту в двоичном формате. Разделы читаются через memoryview, поэтому данные, отображенные в
+    память, не копируются до распаковки сетки препятствий.
+    :param data: содержимое файла с картой (bytes, bytearray или mmap).
+    :return: сетка лабиринта и сохраненный вместе с ней путь (пустой, если пути нет).
+    """
+
+    if len(data) < _HEADER.size:
+        raise ValueError("Файл слишком короткий для карты в двоичном формате")
+
+    magic, version, flags, width, height, start_x, start_y, finish_x, finish_y, path_length = \
+        _HEADER.unpack_from(data)
+    if magic != BINARY_MAGIC:
+        raise ValueError("Файл не является картой в двоичном формате")
+
+    if version != BINARY_VERSION:
+        raise ValueError(f"Версия двоичного формата {version} не поддерживается")
+
+    walls_size = (width * height + 7) // 8
+    path_offset = _HEADER.size + walls_size
+    path_size = 8 * path_length if flags & _HAS_PATH else 0
+    if len(data) < path_offset + path_size:
+        raise ValueError("Файл с картой в двоичном формате обрезан")
+
+    starts = [(start_x, start_y)] if flags & _HAS_START else []
+    finishes = [(finish_x, finish_y)] if flags & _HAS_FINISH else []
+    endpoints_offset = costs_offset = path_offset + path_size
+    view = memoryview(data)
+    try:
+        walls = _unpack_walls(view[_HEADER.size:path_offset], width * height)
+        path = _read_coordinates(view[path_offset:endpoints_offset])
+        if flags & _HAS_ENDPOINTS:
+            if len(data) < endpoints_offset + _ENDPOINTS_HEADER.size:
+                raise ValueError("Файл с картой в двоичном формате обрезан")
+
+            starts_count, finishes_count = _ENDPOINTS_HEADER.unpack_from(data, endpoints_offset)
+            coordinates_offset = endpoints_offset + _ENDPOINTS_HEADER.size
+            coordinates_end = coordinates_offset + 8 * (starts_count + finishes_count)
+            if len(data) < coordinates_end:
+                raise ValueError("Файл с картой в двоичном формате обрезан")
+
+            endpoints = _read_coordinates(view[coordinates_offset:coordinates_end])
+            starts.extend(endpoints[:starts_count])
+            finishes.extend(endpoints[starts_count:])
+            costs_offset = coordinates_end
+
+        costs = None
+        if flags & _HAS_COSTS:
+            if len(data) < costs_offset + width * height:
+                raise ValueError("Файл с картой в двоичном формате обрезан")
+
+            costs = bytearray(view[costs_offset:costs_offset + width * height])
+    finally:
+        # Представление нужно освободить, иначе отображение файла в память нельзя будет закрыть
+        view.release()
+
+    grid = Grid(width, height, walls, starts=starts, finishes=finishes, costs=costs)
+    get_components(grid)
+    return grid, path
+
+
+def read_binary_map(file_name: str) -> Tuple[Grid, List[Position]]:
+    """
+    :param file_name: имя файла с картой в двоичном формате.
+    :return: сетка лабиринта и сохраненный вместе с ней путь.
+    """
+
+    with open(file_name, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return parse_binary(data)
+
+
+def write_binary_map(file_name: str, grid: Grid, path: Optional[Sequence[Position]] = None) -> None:
+    """
+    :param file_name: имя файла, в который сохранить лабиринт. Сохраняются все входы и выходы и стоимости ячеек;
+    :param grid: сетка лабиринта;
+    :param path: путь, который нужно сохранить вместе с картой.
+    """
+
+    extra_starts, extra_finishes = grid.starts[1:], grid.finishes[1:]
+    has_endpoints = extra_starts or extra_finishes
+    flags = ((_HAS_START if grid.start else 0) | (_HAS_FINISH if grid.finish else 0) | (_HAS_PATH if path else 0) |
+             (_HAS_ENDPOINTS if has_endpoints else 0) | (_HAS_COSTS if grid.costs is not None else 0))
+    start = grid.start or (0, 0)
+    finish = grid.finish or (0, 0)
+    with open(file_name, "wb") as file:
+        file.write(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, flags, grid.width, grid.height, *start, *finish,
+                                len(path or ())))
+        file.write(_pack_walls(grid.walls))
+        file.write(_write_coordinates(path or ()))
+        if has_endpoints:
+            file.write(_ENDPOINTS_HEADER.pack(len(extra_starts), len(extra_finishes)))
+            file.write(_write_coordinates(extra_starts + extra_finishes))
+
+        if grid.costs is not None:
+            file.write(grid.costs)
@@ -0,0 +1,23 @@
+from array import array
+from collections import defaultdict
+from typing import Any, MutableMapping, MutableSequence, Optional, Union
+
+
+Buffer = Union[MutableSequence, MutableMapping]
+UNSEEN: int = -1  # Значение для ячеек, до которых поиск еще не дошел
+
+
+def create_buffer(size: Optional[int], typecode: str, fill: Any) -> Buffer:
+    """
+    Функция создает хранилище состояния ячеек, к которому обращаются по индексу ячейки y * width + x.
+    :param size: количество ячеек в лабиринте. Если задано, создается плоский массив на все ячейки, иначе - словарь,
+    в котором хранятся только ячейки, до которых дошел поиск;
+    :param typecode: тип элементов массива (как в модуле array);
+    :param fill: начальное значение для всех ячеек.
+    :return: массив или словарь со значением по умолчанию.
+    """
+
+    if size is not None:
+        return array(typecode, [fill]) * size
+
+    return defaultdict(lambda: fill)
@@ -0,0 +1,83 @@
+import threading
+import time
+from typing import Callable, Optional
+
+
+CellCallback = Callable[[int, int], None]
+
+
+class SearchCancelled(Exception):
+    """
+    Исключение, которое возникает, если поиск был отменен.
+    """
+
+
+class SearchTimeout(SearchCancelled):
+    """
+    Исключение, которое возникает, если поиск не уложился в заданное время.
+    """
+
+
+class CancelToken:
+    """
+    Класс для совместной отмены поиска. Алгоритм поиска не прерывается извне: между раскрытиями ячеек он проверяет
+    токен и, если поиск отменен или время вышло, сам завершается исключением SearchCancelled или SearchTimeout. Признак
+    отмены проверяется на каждой ячейке, а время - раз в CHECK_INTERVAL раскрытий, чтобы проверки почти не замедляли
+    поиск.
+    """
+
+    CHECK_INTERVAL: int = 256
+
+    def __init__(self, timeout: Optional[float] = None) -> None:
+        """
+        :param timeout: максимальное время в секундах с момента создания токена. Если не задано, время не ограничено.
+        """
+
+        self._cancelled: threading.Event = threading.Event()
+        self._deadline: Optional[float] = None if timeout is None else time.monotonic() + timeout
+
+    @property
+    def cancelled(self) -> bool:
+        """
+        :return: Истина, если поиск отменен.
+        """
+
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """
+        Метод отменяет поиск. Метод можно вызывать из любого потока.
+        """
+
+        self._cancelled.set()
+
+    def check(self) -> None:
+        """
+        Метод проверяет, можно ли продолжать поиск.
+        """
+
+        if self._cancelled.is_set():
+            raise SearchCancelled("Поиск отменен")
+
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            raise SearchTimeout("Время поиска истекло")
+
+    def wrap(self, on_current: Optional[CellCallback]) -> CellCallback:
+        """
+        :param on_current: функция, которую алгоритм вызывает для каждой раскрытой ячейки, или None.
+        :return: функция, которая вызывает on_current и периодически проверяет токен.
+        """
+
+        cancelled = self._cancelled
+        expanded = 0
+
+        def on_current_with_check(x: int, y: int) -> None:
+            nonlocal expanded
+            if cancelled.is_set() or expanded % CancelToken.CHECK_INTERVAL == 0:
+                self.check()
+
+            expanded += 1
+            if on_current:
+                on_current(x, y)
+
+        return on_current_with_check
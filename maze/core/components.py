@@ -0,0 +1,172 @@
+from array import array
+from typing import List, Optional
+from .grid import Grid, Position
+from .neighborhood import Neighborhood
+
+
+NO_COMPONENT: int = -1
+
+
+class Components:
+    """
+    Класс для разметки лабиринта на связные области: из любой свободной ячейки области можно дойти до любой другой
+    ячейки той же области и нельзя дойти до ячеек других областей.
+    """
+
+    def __init__(self, grid: Grid, labels: array, sizes: List[int]) -> None:
+        """
+        :param grid: сетка лабиринта;
+        :param labels: номера областей для ячеек, индекс ячейки равен y * width + x, NO_COMPONENT для препятствий;
+        :param sizes: количество ячеек в каждой области.
+        """
+
+        self._grid: Grid = grid
+        self._labels: array = labels
+        self._sizes: List[int] = sizes
+
+    @property
+    def count(self) -> int:
+        """
+        :return: количество связных областей.
+        """
+
+        return len(self._sizes)
+
+    @property
+    def labels(self) -> array:
+        """
+        :return: номера областей для ячеек, индекс ячейки равен y * width + x.
+        """
+
+        return self._labels
+
+    @property
+    def sizes(self) -> List[int]:
+        """
+        :return: количество ячеек в каждой области.
+        """
+
+        return self._sizes
+
+    def are_connected(self, first: Position, second: Position) -> bool:
+        """
+        :param first: первая ячейка;
+        :param second: вторая ячейка.
+        :return: Истина, если из одной ячейки можно дойти до другой.
+        """
+
+        label = self.get_label(*first)
+        return label != NO_COMPONENT and label == self.get_label(*second)
+
+    def get_label(self, x: int, y: int) -> int:
+        """
+        :param x: горизонтальная координата ячейки;
+        :param y: вертикальная координата ячейки.
+        :return: номер области, в которой находится ячейка, или NO_COMPONENT для препятствий и ячеек вне лабиринта.
+        """
+
+        if not self._grid.contains(x, y):
+            return NO_COMPONENT
+
+        return self._labels[self._grid.index(x, y)]
+
+
+def _find_root(parents: List[int], run: int) -> int:
+    """
+    :param parents: родительские отрезки в системе непересекающихся множеств;
+    :param run: номер отрезка.
+    :return: номер корневого отрезка множества.
+    """
+
+    while parents[run] != run:
+        parents[run] = parents[parents[run]]
+        run = parents[run]
+
+    return run
+
+
+def get_components(grid: Grid, neighborhood: Optional[Neighborhood] = None) -> Components:
+    """
+    :param grid: сетка лабиринта;
+    :param neighborhood: допустимые шаги между ячейками, по умолчанию только по горизонтали и вертикали.
+    :return: связные области лабиринта. Разметка запоминается в кэше сетки.
+    """
+
+    # Если углы срезать нельзя или можно срезать только один угол, диагональный шаг не соединяет ячейки, которые не
+    # соединены шагами по горизонтали и вертикали. Поэтому области отличаются только для правила always
+    diagonal = neighborhood is not None and neighborhood.diagonal and neighborhood.corner_cutting == "always"
+    key = "components", diagonal
+    if key not in grid.cache:
+        grid.cache[key] = label_components(grid, diagonal)
+
+    return grid.cache[key]
+
+
+def label_components(grid: Grid, diagonal: bool = False) -> Components:
+    """
+    Разметка связных областей за один проход по строкам. Свободные ячейки каждой строки объединяются в отрезки, а
+    отрезки соседних строк, которые соприкасаются, объединяются в системе непересекающихся множеств.
+    :param grid: сетка лабиринта;
+    :param diagonal: если Истина, отрезки соседних строк соприкасаются и по диагонали.
+    :return: связные области лабиринта.
+    """
+
+    width = grid.width
+    walls = grid.walls if isinstance(grid.walls, bytearray) else bytes(grid.walls)
+    overlap = 1 if diagonal else 0
+    parents: List[int] = []
+    run_starts = array("i")
+    run_ends = array("i")
+    previous_runs: List[int] = []
+    for y in range(grid.height):
+        row_start = y * width
+        row_end = row_start + width
+        current_runs = []
+        x = walls.find(Grid.FREE, row_start, row_end)
+        while x != -1:
+            end = walls.find(Grid.WALL, x, row_end)
+            if end == -1:
+                end = row_end
+
+            run = len(parents)
+            parents.append(run)
+            run_starts.append(x)
+            run_ends.append(end)
+            current_runs.append(run)
+            x = walls.find(Grid.FREE, end, row_end) if end < row_end else -1
+
+        # Объединяем отрезки текущей строки с соприкасающимися отрезками предыдущей строки методом двух указателей
+        i = j = 0
+        while i < len(previous_runs) and j < len(current_runs):
+            previous_run = previous_runs[i]
+            current_run = current_runs[j]
+            previous_start = run_starts[previous_run] + width
+            previous_end = run_ends[previous_run] + width
+            if previous_start < run_ends[current_run] + overlap and run_starts[current_run] < previous_end + overlap:
+                first_root = _find_root(parents, previous_run)
+                second_root = _find_root(parents, current_run)
+                if first_root != second_root:
+                    parents[max(first_root, second_root)] = min(first_root, second_root)
+
+            if previous_end < run_ends[current_run]:
+                i += 1
+            else:
+                j += 1
+
+        previous_runs = current_runs
+
+    labels = array("i", [NO_COMPONENT]) * len(walls)
+    root_labels = {}
+    sizes: List[int] = []
+    for run in range(len(parents)):
+        root = _find_root(parents, run)
+        if root not in root_labels:
+            root_labels[root] = len(sizes)
+            sizes.append(0)
+
+        label = root_labels[root]
+        length = run_ends[run] - run_starts[run]
+        labels[run_starts[run]:run_ends[run]] = array("i", [label]) * length
+        sizes[label] += length
+
+    return Components(grid, labels, sizes)
@@ -0,0 +1,298 @@
+from array import array
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from .bfs import BfsSolver
+from .grid import Grid, Position
+from .solver import register_solver, SearchResult, Solver
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+MASK_FRONTIER_RATIO: int = 16  # Фронт больше 1/16 карты расширяется сдвигами маски всей карты, а не по индексам
+NUMPY_MIN_CELLS: int = 10000  # На меньших картах накладные расходы NumPy на каждый фронт больше выигрыша
+UNREACHABLE: int = -1
+_MAX_CACHED_FIELDS: int = 8
+
+
+class DistanceField:
+    """
+    Класс для поля расстояний: кратчайших расстояний от одной ячейки-источника до всех достижимых ячеек лабиринта при
+    движении по горизонтали и вертикали. Путь от любой ячейки до источника восстанавливается спуском по полю за время,
+    пропорциональное длине пути.
+    """
+
+    def __init__(self, grid: Grid, source: Position, distances: array, labeled: int) -> None:
+        """
+        :param grid: сетка лабиринта;
+        :param source: ячейка-источник;
+        :param distances: расстояния до источника, индекс ячейки равен y * width + x, UNREACHABLE для недостижимых
+        ячеек;
+        :param labeled: количество достижимых ячеек.
+        """
+
+        self._distances: array = distances
+        self._grid: Grid = grid
+        self._labeled: int = labeled
+        self._source: Position = source
+
+    @property
+    def distances(self) -> array:
+        """
+        :return: расстояния до источника, индекс ячейки равен y * width + x.
+        """
+
+        return self._distances
+
+    @property
+    def labeled(self) -> int:
+        """
+        :return: количество достижимых ячеек.
+        """
+
+        return self._labeled
+
+    @property
+    def source(self) -> Position:
+        """
+        :return: ячейка-источник.
+        """
+
+        return self._source
+
+    def get_distance(self, x: int, y: int) -> Optional[int]:
+        """
+        :param x: горизонтальная координата ячейки;
+        :param y: вертикальная координата ячейки.
+        :return: расстояние от ячейки до источника или None, если источник из ячейки недостижим.
+        """
+
+        if not self._grid.contains(x, y):
+            return None
+
+        distance = self._distances[self._grid.index(x, y)]
+        return None if distance == UNREACHABLE else distance
+
+    def get_path(self, start: Position) -> List[Position]:
+        """
+        :param start: ячейка, из которой нужно дойти до источника.
+        :return: кратчайший путь от ячейки до источника или пустой список, если источник недостижим.
+        """
+
+        if self.get_distance(*start) is None:
+            return []
+
+        cell = self._grid.index(*start)
+        path = [start]
+        while self._distances[cell] > 0:
+            # Спускаемся в соседнюю ячейку, которая на один шаг ближе к источнику
+            next_distance = self._distances[cell] - 1
+            for neighbor in self._grid.get_neighbors(cell):
+                if self._distances[neighbor] == next_distance:
+                    cell = neighbor
+                    break
+
+            path.append(self._grid.position(cell))
+
+        return path
+
+
+def _compute_with_numpy(grid: Grid, source: int, target: int = -1) -> Tuple[array, int]:
+    """
+    Поиск в ширину, в котором каждый фронт волны обрабатывается операциями NumPy. Сетка окружается рамкой из
+    препятствий, поэтому соседние ячейки находятся сдвигом индекса без проверки границ. Небольшой фронт расширяется по
+    массиву индексов его ячеек, а фронт больше 1/MASK_FRONTIER_RATIO карты - сдвигами его маски на одну ячейку в
+    четырех направлениях и наложением на маску свободных ячеек: так не нужна сортировка для удаления повторов.
+    :param grid: сетка лабиринта;
+    :param source: индекс ячейки-источника;
+    :param target: индекс ячейки, после разметки которой поиск останавливается, или -1, чтобы разметить все
+    достижимые ячейки.
+    :return: расстояния до источника и количество размеченных ячеек.
+    """
+
+    width = grid.width + 2
+    walls = np.ones((grid.height + 2, width), dtype=np.uint8)
+    walls[1:-1, 1:-1] = np.frombuffer(grid.walls, dtype=np.uint8).reshape(grid.height, grid.width)
+    blocked = walls.ravel().astype(bool)
+    distances = np.full(blocked.size, UNREACHABLE, dtype=np.int32)
+    x, y = grid.position(source)
+    frontier = np.array([(y + 1) * width + x + 1], dtype=np.int64)
+    distances[frontier] = 0
+    blocked[frontier] = True
+    offsets = np.array([-width, -1, 1, width], dtype=np.int64)
+    mask = reached = None
+    if target != -1:
+        x, y = grid.position(target)
+        target = (y + 1) * width + x + 1
+
+    distance = 0
+    labeled = 1
+    while frontier.size and (target == -1 or distances[target] == UNREACHABLE):
+        distance += 1
+        if frontier.size * MASK_FRONTIER_RATIO > blocked.size:
+            if mask is None:
+                mask, reached = np.zeros_like(blocked), np.zeros_like(blocked)
+
+            mask[frontier] = True
+            np.logical_or(mask[:-2 * width], mask[2 * width:], out=reached[width:-width])
+            reached[width:-width] |= mask[width - 1:-width - 1]
+            reached[width:-width] |= mask[width + 1:-width + 1]
+            reached &= ~blocked
+            mask[frontier] = False
+            neighbors = np.flatnonzero(reached)
+        else:
+            neighbors = (frontier[:, None] + offsets).ravel()
+            neighbors = neighbors[~blocked[neighbors]]
+            if frontier.size > 1:
+                # У разных ячеек фронта могут быть общие соседи, а у одной ячейки соседи разные
+                neighbors = np.unique(neighbors)
+
+        distances[neighbors] = distance
+        blocked[neighbors] = True
+        labeled += neighbors.size
+        frontier = neighbors
+
+    result = array("i")
+    result.frombytes(distances.reshape(grid.height + 2, width)[1:-1, 1:-1].tobytes())
+    return result, labeled
+
+
+def _compute_with_wavefront(grid: Grid, source: int, target: int = -1) -> Tuple[array, int]:
+    """
+    Поиск в ширину на чистом Python, в котором ячейки обрабатываются фронтами волны.
+    :param grid: сетка лабиринта;
+    :param source: индекс ячейки-источника;
+    :param target: индекс ячейки, после разметки которой поиск останавливается, или -1, чтобы разметить все
+    достижимые ячейки.
+    :return: расстояния до источника и количество размеченных ячеек.
+    """
+
+    distances = array("i", [UNREACHABLE]) * (grid.width * grid.height)
+    distances[source] = 0
+    frontier = [source]
+    distance = 0
+    labeled = 1
+    while frontier and (target == -1 or distances[target] == UNREACHABLE):
+        distance += 1
+        next_frontier = []
+        for cell in frontier:
+            for neighbor in grid.get_neighbors(cell):
+                if distances[neighbor] == UNREACHABLE:
+                    distances[neighbor] = distance
+                    next_frontier.append(neighbor)
+
+        labeled += len(next_frontier)
+        frontier = next_frontier
+
+    return distances, labeled
+
+
+def compute_distance_field(grid: Grid, source: Position, backend: str = "auto",
+                           target: Optional[Position] = None) -> DistanceField:
+    """
+    :param grid: сетка лабиринта;
+    :param source: ячейка-источник;
+    :param backend: способ вычисления: numpy, wavefront (чистый Python) или auto (numpy, если он установлен и карта
+    не слишком маленькая);
+    :param target: ячейка, после разметки которой поиск останавливается. Тогда размечены только ячейки не дальше нее,
+    но путь от нее до источника восстанавливается так же. По умолчанию размечаются все достижимые ячейки.
+    :return: поле расстояний от источника до всех ячеек лабиринта.
+    """
+
+    if backend not in ("auto", "numpy", "wavefront"):
+        raise ValueError(f"Неизвестный способ вычисления поля расстояний '{backend}'")
+
+    if backend == "numpy" and np is None:
+        raise ValueError("Для вычисления поля расстояний средствами NumPy нужно установить numpy")
+
+    target_index = -1 if target is None else grid.index(*target)
+    if not grid.is_free(*source):
+        distances, labeled = array("i", [UNREACHABLE]) * (grid.width * grid.height), 0
+    elif backend == "wavefront" or np is None or (backend == "auto" and len(grid.walls) < NUMPY_MIN_CELLS):
+        distances, labeled = _compute_with_wavefront(grid, grid.index(*source), target_index)
+    else:
+        distances, labeled = _compute_with_numpy(grid, grid.index(*source), target_index)
+
+    return DistanceField(grid, source, distances, labeled)
+
+
+def get_distance_field(grid: Grid, source: Position) -> DistanceField:
+    """
+    :param grid: сетка лабиринта;
+    :param source: ячейка-источник.
+    :return: поле расстояний от источника. Последние поля запоминаются в кэше сетки, поэтому повторные запросы к тому же
+    источнику не требуют нового поиска.
+    """
+
+    fields = grid.cache.setdefault("distance_fields", OrderedDict())
+    if source in fields:
+        fields.move_to_end(source)
+        return fields[source]
+
+    field = compute_distance_field(grid, source)
+    fields[source] = field
+    if len(fields) > _MAX_CACHED_FIELDS:
+        fields.popitem(last=False)
+
+    return field
+
+
+@register_solver("field")
+class DistanceFieldSolver(Solver):
+    """
+    Класс, в котором выход из лабиринта ищется по полю расстояний до выхода. Поле вычисляется один раз для каждого
+    выхода, а путь из любого входа восстанавливается спуском по полю. Поэтому алгоритм выгоден, когда много запросов
+    ведут к одному выходу. Поле измеряется в шагах, поэтому стоимости ячеек не поддерживаются.
+    """
+
+    WEIGHTED: bool = False
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        if self._neighborhood.diagonal:
+            raise ValueError("Поле расстояний поддерживает только движение по горизонтали и вертикали")
+
+    def _search(self, grid: Grid, start: Position, finish: Position) -> SearchResult:
+        is_cached = finish in grid.cache.get("distance_fields", {})
+        field = get_distance_field(grid, finish)
+        # Если поле уже было вычислено, ячейки не раскрываются, иначе раскрыты все достижимые ячейки
+        return SearchResult(field.get_path(start), 0 if is_cached else field.labeled)
+
+
+@register_solver("wavefront")
+class WavefrontSolver(BfsSolver):
+    """
+    Класс, в котором выход из лабиринта ищется поиском в ширину от входа, где каждый фронт волны обрабатывается
+    операциями NumPy над всей картой (см. compute_distance_field), а не циклом по ячейкам. Поиск останавливается, как
+    только фронт дошел до выхода, и путь восстанавливается спуском по расстояниям от выхода. На больших открытых картах
+    это в несколько раз быстрее поиска в ширину на чистом Python, а в идеальных лабиринтах, где фронт состоит из
+    нескольких ячеек, накладные расходы NumPy на каждый фронт больше выигрыша. Если numpy не установлен,
+    карта меньше NUMPY_MIN_CELLS ячеек или за поиском нужно следить по ячейкам (анимация, статистика, отмена), поиск
+    идет обычным поиском в ширину, как в bfs.
+    """
+
+    def __init__(self, *args, backend: str = "auto", **kwargs) -> None:
+        """
+        :param backend: способ поиска: numpy, python (обычный поиск в ширину) или auto (numpy, если он установлен и
+        карта не слишком маленькая).
+        """
+
+        super().__init__(*args, **kwargs)
+        if backend not in ("auto", "numpy", "python"):
+            raise ValueError(f"Неизвестный способ поиска '{backend}'")
+
+        if backend == "numpy" and np is None:
+            raise ValueError("Для поиска средствами NumPy нужно установить numpy")
+
+        self._backend: str = backend
+
+    def _search(self, grid: Grid, start: Position, finish: Position) -> SearchResult:
+        # NumPy размечает фронт целиком и не может вызывать функции для каждой ячейки
+        if (self._backend == "python" or np is None or self._on_current or self._on_neighbor
+                or (self._backend == "auto" and len(grid.walls) < NUMPY_MIN_CELLS)):
+            return super()._search(grid, start, finish)
+
+        field = compute_distance_field(grid, start, "numpy", finish)
+        return SearchResult(field.get_path(finish)[::-1], field.labeled)
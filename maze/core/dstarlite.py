@@ -0,0 +1,241 @@
+import heapq
+import math
+from typing import Dict, List, Optional, Tuple
+from .buffers import Buffer
+from .grid import Grid, Position
+from .solver import register_solver, SearchResult, Solver
+
+
+Key = Tuple[float, float]
+
+
+@register_solver("dstar-lite")
+class DStarLiteSolver(Solver):
+    """
+    Класс, в котором происходит поиск выхода из лабиринта методом D* Lite. Поиск идет от выхода ко входу, и его
+    состояние (значения g и rhs и очередь с приоритетами) сохраняется между вызовами solve для той же сетки и того же
+    выхода. После изменения препятствий через Grid.set_wall пересчитываются только ячейки рядом с изменениями и те, чьи
+    расстояния до выхода от них зависят, поэтому повторный поиск обычно намного быстрее поиска с нуля. Вход между
+    поисками может перемещаться.
+
+    Значение g ячейки - известное расстояние от нее до выхода, rhs - расстояние через лучшего соседа. Ячейка
+    согласована, если g == rhs, и в очереди находятся только несогласованные ячейки.
+    """
+
+    KEY_DIGITS: int = 9
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        if self._heuristic.weight > 1:
+            # С весом больше 1 эвристика перестает быть согласованной, и значения g после изменений могут не сойтись
+            raise ValueError("D* Lite поддерживает только вес эвристики 1")
+
+        self._finish: Optional[Position] = None
+        self._finish_index: int = -1
+        self._g_scores: Optional[Buffer] = None
+        self._grid: Optional[Grid] = None
+        self._heap: List[Tuple[float, float, int]] = []
+        self._key_modifier: float = 0
+        self._last_start: Optional[Position] = None
+        self._queued_keys: Dict[int, Key] = {}
+        self._revision: int = 0
+        self._rhs_scores: Optional[Buffer] = None
+        self._start: Optional[Position] = None
+
+    def _are_connected(self, grid: Grid, start: Position, finish: Position) -> bool:
+        # Проверка связных областей не выполняется: после каждого изменения сетки их пришлось бы размечать заново, а
+        # недостижимый выход D* Lite обнаруживает сам и при следующих поисках исправляет только изменившуюся часть.
+        # Токен отмены проверяется до изменения раскрываемой ячейки, поэтому отмененный поиск оставляет состояние
+        # согласованным, и следующий вызов продолжает его
+        return True
+
+    def _calculate_key(self, cell: int) -> Key:
+        """
+        :param cell: индекс ячейки.
+        :return: приоритет ячейки в очереди.
+        """
+
+        g = min(self._g_scores[cell], self._rhs_scores[cell])
+        x, y = self._grid.position(cell)
+        k1 = g + self._heuristic.estimate(x, y, *self._start) + self._key_modifier
+        # Суммы диагональных шагов, сложенные в разном порядке, отличаются в последних знаках. Без округления равные
+        # приоритеты могут оказаться неравными, и поиск остановится раньше, чем станут верными значения на пути
+        return round(k1, DStarLiteSolver.KEY_DIGITS), round(g, DStarLiteSolver.KEY_DIGITS)
+
+    def _compute_shortest_path(self, start_index: int) -> int:
+        """
+        :param start_index: индекс входа в лабиринт.
+        :return: количество раскрытых ячеек.
+        """
+
+        expanded = 0
+        while True:
+            top_key = self._peek_key()
+            if top_key is None or (top_key >= self._calculate_key(start_index) and
+                                   self._rhs_scores[start_index] == self._g_scores[start_index]):
+                return expanded
+
+            cell = self._heap[0][2]
+            new_key = self._calculate_key(cell)
+            if top_key < new_key:
+                # Ключ устарел после перемещения входа, ячейка возвращается в очередь с новым ключом
+                self._push(cell, new_key)
+                continue
+
+            expanded += 1
+            if self._on_current:
+                self._on_current(*self._grid.position(cell))
+
+            neighbors = self._neighborhood.get_neighbors(self._grid, cell)
+            if self._g_scores[cell] > self._rhs_scores[cell]:
+                self._g_scores[cell] = self._rhs_scores[cell]
+                self._remove(cell)
+                for neighbor, step_cost in neighbors:
+                    if neighbor != self._finish_index and step_cost + self._g_scores[cell] < self._rhs_scores[neighbor]:
+                        self._rhs_scores[neighbor] = step_cost + self._g_scores[cell]
+                        self._update_cell(neighbor)
+            else:
+                old_g = self._g_scores[cell]
+                self._g_scores[cell] = math.inf
+                for neighbor, step_cost in neighbors + [(cell, 0)]:
+                    if self._rhs_scores[neighbor] == step_cost + old_g or neighbor == cell:
+                        self._rhs_scores[neighbor] = self._get_rhs(neighbor)
+
+                    self._update_cell(neighbor)
+
+    def _create_path_from_start(self, start_index: int) -> List[Position]:
+        """
+        :param start_index: индекс входа в лабиринт.
+        :return: список из ячеек от входа до выхода или пустой список, если пути нет.
+        """
+
+        if math.isinf(self._g_scores[start_index]):
+            return []
+
+        cell = start_index
+        path = [self._grid.position(cell)]
+        while cell != self._finish_index:
+            # Следующая ячейка - сосед с наименьшей суммой стоимости шага и расстояния до выхода
+            cell = min(self._neighborhood.get_neighbors(self._grid, cell),
+                       key=lambda neighbor: neighbor[1] + self._g_scores[neighbor[0]])[0]
+            path.append(self._grid.position(cell))
+
+        return path
+
+    def _get_affected_cells(self, cell: int) -> List[int]:
+        """
+        :param cell: индекс ячейки, которая стала или перестала быть препятствием.
+        :return: индексы ячеек, у которых могли измениться шаги к соседям. При диагональных шагах от ячейки зависит и
+        возможность срезать угол, поэтому затрагиваются все ячейки квадрата 3x3 вокруг нее.
+        """
+
+        x, y = self._grid.position(cell)
+        if self._neighborhood.diagonal:
+            offsets = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+        else:
+            offsets = [(0, -1), (-1, 0), (0, 0), (1, 0), (0, 1)]
+
+        return [self._grid.index(x + dx, y + dy) for dx, dy in offsets if self._grid.contains(x + dx, y + dy)]
+
+    def _get_rhs(self, cell: int) -> float:
+        """
+        :param cell: индекс ячейки.
+        :return: расстояние от ячейки до выхода через лучшего соседа, 0 для выхода и бесконечность для препятствия.
+        """
+
+        if cell == self._finish_index:
+            return 0
+
+        if self._grid.walls[cell]:
+            return math.inf
+
+        return min((step_cost + self._g_scores[neighbor]
+                    for neighbor, step_cost in self._neighborhood.get_neighbors(self._grid, cell)), default=math.inf)
+
+    def _peek_key(self) -> Optional[Key]:
+        """
+        :return: наименьший приоритет в очереди или None, если очередь пуста. Устаревшие записи кучи пропускаются.
+        """
+
+        while self._heap:
+            k1, k2, cell = self._heap[0]
+            if self._queued_keys.get(cell) == (k1, k2):
+                return k1, k2
+
+            heapq.heappop(self._heap)
+
+        return None
+
+    def _push(self, cell: int, key: Key) -> None:
+        """
+        :param cell: индекс ячейки, которую нужно добавить в очередь или у которой нужно изменить приоритет;
+        :param key: новый приоритет ячейки.
+        """
+
+        if cell not in self._queued_keys and self._on_neighbor:
+            self._on_neighbor(*self._grid.position(cell))
+
+        self._queued_keys[cell] = key
+        heapq.heappush(self._heap, (key[0], key[1], cell))
+
+    def _remove(self, cell: int) -> None:
+        """
+        :param cell: индекс ячейки, которую нужно убрать из очереди. Запись в куче становится устаревшей.
+        """
+
+        self._queued_keys.pop(cell, None)
+
+    def _reset(self, grid: Grid, start: Position, finish: Position) -> None:
+        """
+        :param grid: сетка лабиринта;
+        :param start: вход в лабиринт;
+        :param finish: выход из лабиринта.
+        """
+
+        self._finish = finish
+        self._finish_index = grid.index(*finish)
+        self._g_scores = self._create_buffer(grid, "d", math.inf)
+        self._grid = grid
+        self._heap = []
+        self._key_modifier = 0
+        self._last_start = start
+        self._queued_keys = {}
+        self._revision = grid.revision
+        self._rhs_scores = self._create_buffer(grid, "d", math.inf)
+        self._start = start
+        self._rhs_scores[self._finish_index] = 0
+        self._push(self._finish_index, self._calculate_key(self._finish_index))
+
+    def _search(self, grid: Grid, start: Position, finish: Position) -> SearchResult:
+        changes = grid.get_changes(self._revision) if grid is self._grid and grid.revision >= self._revision else None
+        if changes is None or finish != self._finish:
+            # Если изменений слишком много и старые уже удалены из сетки, путь ищется заново
+            self._reset(grid, start, finish)
+            changes = []
+
+        if start != self._last_start:
+            # Приоритеты в очереди рассчитаны для старого входа. Вместо пересчета всей очереди к новым приоритетам
+            # прибавляется расстояние между входами, которое не больше изменения эвристики
+            self._key_modifier += self._heuristic.estimate(*self._last_start, *start)
+            self._last_start = start
+            self._start = start
+
+        for cell in set(changes):
+            for affected_cell in self._get_affected_cells(cell):
+                self._rhs_scores[affected_cell] = self._get_rhs(affected_cell)
+                self._update_cell(affected_cell)
+
+        self._revision = grid.revision
+        start_index = grid.index(*start)
+        expanded = self._compute_shortest_path(start_index)
+        return SearchResult(self._create_path_from_start(start_index), expanded)
+
+    def _update_cell(self, cell: int) -> None:
+        """
+        :param cell: индекс ячейки, у которой могли измениться значения g или rhs.
+        """
+
+        if self._g_scores[cell] != self._rhs_scores[cell]:
+            self._push(cell, self._calculate_key(cell))
+        else:
+            self._remove(cell)
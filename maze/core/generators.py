@@ -0,0 +1,243 @@
+import random
+from typing import Callable, Dict, List, Optional
+from .grid import Grid
+
+
+Generator = Callable[..., Grid]
+GENERATORS: Dict[str, Generator] = {}
+ROOM_SIZE: int = 8
+
+
+def _create_maze_grid(width: int, height: int, walls: bytearray) -> Grid:
+    """
+    :param width: ширина лабиринта;
+    :param height: высота лабиринта;
+    :param walls: сетка препятствий, в которой комнаты находятся в ячейках с четными координатами.
+    :return: сетка лабиринта со входом в левой верхней комнате и выходом в правой нижней.
+    """
+
+    return Grid(width, height, walls, (0, 0), (2 * ((width - 1) // 2), 2 * ((height - 1) // 2)))
+
+
+def _register_generator(name: str) -> Callable[[Generator], Generator]:
+    """
+    :param name: название генератора.
+    :return: декоратор, который регистрирует функцию-генератор под заданным названием.
+    """
+
+    def decorator(generator: Generator) -> Generator:
+        GENERATORS[name] = generator
+        return generator
+
+    return decorator
+
+
+def _validate_size(width: int, height: int, min_size: int = 1) -> None:
+    """
+    :param width: ширина лабиринта;
+    :param height: высота лабиринта;
+    :param min_size: наименьший допустимый размер.
+    """
+
+    if width < min_size or height < min_size:
+        raise ValueError(f"Размер лабиринта {width}x{height} меньше допустимого {min_size}x{min_size}")
+
+
+@_register_generator("backtracker")
+def generate_backtracker(width: int, height: int, seed: Optional[int] = None) -> Grid:
+    """
+    Функция создает идеальный лабиринт (между любыми двумя комнатами ровно один путь) методом рекурсивного возврата.
+    Комнаты находятся в ячейках с четными координатами, а ячейки между ними - стены или проходы. Рекурсия заменена
+    стеком, поэтому генератор работает и на картах 10000x10000. Лабиринт получается с длинными извилистыми коридорами.
+    :param width: ширина лабиринта;
+    :param height: высота лабиринта;
+    :param seed: начальное значение генератора случайных чисел.
+    :return: сетка лабиринта.
+    """
+
+    _validate_size(width, height)
+    generator = random.Random(seed)
+    room_width = (width + 1) // 2
+    room_height = (height + 1) // 2
+    walls = bytearray(b"\x01") * (width * height)
+    visited = bytearray(room_width * room_height)
+    visited[0] = 1
+    walls[0] = 0
+    stack = [0]
+    while stack:
+        room = stack[-1]
+        room_x, room_y = room % room_width, room // room_width
+        neighbors = []
+        if room_x > 0 and not visited[room - 1]:
+            neighbors.append(room - 1)
+        if room_x < room_width - 1 and not visited[room + 1]:
+            neighbors.append(room + 1)
+        if room_y > 0 and not visited[room - room_width]:
+            neighbors.append(room - room_width)
+        if room_y < room_height - 1 and not visited[room + room_width]:
+            neighbors.append(room + room_width)
+
+        if not neighbors:
+            stack.pop()
+            continue
+
+        next_room = neighbors[generator.randrange(len(neighbors))] if len(neighbors) > 1 else neighbors[0]
+        next_x, next_y = next_room % room_width, next_room // room_width
+        visited[next_room] = 1
+        walls[(room_y + next_y) * width + room_x + next_x] = 0  # Стена между комнатами
+        walls[2 * next_y * width + 2 * next_x] = 0
+        stack.append(next_room)
+
+    return _create_maze_grid(width, height, walls)
+
+
+@_register_generator("prim")
+def generate_prim(width: int, height: int, seed: Optional[int] = None) -> Grid:
+    """
+    Функция создает идеальный лабиринт рандомизированным алгоритмом Прима: к уже построенной части лабиринта каждый раз
+    присоединяется случайная соседняя комната. Лабиринт получается с короткими тупиками и большим количеством
+    развилок.
+    :param width: ширина лабиринта;
+    :param height: высота лабиринта;
+    :param seed: начальное значение генератора случайных чисел.
+    :return: сетка лабиринта.
+    """
+
+    _validate_size(width, height)
+    generator = random.Random(seed)
+    room_width = (width + 1) // 2
+    room_height = (height + 1) // 2
+    walls = bytearray(b"\x01") * (width * height)
+    visited = bytearray(room_width * room_height)
+    frontier = []  # Пары из комнаты и соседней с ней комнаты, уже присоединенной к лабиринту
+
+    def visit(room: int) -> None:
+        room_x, room_y = room % room_width, room // room_width
+        visited[room] = 1
+        walls[2 * room_y * width + 2 * room_x] = 0
+        if room_x > 0 and not visited[room - 1]:
+            frontier.append((room - 1, room))
+        if room_x < room_width - 1 and not visited[room + 1]:
+            frontier.append((room + 1, room))
+        if room_y > 0 and not visited[room - room_width]:
+            frontier.append((room - room_width, room))
+        if room_y < room_height - 1 and not visited[room + room_width]:
+            frontier.append((room + room_width, room))
+
+    visit(0)
+    while frontier:
+        # Случайный элемент меняется местами с последним, чтобы удалить его за постоянное время
+        i = generator.randrange(len(frontier))
+        frontier[i], frontier[-1] = frontier[-1], frontier[i]
+        room, parent = frontier.pop()
+        if not visited[room]:
+            walls[(room // room_width + parent // room_width) * width + room % room_width + parent % room_width] = 0
+            visit(room)
+
+    return _create_maze_grid(width, height, walls)
+
+
+@_register_generator("random")
+def generate_random(width: int, height: int, seed: Optional[int] = None, density: float = 0.3) -> Grid:
+    """
+    Функция заполняет карту препятствиями случайно и независимо с заданной плотностью. Случайные байты переводятся в
+    препятствия одной табличной заменой, поэтому карты 10000x10000 создаются за доли секунды.
+    :param width: ширина лабиринта;
+    :param height: высота лабиринта;
+    :param seed: начальное значение генератора случайных чисел;
+    :param density: доля препятствий от 0 до 1.
+    :return: сетка лабиринта со входом в левом верхнем углу и выходом в правом нижнем. Путь между ними может не
+    существовать.
+    """
+
+    _validate_size(width, height)
+    if not 0 <= density <= 1:
+        raise ValueError(f"Плотность препятствий {density} должна быть от 0 до 1")
+
+    generator = random.Random(seed)
+    threshold = round(density * 256)
+    table = bytes(int(value < threshold) for value in range(256))
+    walls = bytearray(generator.randbytes(width * height).translate(table))
+    walls[0] = walls[-1] = 0
+    return Grid(width, height, walls, (0, 0), (width - 1, height - 1))
+
+
+@_register_generator("rooms")
+def generate_rooms(width: int, height: int, seed: Optional[int] = None, room_size: int = ROOM_SIZE) -> Grid:
+    """
+    Функция создает карту из открытых квадратных комнат, разделенных стенами толщиной в одну ячейку. В каждой стене
+    между соседними комнатами есть дверь в случайном месте. На такой карте много путей одинаковой длины.
+    :param width: ширина лабиринта;
+    :param height: высота лабиринта;
+    :param seed: начальное значение генератора случайных чисел;
+    :param room_size: сторона комнаты.
+    :return: сетка лабиринта со входом в левом верхнем углу и выходом в правом нижнем.
+    """
+
+    _validate_size(width, height)
+    generator = random.Random(seed)
+    period = room_size + 1
+    row = bytearray(int(x % period == room_size) for x in range(width))
+    wall_row = bytearray(b"\x01") * width
+    walls = bytearray().join(wall_row if y % period == room_size else row for y in range(height))
+    for wall_y in range(room_size, height, period):
+        # Двери в горизонтальной стене, по одной для каждой комнаты
+        for room_x in range(0, width, period):
+            door_x = room_x + generator.randrange(min(room_size, width - room_x))
+            walls[wall_y * width + door_x] = 0
+
+    for wall_x in range(room_size, width, period):
+        for room_y in range(0, height, period):
+            door_y = room_y + generator.randrange(min(room_size, height - room_y))
+            walls[door_y * width + wall_x] = 0
+
+    finish_x = width - 1 if (width - 1) % period != room_size else width - 2
+    finish_y = height - 1 if (height - 1) % period != room_size else height - 2
+    return Grid(width, height, walls, (0, 0), (max(finish_x, 0), max(finish_y, 0)))
+
+
+@_register_generator("unreachable")
+def generate_unreachable(width: int, height: int, seed: Optional[int] = None) -> Grid:
+    """
+    Функция создает худший случай: открытую карту, на которой выход в правом нижнем углу отгорожен от остальных ячеек.
+    Алгоритм, который не проверяет связные области, раскрывает все ячейки карты, прежде чем сообщить, что пути нет.
+    :param width: ширина лабиринта, не меньше 3;
+    :param height: высота лабиринта, не меньше 3;
+    :param seed: не используется, нужен для единообразия с другими генераторами.
+    :return: сетка лабиринта.
+    """
+
+    _validate_size(width, height, 3)
+    walls = bytearray(width * height)
+    for x, y in ((width - 2, height - 1), (width - 2, height - 2), (width - 1, height - 2)):
+        walls[y * width + x] = 1
+
+    return Grid(width, height, walls, (0, 0), (width - 1, height - 1))
+
+
+def generate_maze(name: str, width: int, height: int, seed: Optional[int] = None, **kwargs) -> Grid:
+    """
+    :param name: название генератора;
+    :param width: ширина лабиринта;
+    :param height: высота лабиринта;
+    :param seed: начальное значение генератора случайных чисел. С одним и тем же значением создается одна и та же
+    карта;
+    :param kwargs: дополнительные параметры генератора, например density для random.
+    :return: сетка лабиринта.
+    """
+
+    try:
+        generator = GENERATORS[name]
+    except KeyError:
+        raise ValueError(f"Неизвестный генератор лабиринтов '{name}', доступны: "
+                         f"{', '.join(get_generator_names())}") from None
+
+    return generator(width, height, seed, **kwargs)
+
+
+def get_generator_names() -> List[str]:
+    """
+    :return: названия генераторов лабиринтов.
+    """
+
+    return sorted(GENERATORS)
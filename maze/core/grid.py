@@ -0,0 +1,265 @@
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple, Union
+
+
+Position = Tuple[int, int]
+Walls = Union[bytearray, memoryview]
+
+
+class Grid:
+    """
+    Класс для сетки лабиринта. Не зависит от PyQt5 и может использоваться без графического интерфейса.
+    """
+
+    FREE: int = 0
+    MAX_CHANGES: int = 4096  # Сколько последних изменений препятствий хранится как минимум
+    WALL: int = 1
+
+    def __init__(self, width: int, height: int, walls: Optional[Walls] = None, start: Optional[Position] = None,
+                 finish: Optional[Position] = None, starts: Optional[Iterable[Position]] = None,
+                 finishes: Optional[Iterable[Position]] = None, costs: Optional[Walls] = None) -> None:
+        """
+        :param width: ширина лабиринта;
+        :param height: высота лабиринта;
+        :param walls: сетка препятствий размером width * height, индекс ячейки равен y * width + x. Может быть
+        представлением разделяемой памяти;
+        :param start: вход в лабиринт;
+        :param finish: выход из лабиринта;
+        :param starts: все входы в лабиринт, если их несколько. Если задан, start не используется, а входом по
+        умолчанию считается первый из них;
+        :param finishes: все выходы из лабиринта, если их несколько. Если задан, finish не используется, а выходом по
+        умолчанию считается первый из них;
+        :param costs: стоимости прохода через ячейки размером width * height, по байту на ячейку (от 1 до 255). Может
+        быть представлением разделяемой памяти. По умолчанию проход через любую свободную ячейку стоит 1.
+        """
+
+        if walls is not None and len(walls) != width * height:
+            raise ValueError(f"Размер сетки препятствий {len(walls)} не совпадает с размером лабиринта "
+                             f"{width}x{height}")
+
+        if costs is not None:
+            if len(costs) != width * height:
+                raise ValueError(f"Размер сетки стоимостей {len(costs)} не совпадает с размером лабиринта "
+                                 f"{width}x{height}")
+
+            if 0 in costs:
+                raise ValueError("Стоимость прохода через ячейку должна быть не меньше 1")
+
+        self._cache: Dict[Any, Any] = {}
+        self._costs: Optional[Walls] = costs
+        self._changes: List[int] = []
+        self._changes_revision: int = 0  # Номер изменения, с которого начинается _changes
+        self._finishes: List[Position] = list(finishes) if finishes is not None else [finish] if finish else []
+        self._height: int = height
+        self._starts: List[Position] = list(starts) if starts is not None else [start] if start else []
+        self._walls: Walls = walls if walls is not None else bytearray(width * height)
+        self._width: int = width
+
+    @property
+    def cache(self) -> Dict[Any, Any]:
+        """
+        :return: данные, вычисленные по сетке препятствий (связные области, поля расстояний и т.п.), чтобы не
+        вычислять их для каждого поиска заново.
+        """
+
+        return self._cache
+
+    @property
+    def costs(self) -> Optional[Walls]:
+        """
+        :return: стоимости прохода через ячейки, индекс ячейки равен y * width + x, или None, если все ячейки стоят 1.
+        """
+
+        return self._costs
+
+    @property
+    def finish(self) -> Optional[Position]:
+        """
+        :return: выход из лабиринта.
+        """
+
+        return self._finishes[0] if self._finishes else None
+
+    @property
+    def finishes(self) -> List[Position]:
+        """
+        :return: все выходы из лабиринта в порядке их появления на карте.
+        """
+
+        return self._finishes
+
+    @property
+    def height(self) -> int:
+        """
+        :return: высота лабиринта.
+        """
+
+        return self._height
+
+    @property
+    def revision(self) -> int:
+        """
+        :return: количество изменений сетки препятствий с момента создания.
+        """
+
+        return self._changes_revision + len(self._changes)
+
+    @property
+    def start(self) -> Optional[Position]:
+        """
+        :return: вход в лабиринт.
+        """
+
+        return self._starts[0] if self._starts else None
+
+    @property
+    def starts(self) -> List[Position]:
+        """
+        :return: все входы в лабиринт в порядке их появления на карте.
+        """
+
+        return self._starts
+
+    @property
+    def walls(self) -> Walls:
+        """
+        :return: сетка препятствий, индекс ячейки равен y * width + x.
+        """
+
+        return self._walls
+
+    @property
+    def width(self) -> int:
+        """
+        :return: ширина лабиринта.
+        """
+
+        return self._width
+
+    def contains(self, x: int, y: int) -> bool:
+        """
+        :param x: горизонтальная координата;
+        :param y: вертикальная координата.
+        :return: Истина, если ячейка находится внутри лабиринта.
+        """
+
+        return 0 <= x < self._width and 0 <= y < self._height
+
+    def get_changes(self, revision: int) -> Optional[List[int]]:
+        """
+        :param revision: номер изменения, начиная с которого нужны изменения.
+        :return: индексы ячеек, которые стали или перестали быть препятствиями после изменения с заданным номером.
+        Ячейка может встречаться несколько раз. Хранятся только последние изменения (не меньше MAX_CHANGES), и если
+        изменения с заданным номером уже удалены, возвращается None: данные, вычисленные по сетке до этого изменения,
+        нужно вычислить заново.
+        """
+
+        if revision < self._changes_revision:
+            return None
+
+        return self._changes[revision - self._changes_revision:]
+
+    def get_neighbors(self, index: int) -> List[int]:
+        """
+        :param index: индекс ячейки.
+        :return: индексы свободных ячеек, соседних по горизонтали и вертикали.
+        """
+
+        width = self._width
+        walls = self._walls
+        x = index % width
+        neighbors = []
+        if index >= width and not walls[index - width]:
+            neighbors.append(index - width)
+
+        if x > 0 and not walls[index - 1]:
+            neighbors.append(index - 1)
+
+        if x < width - 1 and not walls[index + 1]:
+            neighbors.append(index + 1)
+
+        if index + width < len(walls) and not walls[index + width]:
+            neighbors.append(index + width)
+
+        return neighbors
+
+    def get_step_cost(self, index: int, neighbor: int, base: float = 1) -> float:
+        """
+        Стоимость шага - среднее стоимостей двух ячеек, умноженное на длину шага. Поэтому шаг в обе стороны стоит
+        одинаково, и алгоритмы, которые ищут путь от выхода, находят те же пути. Стоимости не меньше 1, поэтому шаг не
+        дешевле своей длины, и эвристики, оценивающие расстояние по длине шагов, остаются допустимыми.
+        :param index: индекс ячейки;
+        :param neighbor: индекс соседней ячейки;
+        :param base: длина шага: 1 по горизонтали и вертикали, sqrt(2) по диагонали.
+        :return: стоимость шага из ячейки в соседнюю.
+        """
+
+        if self._costs is None:
+            return base
+
+        return base * (self._costs[index] + self._costs[neighbor]) / 2
+
+    def index(self, x: int, y: int) -> int:
+        """
+        :param x: горизонтальная координата;
+        :param y: вертикальная координата.
+        :return: индекс ячейки в сетке препятствий.
+        """
+
+        return y * self._width + x
+
+    def is_free(self, x: int, y: int) -> bool:
+        """
+        :param x: горизонтальная координата;
+        :param y: вертикальная координата.
+        :return: Истина, если ячейка находится внутри лабиринта и не является препятствием.
+        """
+
+        return 0 <= x < self._width and 0 <= y < self._height and not self._walls[y * self._width + x]
+
+    def iter_walls(self) -> Generator[Position, None, None]:
+        """
+        :yield: координаты препятствий.
+        """
+
+        walls = self._walls if isinstance(self._walls, bytearray) else bytes(self._walls)
+        index = walls.find(Grid.WALL)
+        while index != -1:
+            yield index % self._width, index // self._width
+            index = walls.find(Grid.WALL, index + 1)
+
+    def position(self, index: int) -> Position:
+        """
+        :param index: индекс ячейки в сетке препятствий.
+        :return: координаты ячейки.
+        """
+
+        return index % self._width, index // self._width
+
+    def set_wall(self, x: int, y: int, wall: bool = True) -> bool:
+        """
+        Метод добавляет или убирает препятствие. Данные, вычисленные по сетке (связные области, поля расстояний и
+        т.п.), при изменении сбрасываются, а индекс ячейки запоминается, чтобы алгоритмы, хранящие состояние между
+        поисками, могли исправить только затронутую часть.
+        :param x: горизонтальная координата ячейки;
+        :param y: вертикальная координата ячейки;
+        :param wall: если Истина, в ячейке ставится препятствие, иначе ячейка освобождается.
+        :return: Истина, если ячейка изменилась.
+        """
+
+        if not self.contains(x, y):
+            raise ValueError(f"Ячейка ({x}, {y}) находится вне лабиринта {self._width}x{self._height}")
+
+        index = y * self._width + x
+        value = Grid.WALL if wall else Grid.FREE
+        if self._walls[index] == value:
+            return False
+
+        self._walls[index] = value
+        self._changes.append(index)
+        if len(self._changes) >= 2 * Grid.MAX_CHANGES:
+            # Старые изменения удаляются сразу половиной, чтобы не сдвигать список при каждом изменении
+            del self._changes[:Grid.MAX_CHANGES]
+            self._changes_revision += Grid.MAX_CHANGES
+
+        self._cache.clear()
+        return True
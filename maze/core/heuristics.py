@@ -0,0 +1,109 @@
+import math
+from typing import Callable, Dict, List
+
+
+SQRT2: float = math.sqrt(2)
+
+
+def euclidean(dx: int, dy: int) -> float:
+    """
+    :param dx: расстояние по горизонтали;
+    :param dy: расстояние по вертикали.
+    :return: евклидово расстояние.
+    """
+
+    return math.sqrt(dx * dx + dy * dy)
+
+
+def manhattan(dx: int, dy: int) -> float:
+    """
+    :param dx: расстояние по горизонтали;
+    :param dy: расстояние по вертикали.
+    :return: манхэттенское расстояние, точная оценка для движения по горизонтали и вертикали без препятствий.
+    """
+
+    return dx + dy
+
+
+def octile(dx: int, dy: int) -> float:
+    """
+    :param dx: расстояние по горизонтали;
+    :param dy: расстояние по вертикали.
+    :return: октильное расстояние, точная оценка для движения с диагональными шагами без препятствий.
+    """
+
+    return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
+
+
+def zero(dx: int, dy: int) -> float:
+    """
+    :param dx: расстояние по горизонтали;
+    :param dy: расстояние по вертикали.
+    :return: ноль, то есть поиск без эвристики.
+    """
+
+    return 0
+
+
+HEURISTICS: Dict[str, Callable[[int, int], float]] = {"euclidean": euclidean,
+                                                      "manhattan": manhattan,
+                                                      "octile": octile,
+                                                      "zero": zero}
+
+
+class Heuristic:
+    """
+    Класс для оценки расстояния от ячейки до цели поиска. Оценка может умножаться на вес больше единицы: тогда поиск
+    раскрывает меньше ячеек, а длина найденного пути превышает кратчайшую не больше чем в weight раз.
+    """
+
+    def __init__(self, name: str, weight: float = 1.0) -> None:
+        """
+        :param name: название эвристики: euclidean, manhattan, octile или zero;
+        :param weight: вес эвристики, не меньше 1.
+        """
+
+        if name not in HEURISTICS:
+            raise ValueError(f"Неизвестная эвристика '{name}', доступны: {', '.join(get_heuristic_names())}")
+
+        if weight < 1:
+            raise ValueError("Вес эвристики не может быть меньше 1")
+
+        self._function: Callable[[int, int], float] = HEURISTICS[name]
+        self._name: str = name
+        self._weight: float = weight
+
+    @property
+    def name(self) -> str:
+        """
+        :return: название эвристики.
+        """
+
+        return self._name
+
+    @property
+    def weight(self) -> float:
+        """
+        :return: вес эвристики.
+        """
+
+        return self._weight
+
+    def estimate(self, x: int, y: int, target_x: int, target_y: int) -> float:
+        """
+        :param x: горизонтальная координата ячейки;
+        :param y: вертикальная координата ячейки;
+        :param target_x: горизонтальная координата цели;
+        :param target_y: вертикальная координата цели.
+        :return: оценка расстояния от ячейки до цели.
+        """
+
+        return self._weight * self._function(abs(target_x - x), abs(target_y - y))
+
+
+def get_heuristic_names() -> List[str]:
+    """
+    :return: названия доступных эвристик.
+    """
+
+    return sorted(HEURISTICS)
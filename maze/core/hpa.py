@@ -0,0 +1,393 @@
+import heapq
+import math
+from collections import defaultdict
+from itertools import chain
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from .cancel import CellCallback
+from .grid import Grid, Position
+from .neighborhood import Neighborhood
+from .openset import OpenSet
+from .solver import register_solver, SearchResult, Solver
+
+
+DEFAULT_CLUSTER_SIZE: int = 16
+MAX_SINGLE_ENTRANCE: int = 6  # Более длинные участки границы получают два перехода, по краям участка
+
+
+class ClusterGraph:
+    """
+    Класс для абстрактного графа иерархического поиска HPA*. Лабиринт делится на квадратные кластеры. На границах между
+    соседними кластерами выбираются переходы: на каждом непрерывном свободном участке границы - один переход в
+    середине или два по краям, если участок длинный. Вершины графа - ячейки переходов, ребра - шаги через границу и
+    кратчайшие расстояния между переходами одного кластера, которые вычисляются поиском внутри кластера.
+    """
+
+    def __init__(self, grid: Grid, neighborhood: Neighborhood, cluster_size: int = DEFAULT_CLUSTER_SIZE) -> None:
+        """
+        :param grid: сетка лабиринта;
+        :param neighborhood: допустимые шаги между ячейками;
+        :param cluster_size: сторона кластера в ячейках.
+        """
+
+        if cluster_size < 2:
+            raise ValueError("Сторона кластера должна быть не меньше 2")
+
+        self._cluster_size: int = cluster_size
+        self._clusters_x: int = (grid.width + cluster_size - 1) // cluster_size
+        self._edges: Dict[int, Dict[int, float]] = defaultdict(dict)
+        self._grid: Grid = grid
+        self._neighborhood: Neighborhood = neighborhood
+        self._nodes: Dict[int, Dict[int, None]] = defaultdict(dict)  # Упорядоченные множества переходов кластеров
+        self._add_entrances()
+        for cluster, nodes in self._nodes.items():
+            self._connect_nodes(cluster, list(nodes))
+
+    @property
+    def cluster_size(self) -> int:
+        """
+        :return: сторона кластера в ячейках.
+        """
+
+        return self._cluster_size
+
+    @property
+    def edge_count(self) -> int:
+        """
+        :return: количество ребер абстрактного графа.
+        """
+
+        return sum(len(edges) for edges in self._edges.values()) // 2
+
+    @property
+    def node_count(self) -> int:
+        """
+        :return: количество вершин абстрактного графа.
+        """
+
+        return len(self._edges)
+
+    def _add_border(self, pairs: Iterable[Tuple[int, int]]) -> None:
+        """
+        :param pairs: пары соседних ячеек по обе стороны границы между двумя кластерами, вдоль границы.
+        """
+
+        walls = self._grid.walls
+        segment = []
+        for cell, other in chain(pairs, [(-1, -1)]):
+            if cell != -1 and not walls[cell] and not walls[other]:
+                segment.append((cell, other))
+                continue
+
+            if len(segment) >= MAX_SINGLE_ENTRANCE:
+                self._add_transition(*segment[0])
+                self._add_transition(*segment[-1])
+            elif segment:
+                self._add_transition(*segment[len(segment) // 2])
+
+            segment = []
+
+    def _add_entrances(self) -> None:
+        width, height, size = self._grid.width, self._grid.height, self._cluster_size
+        for border_x in range(size - 1, width - 1, size):
+            for first_y in range(0, height, size):
+                self._add_border((y * width + border_x, y * width + border_x + 1)
+                                 for y in range(first_y, min(first_y + size, height)))
+
+        for border_y in range(size - 1, height - 1, size):
+            for first_x in range(0, width, size):
+                self._add_border((border_y * width + x, (border_y + 1) * width + x)
+                                 for x in range(first_x, min(first_x + size, width)))
+
+    def _add_transition(self, cell: int, other: int) -> None:
+        """
+        :param cell: ячейка перехода по одну сторону границы;
+        :param other: соседняя ячейка по другую сторону границы.
+        """
+
+        self._nodes[self.get_cluster(cell)][cell] = None
+        self._nodes[self.get_cluster(other)][other] = None
+        self._edges[cell][other] = self._edges[other][cell] = self._grid.get_step_cost(cell, other)
+
+    def _connect_nodes(self, cluster: int, nodes: List[int]) -> None:
+        """
+        :param cluster: номер кластера;
+        :param nodes: переходы кластера, которые нужно соединить ребрами.
+        """
+
+        for i, node in enumerate(nodes):
+            for target, distance in self.find_distances(node, cluster, nodes[i + 1:]).items():
+                self._edges[node][target] = self._edges[target][node] = distance
+
+    def find_distances(self, source: int, cluster: int, targets: Iterable[int]) -> Dict[int, float]:
+        """
+        Поиск Дейкстры, который не выходит за пределы кластера и останавливается, когда найдены все цели.
+        :param source: индекс ячейки, от которой ищутся расстояния;
+        :param cluster: номер кластера;
+        :param targets: индексы ячеек кластера, до которых нужны расстояния.
+        :return: расстояния до достижимых целей.
+        """
+
+        remaining = set(targets)
+        remaining.discard(source)
+        found = {}
+        distances = {source: 0}
+        heap = [(0, source)]
+        while heap and remaining:
+            distance, cell = heapq.heappop(heap)
+            if distance > distances[cell]:
+                continue
+
+            if cell in remaining:
+                remaining.discard(cell)
+                found[cell] = distance
+
+            for neighbor, step_cost in self._neighborhood.get_neighbors(self._grid, cell):
+                new_distance = distance + step_cost
+                if new_distance < distances.get(neighbor, math.inf) and self.get_cluster(neighbor) == cluster:
+                    distances[neighbor] = new_distance
+                    heapq.heappush(heap, (new_distance, neighbor))
+
+        return found
+
+    def find_path(self, source: int, target: int, clusters: Set[int], heuristic: Callable[[int], float],
+                  on_current: Optional[CellCallback] = None,
+                  on_neighbor: Optional[CellCallback] = None) -> Tuple[List[int], int]:
+        """
+        Поиск A*, который не выходит за пределы заданных кластеров.
+        :param source: индекс начальной ячейки;
+        :param target: индекс конечной ячейки;
+        :param clusters: номера кластеров, в которых можно искать путь;
+        :param heuristic: оценка расстояния от ячейки до конечной ячейки;
+        :param on_current: функция, которая вызывается для каждой раскрытой ячейки;
+        :param on_neighbor: функция, которая вызывается для каждой ячейки, добавленной в очередь.
+        :return: индексы ячеек пути от начальной до конечной (пустой список, если пути нет) и количество раскрытых
+        ячеек.
+        """
+
+        grid = self._grid
+        open_cells = OpenSet()
+        parents = {source: -1}
+        closed = set()
+        expanded = 0
+        open_cells.push(source, 0, heuristic(source))
+        while open_cells:
+            cell, g = open_cells.pop()
+            expanded += 1
+            if on_current:
+                on_current(*grid.position(cell))
+
+            if cell == target:
+                path = []
+                while cell != -1:
+                    path.append(cell)
+                    cell = parents[cell]
+
+                return path[::-1], expanded
+
+            closed.add(cell)
+            for neighbor, step_cost in self._neighborhood.get_neighbors(grid, cell):
+                if neighbor in closed or self.get_cluster(neighbor) not in clusters:
+                    continue
+
+                new_g = g + step_cost
+                if open_cells.push(neighbor, new_g, new_g + heuristic(neighbor)):
+                    parents[neighbor] = cell
+                    if on_neighbor:
+                        on_neighbor(*grid.position(neighbor))
+
+        return [], expanded
+
+    def get_cluster(self, cell: int) -> int:
+        """
+        :param cell: индекс ячейки.
+        :return: номер кластера, в котором находится ячейка.
+        """
+
+        width = self._grid.width
+        return (cell // width // self._cluster_size) * self._clusters_x + cell % width // self._cluster_size
+
+    def get_edges(self, node: int) -> Dict[int, float]:
+        """
+        :param node: индекс ячейки перехода.
+        :return: соседние вершины абстрактного графа и стоимости ребер до них.
+        """
+
+        return self._edges.get(node, {})
+
+    def get_neighbor_clusters(self, cluster: int) -> List[int]:
+        """
+        :param cluster: номер кластера.
+        :return: номера кластера и всех соседних с ним кластеров, включая соседние по диагонали.
+        """
+
+        clusters_y = (self._grid.height + self._cluster_size - 1) // self._cluster_size
+        cluster_x, cluster_y = cluster % self._clusters_x, cluster // self._clusters_x
+        return [y * self._clusters_x + x
+                for y in range(max(cluster_y - 1, 0), min(cluster_y + 2, clusters_y))
+                for x in range(max(cluster_x - 1, 0), min(cluster_x + 2, self._clusters_x))]
+
+    def get_nodes(self, cluster: int) -> List[int]:
+        """
+        :param cluster: номер кластера.
+        :return: индексы ячеек переходов кластера.
+        """
+
+        return list(self._nodes.get(cluster, ()))
+
+
+def get_cluster_graph(grid: Grid, neighborhood: Neighborhood, cluster_size: int = DEFAULT_CLUSTER_SIZE) -> ClusterGraph:
+    """
+    :param grid: сетка лабиринта;
+    :param neighborhood: допустимые шаги между ячейками;
+    :param cluster_size: сторона кластера в ячейках.
+    :return: абстрактный граф лабиринта. Граф строится один раз для карты и запоминается в кэше сетки, который
+    сбрасывается при изменении препятствий.
+    """
+
+    key = "cluster_graph", cluster_size, neighborhood.connectivity, neighborhood.corner_cutting
+    if key not in grid.cache:
+        grid.cache[key] = ClusterGraph(grid, neighborhood, cluster_size)
+
+    return grid.cache[key]
+
+
+@register_solver("hpa")
+class HpaSolver(Solver):
+    """
+    Класс, в котором выход из лабиринта ищется иерархическим методом HPA*. Сначала методом A* ищется путь по
+    абстрактному графу переходов между кластерами, в который временно добавляются вход и выход, затем каждое ребро
+    найденного пути уточняется поиском внутри своего кластера. Абстрактный граф строится один раз для карты, поэтому
+    на больших картах с множеством запросов каждый запрос раскрывает намного меньше ячеек, чем A*. Путь обычно длиннее
+    кратчайшего на несколько процентов, потому что проходит только через выбранные переходы.
+    """
+
+    OPTIMAL: bool = False
+    REFINE_IN_CORRIDOR: bool = False
+
+    def __init__(self, *args, cluster_size: int = DEFAULT_CLUSTER_SIZE, **kwargs) -> None:
+        """
+        :param cluster_size: сторона кластера в ячейках. Чем больше кластер, тем меньше абстрактный граф, но тем
+        дольше он строится и тем дольше уточняется путь.
+        """
+
+        super().__init__(*args, **kwargs)
+        if self._neighborhood.diagonal and self._neighborhood.corner_cutting == "always":
+            # Переходы выбираются только на сторонах кластеров, а шаг через угол кластера мимо препятствий соединял бы
+            # кластеры, между которыми нет переходов
+            raise ValueError("HPA* не поддерживает диагональные шаги с правилом срезания углов always")
+
+        if cluster_size < 2:
+            raise ValueError("Сторона кластера должна быть не меньше 2")
+
+        self._cluster_size: int = cluster_size
+
+    @property
+    def cache_key(self) -> Tuple:
+        return super().cache_key + (self._cluster_size,)
+
+    def _refine(self, graph: ClusterGraph, abstract_path: List[int],
+                heuristic_to: Callable[[int], Callable[[int], float]]) -> Tuple[List[int], int]:
+        """
+        :param graph: абстрактный граф;
+        :param abstract_path: вершины абстрактного пути от входа до выхода;
+        :param heuristic_to: функция, которая возвращает оценку расстояния до заданной ячейки.
+        :return: индексы ячеек пути и количество раскрытых ячеек.
+        """
+
+        if self.REFINE_IN_CORRIDOR:
+            clusters = set()
+            for node in abstract_path:
+                clusters.update(graph.get_neighbor_clusters(graph.get_cluster(node)))
+
+            return graph.find_path(abstract_path[0], abstract_path[-1], clusters, heuristic_to(abstract_path[-1]),
+                                   self._on_current, self._on_neighbor)
+
+        path = [abstract_path[0]]
+        expanded = 0
+        for node, next_node in zip(abstract_path, abstract_path[1:]):
+            cluster = graph.get_cluster(node)
+            if cluster != graph.get_cluster(next_node):
+                path.append(next_node)  # Шаг через границу кластеров
+                continue
+
+            segment, segment_expanded = graph.find_path(node, next_node, {cluster}, heuristic_to(next_node),
+                                                        self._on_current, self._on_neighbor)
+            path.extend(segment[1:])
+            expanded += segment_expanded
+
+        return path, expanded
+
+    def _search(self, grid: Grid, start: Position, finish: Position) -> SearchResult:
+        graph = get_cluster_graph(grid, self._neighborhood, self._cluster_size)
+        start_index = grid.index(*start)
+        finish_index = grid.index(*finish)
+
+        def heuristic_to(target: int) -> Callable[[int], float]:
+            target_x, target_y = grid.position(target)
+            return lambda cell: self._heuristic.estimate(*grid.position(cell), target_x, target_y)
+
+        # Вход и выход соединяются с переходами своих кластеров только на время запроса, кэшированный граф не меняется
+        start_cluster = graph.get_cluster(start_index)
+        finish_cluster = graph.get_cluster(finish_index)
+        extra_edges: Dict[int, Dict[int, float]] = defaultdict(dict)
+        start_targets = graph.get_nodes(start_cluster) + ([finish_index] if start_cluster == finish_cluster else [])
+        for node, distance in graph.find_distances(start_index, start_cluster, start_targets).items():
+            extra_edges[start_index][node] = extra_edges[node][start_index] = distance
+
+        finish_targets = graph.get_nodes(finish_cluster)
+        for node, distance in graph.find_distances(finish_index, finish_cluster, finish_targets).items():
+            extra_edges[finish_index][node] = extra_edges[node][finish_index] = distance
+
+        abstract_path, expanded = self._search_abstract(graph, extra_edges, start_index, finish_index,
+                                                        heuristic_to(finish_index))
+        if not abstract_path:
+            return SearchResult([], expanded)
+
+        path, refine_expanded = self._refine(graph, abstract_path, heuristic_to)
+        return SearchResult([grid.position(cell) for cell in path], expanded + refine_expanded)
+
+    @staticmethod
+    def _search_abstract(graph: ClusterGraph, extra_edges: Dict[int, Dict[int, float]], start: int, finish: int,
+                         heuristic: Callable[[int], float]) -> Tuple[List[int], int]:
+        """
+        :param graph: абстрактный граф;
+        :param extra_edges: ребра, временно добавленные для входа и выхода;
+        :param start: индекс входа;
+        :param finish: индекс выхода;
+        :param heuristic: оценка расстояния от вершины до выхода.
+        :return: вершины абстрактного пути (пустой список, если пути нет) и количество раскрытых вершин.
+        """
+
+        open_nodes = OpenSet()
+        parents = {start: -1}
+        closed = set()
+        expanded = 0
+        open_nodes.push(start, 0, heuristic(start))
+        while open_nodes:
+            node, g = open_nodes.pop()
+            expanded += 1
+            if node == finish:
+                path = []
+                while node != -1:
+                    path.append(node)
+                    node = parents[node]
+
+                return path[::-1], expanded
+
+            closed.add(node)
+            for neighbor, cost in chain(graph.get_edges(node).items(), extra_edges.get(node, {}).items()):
+                if neighbor not in closed and open_nodes.push(neighbor, g + cost, g + cost + heuristic(neighbor)):
+                    parents[neighbor] = node
+
+        return [], expanded
+
+
+@register_solver("hpa-corridor")
+class HpaCorridorSolver(HpaSolver):
+    """
+    Класс, в котором выход из лабиринта ищется методом HPA*, но путь уточняется одним поиском A* по всем кластерам
+    вдоль абстрактного пути и соседним с ними. Путь получается ближе к кратчайшему, чем у hpa, ценой большего количества
+    раскрытых ячеек.
+    """
+
+    REFINE_IN_CORRIDOR: bool = True
@@ -0,0 +1,259 @@
+from typing import List, Optional, Tuple
+from .buffers import Buffer
+from .grid import Grid, Position
+from .heuristics import octile
+from .openset import OpenSet
+from .solver import register_solver, SearchResult, Solver
+
+
+Direction = Tuple[int, int]
+
+
+@register_solver("jps")
+class JpsSolver(Solver):
+    """
+    Класс, в котором происходит поиск выхода из лабиринта методом Jump Point Search. Поиск перепрыгивает прямые
+    участки и добавляет в очередь только точки, в которых путь может повернуть.
+
+    При движении по горизонтали и вертикали из кратчайших путей рассматриваются только те, в которых поворот по
+    вертикали делается как можно раньше. Поэтому при движении по горизонтали повернуть можно только у препятствия, а при
+    движении по вертикали можно повернуть в любую сторону.
+
+    При движении с диагональными шагами поддерживается только правило never (углы препятствий срезать нельзя).
+    Стоимости ячеек не поддерживаются: перепрыгивать прямые участки можно, только если все ячейки стоят одинаково.
+    """
+
+    ALL_DIRECTIONS: Tuple[Direction, ...] = ((0, -1), (-1, 0), (1, 0), (0, 1))
+    WEIGHTED: bool = False
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        if self._neighborhood.diagonal and self._neighborhood.corner_cutting != "never":
+            raise ValueError("Jump Point Search с диагональными шагами поддерживает только правило срезания углов "
+                             "never")
+
+        self._finish: Optional[Position] = None
+        self._grid: Optional[Grid] = None
+        self._h_scores: Optional[Buffer] = None
+
+    def _create_path_for_jump_points(self, parents: Buffer, cell: int) -> List[Position]:
+        """
+        :param parents: индексы предыдущих точек прыжка;
+        :param cell: индекс финальной ячейки.
+        :return: список из всех ячеек от входа до финальной ячейки, включая перепрыгнутые.
+        """
+
+        jump_points = self._create_path(self._grid, parents, cell)
+        path = [jump_points[0]]
+        for x, y in jump_points[1:]:
+            previous_x, previous_y = path[-1]
+            dx = (x > previous_x) - (x < previous_x)
+            dy = (y > previous_y) - (y < previous_y)
+            while path[-1] != (x, y):
+                path.append((path[-1][0] + dx, path[-1][1] + dy))
+
+        return path
+
+    def _get_diagonal_directions(self, x: int, y: int, dx: int, dy: int) -> List[Direction]:
+        """
+        :param x: горизонтальная координата точки прыжка;
+        :param y: вертикальная координата точки прыжка;
+        :param dx: направление движения по горизонтали, с которым поиск пришел в точку;
+        :param dy: направление движения по вертикали, с которым поиск пришел в точку.
+        :return: направления, в которых нужно искать следующие точки прыжка при движении с диагональными шагами.
+        """
+
+        is_free = self._grid.is_free
+        directions = []
+        if dx and dy:
+            if is_free(x, y + dy):
+                directions.append((0, dy))
+
+            if is_free(x + dx, y):
+                directions.append((dx, 0))
+
+            if is_free(x, y + dy) and is_free(x + dx, y):
+                directions.append((dx, dy))
+        elif dx:
+            for side in (-1, 1):
+                if is_free(x, y + side):
+                    directions.append((0, side))
+                    if is_free(x + dx, y):
+                        directions.append((dx, side))
+
+            if is_free(x + dx, y):
+                directions.append((dx, 0))
+        else:
+            for side in (-1, 1):
+                if is_free(x + side, y):
+                    directions.append((side, 0))
+                    if is_free(x, y + dy):
+                        directions.append((side, dy))
+
+            if is_free(x, y + dy):
+                directions.append((0, dy))
+
+        return directions
+
+    def _get_directions(self, x: int, y: int, parent: int) -> List[Direction]:
+        """
+        :param x: горизонтальная координата точки прыжка;
+        :param y: вертикальная координата точки прыжка;
+        :param parent: индекс предыдущей точки прыжка или -1 для входа.
+        :return: направления, в которых нужно искать следующие точки прыжка.
+        """
+
+        if parent == -1:
+            directions = list(self.ALL_DIRECTIONS)
+            if self._neighborhood.diagonal:
+                directions.extend((dx, dy) for dx, dy in self._neighborhood.DIAGONAL_STEPS
+                                  if self._neighborhood.can_step_diagonally(self._grid, x, y, dx, dy))
+
+            return directions
+
+        parent_x, parent_y = self._grid.position(parent)
+        dx = (x > parent_x) - (x < parent_x)
+        dy = (y > parent_y) - (y < parent_y)
+        if self._neighborhood.diagonal:
+            return self._get_diagonal_directions(x, y, dx, dy)
+
+        if dy:
+            return [(0, dy), (-1, 0), (1, 0)]
+
+        directions = [(dx, 0)]
+        for side in (-1, 1):
+            if self._is_forced(x, y, dx, side):
+                directions.append((0, side))
+
+        return directions
+
+    def _get_heuristic(self, cell: int) -> float:
+        """
+        :param cell: индекс ячейки.
+        :return: примерное расстояние от ячейки до выхода. Значение вычисляется один раз для каждой ячейки.
+        """
+
+        h = self._h_scores[cell]
+        if h < 0:
+            x, y = self._grid.position(cell)
+            h = self._heuristic.estimate(x, y, *self._finish)
+            self._h_scores[cell] = h
+
+        return h
+
+    def _is_forced(self, x: int, y: int, dx: int, side: int) -> bool:
+        """
+        :param x: горизонтальная координата ячейки;
+        :param y: вертикальная координата ячейки;
+        :param dx: направление движения по горизонтали;
+        :param side: направление возможного поворота по вертикали.
+        :return: Истина, если при движении по горизонтали в ячейке нужно повернуть по вертикали, потому что повернуть
+        раньше мешало препятствие.
+        """
+
+        return self._grid.is_free(x, y + side) and not self._grid.is_free(x - dx, y + side)
+
+    def _jump(self, x: int, y: int, dx: int, dy: int) -> Optional[int]:
+        """
+        :param x: горизонтальная координата ячейки, из которой начинается прыжок;
+        :param y: вертикальная координата ячейки, из которой начинается прыжок;
+        :param dx: направление прыжка по горизонтали;
+        :param dy: направление прыжка по вертикали.
+        :return: индекс следующей точки прыжка или None, если в этом направлении путь продолжить нельзя.
+        """
+
+        if self._neighborhood.diagonal:
+            return self._jump_with_diagonals(x, y, dx, dy)
+
+        grid = self._grid
+        while True:
+            x += dx
+            y += dy
+            if not grid.is_free(x, y):
+                return None
+
+            if (x, y) == self._finish:
+                return grid.index(x, y)
+
+            if dx:
+                if self._is_forced(x, y, dx, -1) or self._is_forced(x, y, dx, 1):
+                    return grid.index(x, y)
+            elif self._jump(x, y, -1, 0) is not None or self._jump(x, y, 1, 0) is not None:
+                # При движении по вертикали ячейка является точкой прыжка, если из нее есть горизонтальный прыжок
+                return grid.index(x, y)
+
+    def _jump_with_diagonals(self, x: int, y: int, dx: int, dy: int) -> Optional[int]:
+        """
+        :param x: горизонтальная координата ячейки, из которой начинается прыжок;
+        :param y: вертикальная координата ячейки, из которой начинается прыжок;
+        :param dx: направление прыжка по горизонтали;
+        :param dy: направление прыжка по вертикали.
+        :return: индекс следующей точки прыжка при движении с диагональными шагами или None, если в этом направлении
+        путь продолжить нельзя.
+        """
+
+        grid = self._grid
+        is_free = grid.is_free
+        while True:
+            if dx and dy and not (is_free(x + dx, y) and is_free(x, y + dy)):
+                return None
+
+            x += dx
+            y += dy
+            if not is_free(x, y):
+                return None
+
+            if (x, y) == self._finish:
+                return grid.index(x, y)
+
+            if dx and dy:
+                # Углы срезать нельзя, поэтому при диагональном движении вынужденных соседей нет, но ячейка является
+                # точкой прыжка, если из нее есть прыжок по горизонтали или вертикали
+                if self._jump_with_diagonals(x, y, dx, 0) is not None or \
+                        self._jump_with_diagonals(x, y, 0, dy) is not None:
+                    return grid.index(x, y)
+            elif dx:
+                if (is_free(x, y - 1) and not is_free(x - dx, y - 1)) or \
+                        (is_free(x, y + 1) and not is_free(x - dx, y + 1)):
+                    return grid.index(x, y)
+            elif (is_free(x - 1, y) and not is_free(x - 1, y - dy)) or \
+                    (is_free(x + 1, y) and not is_free(x + 1, y - dy)):
+                return grid.index(x, y)
+
+    def _search(self, grid: Grid, start: Position, finish: Position) -> SearchResult:
+        self._finish = finish
+        self._grid = grid
+        self._h_scores = self._create_buffer(grid, "d", -1)
+        closed_cells = self._create_buffer(grid, "B", 0)
+        open_cells = OpenSet(self._get_buffer_size(grid), self._neighborhood.get_typecode(grid))
+        parents = self._create_buffer(grid, "i", -1)
+        finish_index = grid.index(*finish)
+        expanded = 0
+
+        start_index = grid.index(*start)
+        open_cells.push(start_index, 0, self._get_heuristic(start_index))
+        while open_cells:
+            cell, g = open_cells.pop()
+            expanded += 1
+            x, y = grid.position(cell)
+            if self._on_current:
+                self._on_current(x, y)
+
+            if cell == finish_index:
+                return SearchResult(self._create_path_for_jump_points(parents, cell), expanded)
+
+            closed_cells[cell] = 1
+            for dx, dy in self._get_directions(x, y, parents[cell]):
+                jump_point = self._jump(x, y, dx, dy)
+                if jump_point is None or closed_cells[jump_point]:
+                    continue
+
+                jump_x, jump_y = grid.position(jump_point)
+                new_g = g + (octile(abs(jump_x - x), abs(jump_y - y)) if self._neighborhood.diagonal else
+                             abs(jump_x - x) + abs(jump_y - y))
+                if open_cells.push(jump_point, new_g, new_g + self._get_heuristic(jump_point)):
+                    parents[jump_point] = cell
+                    if self._on_neighbor:
+                        self._on_neighbor(jump_x, jump_y)
+
+        return SearchResult([], expanded)
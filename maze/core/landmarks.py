@@ -0,0 +1,195 @@
+import heapq
+import math
+from array import array
+from typing import Callable, List, Tuple
+from .astar import AStarSolver
+from .components import get_components
+from .distance import compute_distance_field, UNREACHABLE
+from .grid import Grid, Position
+from .neighborhood import Neighborhood
+from .solver import register_solver, SearchResult
+
+
+DEFAULT_LANDMARK_BYTES: int = 32 * 1024 * 1024
+DISTANCE_SCALE: int = 64  # Расстояния с диагональными шагами и стоимостями ячеек хранятся в 1/64 долях шага
+MAX_LANDMARKS: int = 16
+
+
+def _compute_distances(grid: Grid, neighborhood: Neighborhood, source: int, scale: int) -> array:
+    """
+    :param grid: сетка лабиринта;
+    :param neighborhood: допустимые шаги между ячейками;
+    :param source: индекс ячейки-ориентира;
+    :param scale: во сколько раз расстояния увеличиваются перед округлением до целых.
+    :return: расстояния от ориентира до всех ячеек, умноженные на scale, UNREACHABLE для недостижимых ячеек. Тип
+    элементов массива - _get_typecode(scale).
+    """
+
+    if scale == 1:
+        # Все шаги стоят 1, поэтому расстояния точно и быстрее всего находит поиск в ширину
+        return compute_distance_field(grid, grid.position(source)).distances
+
+    distances = array("d", [math.inf]) * (grid.width * grid.height)
+    distances[source] = 0
+    heap = [(0.0, source)]
+    while heap:
+        distance, cell = heapq.heappop(heap)
+        if distance > distances[cell]:
+            continue
+
+        for neighbor, step_cost in neighborhood.get_neighbors(grid, cell):
+            new_distance = distance + step_cost
+            if new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                heapq.heappush(heap, (new_distance, neighbor))
+
+    return array(_get_typecode(scale),
+                 (UNREACHABLE if math.isinf(distance) else round(distance * scale) for distance in distances))
+
+
+def _get_typecode(scale: int) -> str:
+    """
+    :param scale: во сколько раз расстояния увеличиваются перед округлением до целых.
+    :return: тип элементов массива расстояний до ориентира. Шаг по диагонали через ячейки стоимостью 9 в 1/64 долях
+    шага стоит больше 800, поэтому на картах из нескольких миллионов ячеек такие расстояния не помещаются в 32 бита и
+    хранятся в 64-битных целых. Расстояния в целых шагах не больше количества ячеек и хранятся в 32-битных.
+    """
+
+    return "i" if scale == 1 else "q"
+
+
+class Landmarks:
+    """
+    Класс для ориентиров эвристики ALT (A*, ориентиры и неравенство треугольника). Для каждого ориентира L заранее
+    вычисляются точные расстояния до всех ячеек. По неравенству треугольника расстояние от ячейки v до цели t не меньше
+    |d(L, t) - d(L, v)|, поэтому наибольшая из таких оценок по всем ориентирам допустима. В лабиринтах с извилистыми
+    коридорами она намного точнее оценки по координатам, так как учитывает стены.
+
+    Ориентиры выбираются по очереди как самые далекие от уже выбранных (первый - самый далекий от произвольной ячейки)
+    в самой большой связной области. Для целей в других областях оценка равна 0.
+    """
+
+    def __init__(self, grid: Grid, neighborhood: Neighborhood, count: int) -> None:
+        """
+        :param grid: сетка лабиринта;
+        :param neighborhood: допустимые шаги между ячейками;
+        :param count: наибольшее количество ориентиров. На маленьких картах ориентиров может быть меньше.
+        """
+
+        # Целые шаги хранятся точно, а дробные округляются, и оценка уменьшается на погрешность округления
+        self._scale: int = 1 if neighborhood.get_typecode(grid) == "i" else DISTANCE_SCALE
+        self._margin: int = 0 if self._scale == 1 else 1
+        self._cells: List[int] = []
+        self._distances: List[array] = []
+        components = get_components(grid, neighborhood)
+        if not count or not components.count:
+            return
+
+        label = max(range(components.count), key=components.sizes.__getitem__)
+        seed = components.labels.index(label)
+        nearest = _compute_distances(grid, neighborhood, seed, self._scale)
+        while len(self._cells) < count:
+            farthest = max(nearest)
+            if farthest <= 0:
+                break  # Все ячейки области уже стали ориентирами
+
+            cell = nearest.index(farthest)
+            distances = _compute_distances(grid, neighborhood, cell, self._scale)
+            self._cells.append(cell)
+            self._distances.append(distances)
+            nearest = array(nearest.typecode, map(min, nearest, distances))
+
+    @property
+    def cells(self) -> List[int]:
+        """
+        :return: индексы ячеек-ориентиров.
+        """
+
+        return self._cells
+
+    @property
+    def size(self) -> int:
+        """
+        :return: объем расстояний до ориентиров в байтах.
+        """
+
+        return sum(distances.itemsize * len(distances) for distances in self._distances)
+
+    def create_estimate(self, target: int) -> Callable[[int], float]:
+        """
+        :param target: индекс ячейки-цели.
+        :return: функция, которая по индексу ячейки возвращает нижнюю оценку расстояния от нее до цели. Ориентиры, из
+        которых цель недостижима, не используются.
+        """
+
+        bounds: List[Tuple[array, int]] = [(distances, distances[target]) for distances in self._distances
+                                           if distances[target] != UNREACHABLE]
+        margin, scale = self._margin, self._scale
+
+        def estimate(cell: int) -> float:
+            bound = max((abs(target_distance - distances[cell]) for distances, target_distance in bounds), default=0)
+            return max(bound - margin, 0) / scale
+
+        return estimate
+
+
+def get_landmarks(grid: Grid, neighborhood: Neighborhood, max_bytes: int = DEFAULT_LANDMARK_BYTES) -> Landmarks:
+    """
+    :param grid: сетка лабиринта;
+    :param neighborhood: допустимые шаги между ячейками;
+    :param max_bytes: наибольший объем расстояний до ориентиров в байтах. На каждый ориентир нужно 4 байта на ячейку, а
+    при диагональных шагах или стоимостях ячеек - 8, поэтому от объема зависит количество ориентиров (не больше
+    MAX_LANDMARKS).
+    :return: ориентиры лабиринта. Они выбираются один раз для карты и запоминаются в кэше сетки, который сбрасывается
+    при изменении препятствий.
+    """
+
+    scale = 1 if neighborhood.get_typecode(grid) == "i" else DISTANCE_SCALE
+    itemsize = array(_get_typecode(scale)).itemsize
+    count = min(MAX_LANDMARKS, max_bytes // (itemsize * max(grid.width * grid.height, 1)))
+    key = "landmarks", count, neighborhood.connectivity, neighborhood.corner_cutting
+    if key not in grid.cache:
+        grid.cache[key] = Landmarks(grid, neighborhood, count)
+
+    return grid.cache[key]
+
+
+@register_solver("alt")
+class AltSolver(AStarSolver):
+    """
+    Класс, в котором выход из лабиринта ищется методом A* с эвристикой ALT: наибольшей из оценки по координатам и
+    оценки по ориентирам (см. Landmarks). Ориентиры выбираются при первом запросе к карте, поэтому алгоритм выгоден,
+    когда к одной карте делается много запросов. Путь остается кратчайшим, а раскрытых ячеек в лабиринтах обычно в
+    несколько раз меньше, чем у astar.
+    """
+
+    BASELINE: str = "astar"
+
+    def __init__(self, *args, landmark_bytes: int = DEFAULT_LANDMARK_BYTES, **kwargs) -> None:
+        """
+        :param landmark_bytes: наибольший объем расстояний до ориентиров в байтах. Чем больше ориентиров, тем точнее
+        оценка, но тем дольше они выбираются и тем дольше вычисляется оценка каждой ячейки.
+        """
+
+        super().__init__(*args, **kwargs)
+        self._estimate_landmarks: Callable[[int], float] = lambda cell: 0
+        self._landmark_bytes: int = landmark_bytes
+
+    @property
+    def cache_key(self) -> Tuple:
+        return super().cache_key + (self._landmark_bytes,)
+
+    def _get_heuristic(self, cell: int) -> float:
+        h = self._h_scores[cell]
+        if h < 0:
+            x, y = self._grid.position(cell)
+            h = max(self._heuristic.estimate(x, y, *self._finish),
+                    self._heuristic.weight * self._estimate_landmarks(cell))
+            self._h_scores[cell] = h
+
+        return h
+
+    def _search(self, grid: Grid, start: Position, finish: Position) -> SearchResult:
+        landmarks = get_landmarks(grid, self._neighborhood, self._landmark_bytes)
+        self._estimate_landmarks = landmarks.create_estimate(grid.index(*finish))
+        return super()._search(grid, start, finish)
@@ -0,0 +1,233 @@
+import time
+from typing import Iterable, List, Optional, Set, Tuple
+from .astar import AStarSolver
+from .cancel import CancelToken
+from .components import get_components, NO_COMPONENT
+from .grid import Grid, Position
+from .openset import OpenSet
+from .solver import get_path_cost, register_solver, SearchResult
+from .stats import measure_phase, SearchStats
+
+
+@register_solver("nearest")
+class MultiTargetSolver(AStarSolver):
+    """
+    Класс для лабиринтов с несколькими входами и выходами. Вместо отдельного поиска для каждой пары вход-выход метод
+    solve_nearest одним поиском A* сразу от всех входов находит ближайший выход (эвристика - оценка до ближайшего
+    выхода), а метод solve_each одним поиском Дейкстры сразу от всех выходов находит для каждого входа путь до
+    ближайшего к нему выхода. Если вход и выход не заданы, solve ищет путь между любыми входом и выходом сетки.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._finishes: List[Position] = []
+
+    def _filter_endpoints(self, grid: Grid, starts: Iterable[Position],
+                          finishes: Iterable[Position]) -> Tuple[List[Position], List[Position]]:
+        """
+        :param grid: сетка лабиринта;
+        :param starts: входы в лабиринт;
+        :param finishes: выходы из лабиринта.
+        :return: входы, из которых можно дойти хотя бы до одного выхода, и выходы, до которых можно дойти хотя бы от
+        одного входа. Повторы и ячейки-препятствия отбрасываются.
+        """
+
+        components = get_components(grid, self._neighborhood)
+        starts = [(position, components.get_label(*position)) for position in dict.fromkeys(starts)]
+        finishes = [(position, components.get_label(*position)) for position in dict.fromkeys(finishes)]
+        start_labels = {label for _, label in starts if label != NO_COMPONENT}
+        finish_labels = {label for _, label in finishes if label != NO_COMPONENT}
+        return ([position for position, label in starts if label in finish_labels],
+                [position for position, label in finishes if label in start_labels])
+
+    def _get_heuristic(self, cell: int) -> float:
+        """
+        :param cell: индекс ячейки.
+        :return: оценка расстояния от ячейки до ближайшего выхода. Наименьшая из допустимых оценок тоже допустима,
+        поэтому найденный путь остается кратчайшим.
+        """
+
+        h = self._h_scores[cell]
+        if h < 0:
+            x, y = self._grid.position(cell)
+            h = min(self._heuristic.estimate(x, y, *finish) for finish in self._finishes)
+            self._h_scores[cell] = h
+
+        return h
+
+    def _search(self, grid: Grid, start: Position, finish: Position) -> SearchResult:
+        return self._search_nearest(grid, [start], [finish])
+
+    def _search_each(self, grid: Grid, starts: List[Position],
+                     finishes: List[Position]) -> Tuple[List[List[Position]], int]:
+        """
+        Поиск Дейкстры идет от всех выходов сразу и заканчивается, когда раскрыты все входы. Допустимые шаги
+        симметричны (шаг из ячейки в соседнюю возможен тогда же, когда и обратный, и стоит столько же), поэтому
+        расстояние от выхода до входа равно расстоянию от входа до выхода.
+        :param grid: сетка лабиринта;
+        :param starts: входы в лабиринт, из которых достижим хотя бы один выход;
+        :param finishes: выходы из лабиринта.
+        :return: пути от каждого входа до ближайшего к нему выхода и количество раскрытых ячеек.
+        """
+
+        closed_cells = self._create_buffer(grid, "B", 0)
+        open_cells = OpenSet(self._get_buffer_size(grid), self._neighborhood.get_typecode(grid))
+        parents = self._create_buffer(grid, "i", -1)
+        remaining: Set[int] = {grid.index(*start) for start in starts}
+        expanded = 0
+        for finish in finishes:
+            open_cells.push(grid.index(*finish), 0, 0)
+
+        while open_cells and remaining:
+            current_cell, current_g = open_cells.pop()
+            expanded += 1
+            if self._on_current:
+                self._on_current(*grid.position(current_cell))
+
+            remaining.discard(current_cell)
+            closed_cells[current_cell] = 1
+            for neighbor, step_cost in self._neighborhood.get_neighbors(grid, current_cell):
+                new_g = current_g + step_cost
+                if not closed_cells[neighbor] and open_cells.push(neighbor, new_g, new_g):
+                    parents[neighbor] = current_cell
+                    if self._on_neighbor:
+                        self._on_neighbor(*grid.position(neighbor))
+
+        paths = []
+        for start in starts:
+            # Родительские ячейки ведут к выходу, поэтому путь получается сразу от входа к выходу
+            cell = grid.index(*start)
+            path = [start]
+            while parents[cell] != -1:
+                cell = parents[cell]
+                path.append(grid.position(cell))
+
+            paths.append(path)
+
+        return paths, expanded
+
+    def _search_nearest(self, grid: Grid, starts: List[Position], finishes: List[Position]) -> SearchResult:
+        """
+        :param grid: сетка лабиринта;
+        :param starts: входы в лабиринт;
+        :param finishes: выходы из лабиринта.
+        :return: кратчайший из путей между любым входом и любым выходом.
+        """
+
+        self._closed_cells = self._create_buffer(grid, "B", 0)
+        self._finishes = finishes
+        self._grid = grid
+        self._h_scores = self._create_buffer(grid, "d", -1)
+        self._open_cells = OpenSet(self._get_buffer_size(grid), self._neighborhood.get_typecode(grid))
+        self._parents = self._create_buffer(grid, "i", -1)
+        finish_cells = {grid.index(*finish) for finish in finishes}
+        expanded = 0
+
+        for start in starts:
+            start_index = grid.index(*start)
+            self._open_cells.push(start_index, 0, self._get_heuristic(start_index))
+
+        while self._open_cells:
+            current_cell, current_g = self._open_cells.pop()
+            expanded += 1
+            if self._on_current:
+                self._on_current(*grid.position(current_cell))
+
+            if current_cell in finish_cells:
+                return SearchResult(self._create_path_for_final_cell(current_cell), expanded)
+
+            self._closed_cells[current_cell] = 1
+            for neighbor, step_cost in self._neighborhood.get_neighbors(grid, current_cell):
+                if not self._closed_cells[neighbor]:
+                    self._update_open_cells(current_cell, current_g + step_cost, neighbor)
+
+        return SearchResult([], expanded)
+
+    def solve(self, grid: Grid, start: Optional[Position] = None, finish: Optional[Position] = None,
+              cancel: Optional[CancelToken] = None, stats: Optional[SearchStats] = None) -> SearchResult:
+        """
+        :param grid: сетка лабиринта;
+        :param start: вход в лабиринт, по умолчанию - все входы сетки;
+        :param finish: выход из лабиринта, по умолчанию - все выходы сетки;
+        :param cancel: токен, через который поиск можно отменить или ограничить по времени;
+        :param stats: объект, в который записывается статистика поиска.
+        :return: результат поиска.
+        """
+
+        return self.solve_nearest(grid, None if start is None else [start], None if finish is None else [finish],
+                                  cancel, stats)
+
+    def solve_each(self, grid: Grid, starts: Optional[Iterable[Position]] = None,
+                   finishes: Optional[Iterable[Position]] = None, cancel: Optional[CancelToken] = None,
+                   stats: Optional[SearchStats] = None) -> List[SearchResult]:
+        """
+        :param grid: сетка лабиринта;
+        :param starts: входы в лабиринт, по умолчанию - все входы сетки;
+        :param finishes: выходы из лабиринта, по умолчанию - все выходы сетки;
+        :param cancel: токен, через который поиск можно отменить или ограничить по времени;
+        :param stats: объект, в который записывается статистика поиска.
+        :return: результаты для каждого входа в том же порядке: кратчайший путь до ближайшего к нему выхода или пустой
+        путь, если ни один выход недостижим. Все пути найдены одним поиском, поэтому количество раскрытых ячеек и время
+        у всех результатов общие.
+        """
+
+        starts = list(grid.starts if starts is None else starts)
+        finishes = list(grid.finishes if finishes is None else finishes)
+        if stats is not None:
+            stats.start_search(grid.width, grid.height)
+
+        paths, expanded, elapsed = {}, 0, 0.0
+        with measure_phase(stats, "solve"):
+            with measure_phase(stats, "components"):
+                connected_starts, connected_finishes = self._filter_endpoints(grid, starts, finishes)
+
+            if connected_starts:
+                started_at = time.perf_counter()
+                with measure_phase(stats, "search"):
+                    found_paths, expanded = self._run_with_hooks(
+                        lambda: self._search_each(grid, connected_starts, connected_finishes), cancel, stats)
+
+                elapsed = time.perf_counter() - started_at
+                paths = dict(zip(connected_starts, found_paths))
+
+        results = [SearchResult(paths.get(start, []), expanded, elapsed, get_path_cost(grid, paths.get(start, [])))
+                   for start in starts]
+        if stats is not None:
+            stats.set_result(bool(paths), sum(result.length for result in results), expanded)
+
+        return results
+
+    def solve_nearest(self, grid: Grid, starts: Optional[Iterable[Position]] = None,
+                      finishes: Optional[Iterable[Position]] = None, cancel: Optional[CancelToken] = None,
+                      stats: Optional[SearchStats] = None) -> SearchResult:
+        """
+        :param grid: сетка лабиринта;
+        :param starts: входы в лабиринт, по умолчанию - все входы сетки;
+        :param finishes: выходы из лабиринта, по умолчанию - все выходы сетки;
+        :param cancel: токен, через который поиск можно отменить или ограничить по времени;
+        :param stats: объект, в который записывается статистика поиска.
+        :return: кратчайший из путей между любым входом и любым выходом.
+        """
+
+        starts = grid.starts if starts is None else starts
+        finishes = grid.finishes if finishes is None else finishes
+        if stats is not None:
+            stats.start_search(grid.width, grid.height)
+
+        result = SearchResult([])
+        with measure_phase(stats, "solve"):
+            with measure_phase(stats, "components"):
+                starts, finishes = self._filter_endpoints(grid, starts, finishes)
+
+            if starts:
+                started_at = time.perf_counter()
+                with measure_phase(stats, "search"):
+                    result = self._run_with_hooks(lambda: self._search_nearest(grid, starts, finishes), cancel, stats)
+
+                result = SearchResult(result.path, result.expanded, time.perf_counter() - started_at,
+                                      get_path_cost(grid, result.path))
+
+        if stats is not None:
+            stats.set_result(result.found, result.length, result.expanded)
+
+        return result
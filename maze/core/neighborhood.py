@@ -0,0 +1,110 @@
+from typing import List, Tuple
+from .grid import Grid
+from .heuristics import SQRT2
+
+
+class Neighborhood:
+    """
+    Класс, который определяет допустимые шаги между ячейками лабиринта: только по горизонтали и вертикали (4 соседа)
+    или еще и по диагонали (8 соседей). Диагональный шаг стоит sqrt(2). Если у сетки заданы стоимости ячеек, стоимость
+    шага умножается на среднее стоимостей двух ячеек (см. Grid.get_step_cost). Правило срезания углов задает, можно ли
+    шагать по диагонали мимо препятствий:
+    - always - можно, если свободна сама диагональная ячейка;
+    - no-squeeze - можно, если свободна хотя бы одна из двух ячеек, через которые проходит угол;
+    - never - можно, только если свободны обе такие ячейки.
+    """
+
+    CORNER_CUTTING_POLICIES: Tuple[str, ...] = ("always", "never", "no-squeeze")
+    DIAGONAL_STEPS: Tuple[Tuple[int, int], ...] = ((-1, -1), (1, -1), (-1, 1), (1, 1))
+
+    def __init__(self, connectivity: int = 4, corner_cutting: str = "never") -> None:
+        """
+        :param connectivity: количество соседей ячейки: 4 или 8;
+        :param corner_cutting: правило срезания углов при диагональных шагах.
+        """
+
+        if connectivity not in (4, 8):
+            raise ValueError("Количество соседей ячейки должно быть 4 или 8")
+
+        if corner_cutting not in Neighborhood.CORNER_CUTTING_POLICIES:
+            raise ValueError(f"Неизвестное правило срезания углов '{corner_cutting}', доступны: "
+                             f"{', '.join(Neighborhood.CORNER_CUTTING_POLICIES)}")
+
+        self._connectivity: int = connectivity
+        self._corner_cutting: str = corner_cutting
+
+    @property
+    def connectivity(self) -> int:
+        """
+        :return: количество соседей ячейки.
+        """
+
+        return self._connectivity
+
+    @property
+    def corner_cutting(self) -> str:
+        """
+        :return: правило срезания углов.
+        """
+
+        return self._corner_cutting
+
+    @property
+    def diagonal(self) -> bool:
+        """
+        :return: Истина, если разрешены диагональные шаги.
+        """
+
+        return self._connectivity == 8
+
+    def can_step_diagonally(self, grid: Grid, x: int, y: int, dx: int, dy: int) -> bool:
+        """
+        :param grid: сетка лабиринта;
+        :param x: горизонтальная координата ячейки;
+        :param y: вертикальная координата ячейки;
+        :param dx: направление шага по горизонтали;
+        :param dy: направление шага по вертикали.
+        :return: Истина, если из ячейки можно шагнуть по диагонали в заданном направлении.
+        """
+
+        if not grid.is_free(x + dx, y + dy):
+            return False
+
+        if self._corner_cutting == "always":
+            return True
+
+        horizontal_free = grid.is_free(x + dx, y)
+        vertical_free = grid.is_free(x, y + dy)
+        if self._corner_cutting == "never":
+            return horizontal_free and vertical_free
+
+        return horizontal_free or vertical_free
+
+    def get_neighbors(self, grid: Grid, index: int) -> List[Tuple[int, float]]:
+        """
+        :param grid: сетка лабиринта;
+        :param index: индекс ячейки.
+        :return: индексы соседних свободных ячеек и стоимости шагов в них.
+        """
+
+        neighbors = [(neighbor, 1) for neighbor in grid.get_neighbors(index)]
+        if self.diagonal:
+            x, y = grid.position(index)
+            for dx, dy in Neighborhood.DIAGONAL_STEPS:
+                if self.can_step_diagonally(grid, x, y, dx, dy):
+                    neighbors.append((index + dy * grid.width + dx, SQRT2))
+
+        if grid.costs is not None:
+            # Без стоимостей ячеек шаги не пересчитываются, поэтому поиск на обычных картах не замедляется
+            neighbors = [(neighbor, grid.get_step_cost(index, neighbor, step_cost))
+                         for neighbor, step_cost in neighbors]
+
+        return neighbors
+
+    def get_typecode(self, grid: Grid) -> str:
+        """
+        :param grid: сетка лабиринта.
+        :return: тип массива для расстояний: целые числа, если все шаги стоят 1, иначе - вещественные.
+        """
+
+        return "d" if self.diagonal or grid.costs is not None else "i"
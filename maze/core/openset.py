@@ -0,0 +1,88 @@
+import heapq
+from typing import List, Optional, Tuple
+from .buffers import Buffer, create_buffer, UNSEEN
+
+
+class OpenSet:
+    """
+    Класс для очереди с приоритетами, в которой хранятся ячейки, ожидающие раскрытия. Для каждой ячейки запоминается
+    лучшее известное значение g, поэтому уменьшение приоритета выполняется добавлением новой записи в кучу, а устаревшие
+    записи пропускаются при извлечении. Добавление, извлечение и уменьшение приоритета выполняются за O(log n).
+    """
+
+    def __init__(self, size: Optional[int] = None, typecode: str = "d") -> None:
+        """
+        :param size: количество ячеек в лабиринте. Если задано, значения g хранятся в плоском массиве, иначе - в
+        словаре;
+        :param typecode: тип значений g в массиве.
+        """
+
+        self._counter: int = 0
+        self._g_scores: Buffer = create_buffer(size, typecode, UNSEEN)
+        self._heap: List[Tuple[float, float, int, int]] = []
+        self._open_flags: Buffer = create_buffer(size, "B", 0)
+        self._size: int = 0
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def g_scores(self) -> Buffer:
+        """
+        :return: лучшие известные расстояния от входа до ячеек, UNSEEN для ячеек, которые еще не встречались.
+        """
+
+        return self._g_scores
+
+    def _skip_stale_entries(self) -> None:
+        while self._heap:
+            _, negative_g, _, cell = self._heap[0]
+            if self._open_flags[cell] and self._g_scores[cell] == -negative_g:
+                return
+
+            heapq.heappop(self._heap)
+
+    def peek_f(self) -> float:
+        """
+        :return: наименьшая оценка f среди ячеек в очереди.
+        """
+
+        self._skip_stale_entries()
+        return self._heap[0][0]
+
+    def pop(self) -> Tuple[int, float]:
+        """
+        :return: индекс ячейки с наименьшей оценкой f и ее значение g. При равных f первой извлекается ячейка с большим
+        g, то есть более близкая к выходу, а при равных g - добавленная раньше.
+        """
+
+        self._skip_stale_entries()
+        _, negative_g, _, cell = heapq.heappop(self._heap)
+        # Значение g остается в хранилище, чтобы повторное добавление раскрытой ячейки с худшим g отклонялось
+        self._open_flags[cell] = 0
+        self._size -= 1
+        return cell, -negative_g
+
+    def push(self, cell: int, g: float, f: float) -> bool:
+        """
+        :param cell: индекс ячейки, которую нужно добавить или у которой нужно уменьшить приоритет;
+        :param g: расстояние от входа до ячейки;
+        :param f: оценка длины пути через ячейку.
+        :return: Истина, если ячейка добавлена или ее значение g улучшилось.
+        """
+
+        best_g = self._g_scores[cell]
+        if best_g != UNSEEN and best_g <= g:
+            return False
+
+        if not self._open_flags[cell]:
+            self._open_flags[cell] = 1
+            self._size += 1
+
+        self._g_scores[cell] = g
+        heapq.heappush(self._heap, (f, -g, self._counter, cell))
+        self._counter += 1
+        return True
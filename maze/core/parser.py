@@ -0,0 +1,209 @@
+import mmap
+import os
+import re
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .binary import BINARY_MAGIC, parse_binary
+from .components import get_components
+from .grid import Grid, Position
+
+
+# Цифры от 1 до 9 - свободные ячейки с такой стоимостью прохода. Цифра 0 обозначает путь и остается препятствием
+_COST_DIGITS: bytes = b"123456789"
+_COST_TABLE: bytes = bytes(symbol - ord("0") if symbol in _COST_DIGITS else 1 for symbol in range(256))
+_COSTS: "re.Pattern[bytes]" = re.compile(rb"[2-9]")
+_ENDPOINTS: "re.Pattern[bytes]" = re.compile(rb"[AaBb]")
+_NON_ASCII: "re.Pattern[bytes]" = re.compile(rb"[\x80-\xff]")
+# Таблицы для bytes.translate: ячейка - в символ карты и символ карты - в ячейку. Пробел, A, B и цифры от 1 до 9 -
+# свободные ячейки, любой другой символ - препятствие
+_SYMBOL_TABLE: bytes = bytes.maketrans(bytes((Grid.FREE, Grid.WALL)), b" *")
+_WALL_TABLE: bytes = bytes(Grid.FREE if symbol in b" AaBb" + _COST_DIGITS else Grid.WALL for symbol in range(256))
+
+
+def _find_endpoints(data, line_starts: array, line_ends: array) -> Tuple[List[Position], List[Position]]:
+    """
+    :param data: содержимое файла с картой;
+    :param line_starts: смещения начал строк;
+    :param line_ends: смещения концов строк без символов перевода строки.
+    :return: координаты всех входов (A) и всех выходов (B) в порядке их появления на карте.
+    """
+
+    starts, finishes = [], []
+    for match in _ENDPOINTS.finditer(data):
+        offset = match.start()
+        y = bisect_right(line_starts, offset) - 1
+        # Символ в переводе строки, чего для A и B не бывает, пропускается для надежности
+        if offset < line_ends[y]:
+            (starts if match.group() in b"Aa" else finishes).append((offset - line_starts[y], y))
+
+    return starts, finishes
+
+
+def _iter_rows(grid: Grid, path: Optional[Iterable[Position]] = None) -> Iterator[bytes]:
+    """
+    :param grid: сетка лабиринта;
+    :param path: путь, который нужно нарисовать на карте.
+    :yield: строки карты лабиринта в том же формате, который читает parse_text, без символов перевода строки.
+    """
+
+    marks: Dict[int, List[Tuple[int, int]]] = {}
+    for x, y in path or ():
+        marks.setdefault(y, []).append((x, ord("0")))
+
+    for symbol, positions in ((ord("A"), grid.starts), (ord("B"), grid.finishes)):
+        for x, y in positions:
+            marks.setdefault(y, []).append((x, symbol))
+
+    width = grid.width
+    walls = memoryview(grid.walls)
+    costs = grid.costs
+    for y in range(grid.height):
+        row = walls[y * width:(y + 1) * width].tobytes().translate(_SYMBOL_TABLE)
+        if costs is not None:
+            row = bytearray(row)
+            for x, cost in enumerate(costs[y * width:(y + 1) * width]):
+                if cost > 1 and row[x] == ord(" "):
+                    if cost > len(_COST_DIGITS):
+                        raise ValueError(f"Стоимость ячейки ({x}, {y}) больше {len(_COST_DIGITS)} и не может быть "
+                                         f"сохранена в текстовом формате")
+
+                    row[x] = _COST_DIGITS[cost - 1]
+
+        if y in marks:
+            row = bytearray(row)
+            for x, symbol in marks[y]:
+                row[x] = symbol
+
+        yield bytes(row)
+
+
+def parse_text(text: str) -> Grid:
+    """
+    :param text: текст с картой лабиринта. Входы обозначаются буквой A, выходы - буквой B (их может быть несколько),
+    пробел - свободная ячейка, цифра от 1 до 9 - свободная ячейка с такой стоимостью прохода (пробел стоит 1), любой
+    другой символ - препятствие.
+    :return: сетка лабиринта. Связные области лабиринта размечаются сразу при чтении.
+    """
+
+    lines = text.split("\n")
+    height = len(lines)
+    width = max(len(line) for line in lines)
+    walls = bytearray(width * height)
+    costs = None
+    starts = []
+    finishes = []
+    for y, line in enumerate(lines):
+        row_start = y * width
+        for x, symbol in enumerate(line):
+            symbol = symbol.lower()
+            if symbol == "a":
+                starts.append((x, y))
+            elif symbol == "b":
+                finishes.append((x, y))
+            elif symbol in "23456789":
+                if costs is None:
+                    costs = bytearray(b"\x01") * (width * height)
+
+                costs[row_start + x] = int(symbol)
+            elif symbol not in " 1":
+                walls[row_start + x] = Grid.WALL
+
+    grid = Grid(width, height, walls, starts=starts, finishes=finishes, costs=costs)
+    get_components(grid)
+    return grid
+
+
+def parse_bytes(data) -> Grid:
+    """
+    Функция разбирает карту как байты, не создавая строк для отдельных символов. Каждая строка карты переводится в
+    строку сетки препятствий одним вызовом bytes.translate, а входы и выходы находятся одним поиском по всем данным.
+    Сетка стоимостей заполняется так же, но только если на карте есть цифры больше 1. Ширина лабиринта равна длине
+    самой длинной строки, короткие строки дополняются свободными ячейками.
+    :param data: содержимое файла с картой в кодировке UTF-8 (bytes, bytearray или mmap). Строки разделяются символами
+    \n или \r\n.
+    :return: сетка лабиринта. Связные области лабиринта размечаются сразу при чтении.
+    """
+
+    if _NON_ASCII.search(data):
+        # Символы не из ASCII занимают несколько байтов, но одну ячейку, поэтому такие карты разбираются как текст
+        return parse_text(bytes(data).decode("utf-8").replace("\r\n", "\n"))
+
+    line_starts = array("q")
+    line_ends = array("q")
+    size = len(data)
+    offset = 0
+    while True:
+        end = data.find(b"\n", offset)
+        line_starts.append(offset)
+        if end == -1:
+            line_ends.append(size)
+            break
+
+        line_ends.append(end - 1 if end > offset and data[end - 1] == ord("\r") else end)
+        offset = end + 1
+
+    height = len(line_starts)
+    width = max(end - start for start, end in zip(line_starts, line_ends))
+    walls = bytearray(width * height)
+    for y in range(height):
+        start = line_starts[y]
+        end = line_ends[y]
+        walls[y * width:y * width + end - start] = data[start:end].translate(_WALL_TABLE)
+
+    costs = None
+    if _COSTS.search(data):
+        costs = bytearray(b"\x01") * (width * height)
+        for y in range(height):
+            start = line_starts[y]
+            end = line_ends[y]
+            costs[y * width:y * width + end - start] = data[start:end].translate(_COST_TABLE)
+
+    starts, finishes = _find_endpoints(data, line_starts, line_ends)
+    grid = Grid(width, height, walls, starts=starts, finishes=finishes, costs=costs)
+    get_components(grid)
+    return grid
+
+
+def format_grid(grid: Grid, path: Optional[Iterable[Position]] = None) -> str:
+    """
+    :param grid: сетка лабиринта;
+    :param path: путь, который нужно нарисовать на карте.
+    :return: текст с картой лабиринта в том же формате, который читает parse_text.
+    """
+
+    return b"\n".join(_iter_rows(grid, path)).decode("ascii")
+
+
+def read_grid(file_name: str) -> Grid:
+    """
+    :param file_name: имя файла, в котором содержится карта лабиринта.
+    :return: сетка лабиринта.
+    """
+
+    with open(file_name, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return parse_text("")
+
+        # Файл отображается в память и разбирается без чтения целиком в строку
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[:len(BINARY_MAGIC)] == BINARY_MAGIC:
+                return parse_binary(data)[0]
+
+            return parse_bytes(data)
+
+
+def write_grid(file_name: str, grid: Grid, path: Optional[Iterable[Position]] = None) -> None:
+    """
+    Функция сохраняет карту в текстовом формате построчно, не собирая весь текст в памяти.
+    :param file_name: имя файла, в который сохранить лабиринт;
+    :param grid: сетка лабиринта;
+    :param path: путь, который нужно нарисовать на карте.
+    """
+
+    with open(file_name, "wb") as file:
+        for y, row in enumerate(_iter_rows(grid, path)):
+            if y:
+                file.write(b"\n")
+
+            file.write(row)
@@ -0,0 +1,316 @@
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from .cancel import CancelToken
+from .grid import Grid, Position
+from .solver import get_path_cost, SearchResult, Solver
+from .stats import measure_phase, SearchStats
+
+
+CacheKey = Tuple[str, Tuple[Position, ...], Tuple[Position, ...], Tuple]
+DEFAULT_MAX_BYTES: int = 64 * 1024 * 1024
+_ENTRY_OVERHEAD: int = 256  # Примерный объем ключа и служебных данных записи в байтах, кроме самого пути
+
+
+def get_grid_hash(grid: Grid) -> str:
+    """
+    :param grid: сетка лабиринта.
+    :return: хэш размеров, сетки препятствий и стоимостей ячеек. Хэш запоминается в кэше сетки, который сбрасывается
+    при каждом изменении через Grid.set_wall, поэтому после изменения препятствий хэш вычисляется заново и запомненные
+    пути для старой карты перестают находиться.
+    """
+
+    digest = grid.cache.get("content_hash")
+    if digest is None:
+        hasher = hashlib.blake2b(struct.pack("<II", grid.width, grid.height), digest_size=16)
+        hasher.update(grid.walls)
+        if grid.costs is not None:
+            hasher.update(grid.costs)
+
+        digest = hasher.hexdigest()
+        grid.cache["content_hash"] = digest
+
+    return digest
+
+
+class PathCache:
+    """
+    Класс для кэша найденных путей. Ключ - хэш карты, вход, выход и параметры алгоритма (Solver.cache_key), поэтому
+    повторный поиск на неизмененной карте возвращает запомненный путь без поиска. В памяти пути хранятся компактно
+    (по 8 байт на ячейку), а при превышении заданного объема удаляются давно не использованные. Если задан каталог,
+    пути сохраняются еще и на диск и находятся после перезапуска программы. Запомненные отсутствия пути тоже
+    возвращаются из кэша. Кэш можно использовать из нескольких потоков.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, directory: Optional[str] = None) -> None:
+        """
+        :param max_bytes: наибольший объем путей в памяти в байтах;
+        :param directory: каталог для хранения путей на диске. По умолчанию пути хранятся только в памяти.
+        """
+
+        if max_bytes < 0:
+            raise ValueError("Объем кэша путей не может быть отрицательным")
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+        self._directory: Optional[str] = directory
+        self._disk_hits: int = 0
+        self._entries: "OrderedDict[CacheKey, array]" = OrderedDict()
+        self._evictions: int = 0
+        self._hits: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        self._max_bytes: int = max_bytes
+        self._misses: int = 0
+        self._size: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def disk_hits(self) -> int:
+        """
+        :return: количество попаданий, для которых путь был прочитан с диска.
+        """
+
+        return self._disk_hits
+
+    @property
+    def evictions(self) -> int:
+        """
+        :return: количество путей, удаленных из памяти из-за превышения объема.
+        """
+
+        return self._evictions
+
+    @property
+    def hit_ratio(self) -> Optional[float]:
+        """
+        :return: доля запросов, для которых путь нашелся в кэше, или None, если запросов не было.
+        """
+
+        total = self._hits + self._misses
+        return self._hits / total if total else None
+
+    @property
+    def hits(self) -> int:
+        """
+        :return: количество запросов, для которых путь нашелся в памяти или на диске.
+        """
+
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        :return: количество запросов, для которых путь пришлось искать.
+        """
+
+        return self._misses
+
+    @property
+    def size(self) -> int:
+        """
+        :return: примерный объем путей в памяти в байтах.
+        """
+
+        return self._size
+
+    @staticmethod
+    def _get_entry_size(coordinates: array) -> int:
+        """
+        :param coordinates: координаты ячеек пути.
+        :return: примерный объем записи в байтах.
+        """
+
+        return _ENTRY_OVERHEAD + coordinates.itemsize * len(coordinates)
+
+    def _get_file_name(self, key: CacheKey) -> str:
+        """
+        :param key: ключ записи.
+        :return: имя файла, в котором путь хранится на диске.
+        """
+
+        digest = hashlib.blake2b(json.dumps(key).encode("utf-8"), digest_size=16).hexdigest()
+        return os.path.join(self._directory, f"{digest}.json")
+
+    @staticmethod
+    def _get_key(grid: Grid, start: Optional[Position], finish: Optional[Position], solver: Solver) -> CacheKey:
+        """
+        :param grid: сетка лабиринта;
+        :param start: вход в лабиринт или None, если вход берется из сетки;
+        :param finish: выход из лабиринта или None, если выход берется из сетки;
+        :param solver: алгоритм поиска.
+        :return: ключ записи. Если вход или выход берется из сетки, в ключ попадают все входы или выходы сетки, так как
+        от них зависит результат алгоритмов с несколькими входами и выходами.
+        """
+
+        starts = (tuple(start),) if start is not None else tuple(map(tuple, grid.starts))
+        finishes = (tuple(finish),) if finish is not None else tuple(map(tuple, grid.finishes))
+        return get_grid_hash(grid), starts, finishes, solver.cache_key
+
+    def _read_from_disk(self, key: CacheKey) -> Optional[array]:
+        """
+        :param key: ключ записи.
+        :return: координаты ячеек пути или None, если пути нет на диске.
+        """
+
+        try:
+            with open(self._get_file_name(key), "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        # Ключ сравнивается после загрузки из JSON, в котором кортежи становятся списками
+        if data.get("key") != json.loads(json.dumps(key)):
+            return None
+
+        return array("I", data["path"])
+
+    def _store(self, key: CacheKey, coordinates: array) -> None:
+        """
+        :param key: ключ записи;
+        :param coordinates: координаты ячеек пути.
+        """
+
+        with self._lock:
+            old_coordinates = self._entries.pop(key, None)
+            if old_coordinates is not None:
+                self._size -= self._get_entry_size(old_coordinates)
+
+            self._entries[key] = coordinates
+            self._size += self._get_entry_size(coordinates)
+            while self._size > self._max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= self._get_entry_size(evicted)
+                self._evictions += 1
+
+    def _write_to_disk(self, key: CacheKey, coordinates: array) -> None:
+        """
+        Файл записывается во временный файл и переименовывается, чтобы параллельные процессы не прочитали его
+        наполовину записанным.
+        :param key: ключ записи;
+        :param coordinates: координаты ячеек пути.
+        """
+
+        file_name = self._get_file_name(key)
+        descriptor, temporary_name = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                json.dump({"key": key, "path": coordinates.tolist()}, file)
+
+            os.replace(temporary_name, file_name)
+        except OSError:
+            if os.path.exists(temporary_name):
+                os.remove(temporary_name)
+
+    def clear(self, disk: bool = False) -> None:
+        """
+        :param disk: если Истина, удаляются и пути, сохраненные на диске. Счетчики попаданий и промахов сохраняются.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+        if disk and self._directory is not None:
+            for file_name in os.listdir(self._directory):
+                if file_name.endswith(".json"):
+                    os.remove(os.path.join(self._directory, file_name))
+
+    def get(self, grid: Grid, start: Optional[Position], finish: Optional[Position],
+            solver: Solver) -> Optional[List[Position]]:
+        """
+        :param grid: сетка лабиринта;
+        :param start: вход в лабиринт или None, если вход берется из сетки;
+        :param finish: выход из лабиринта или None, если выход берется из сетки;
+        :param solver: алгоритм поиска.
+        :return: запомненный путь (пустой, если запомнено, что пути нет) или None, если в кэше ничего нет.
+        """
+
+        key = self._get_key(grid, start, finish, solver)
+        with self._lock:
+            coordinates = self._entries.get(key)
+            if coordinates is not None:
+                self._entries.move_to_end(key)
+
+        from_disk = False
+        if coordinates is None and self._directory is not None:
+            coordinates = self._read_from_disk(key)
+            if coordinates is not None:
+                from_disk = True
+                self._store(key, coordinates)
+
+        with self._lock:
+            if coordinates is None:
+                self._misses += 1
+                return None
+
+            self._hits += 1
+            self._disk_hits += from_disk
+
+        return list(zip(coordinates[::2], coordinates[1::2]))
+
+    def put(self, grid: Grid, start: Optional[Position], finish: Optional[Position], solver: Solver,
+            path: List[Position]) -> None:
+        """
+        :param grid: сетка лабиринта;
+        :param start: вход в лабиринт или None, если вход берется из сетки;
+        :param finish: выход из лабиринта или None, если выход берется из сетки;
+        :param solver: алгоритм поиска;
+        :param path: найденный путь, пустой, если пути нет.
+        """
+
+        key = self._get_key(grid, start, finish, solver)
+        coordinates = array("I", (coordinate for position in path for coordinate in position))
+        self._store(key, coordinates)
+        if self._directory is not None:
+            self._write_to_disk(key, coordinates)
+
+    def solve(self, solver: Solver, grid: Grid, start: Optional[Position] = None, finish: Optional[Position] = None,
+              cancel: Optional[CancelToken] = None, stats: Optional[SearchStats] = None) -> SearchResult:
+        """
+        :param solver: алгоритм поиска;
+        :param grid: сетка лабиринта;
+        :param start: вход в лабиринт, по умолчанию берется из сетки;
+        :param finish: выход из лабиринта, по умолчанию берется из сетки;
+        :param cancel: токен отмены поиска;
+        :param stats: объект, в который записывается статистика поиска.
+        :return: запомненный результат без раскрытых ячеек или результат нового поиска, который запоминается.
+        Отмененный поиск не запоминается.
+        """
+
+        started_at = time.perf_counter()
+        with measure_phase(stats, "cache"):
+            path = self.get(grid, start, finish, solver)
+
+        if path is not None:
+            if stats is not None:
+                stats.start_search(grid.width, grid.height)
+                stats.set_result(bool(path), max(len(path) - 1, 0), 0)
+
+            return SearchResult(path, 0, time.perf_counter() - started_at, get_path_cost(grid, path))
+
+        result = solver.solve(grid, start, finish, cancel, stats)
+        self.put(grid, start, finish, solver, result.path)
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        :return: счетчики кэша в виде словаря, пригодного для сериализации в JSON.
+        """
+
+        return {"hits": self._hits,
+                "misses": self._misses,
+                "disk_hits": self._disk_hits,
+                "evictions": self._evictions,
+                "hit_ratio": self.hit_ratio,
+                "entries": len(self._entries),
+                "size": self._size}
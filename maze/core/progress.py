@@ -0,0 +1,126 @@
+import threading
+from typing import Optional, Tuple
+from .grid import Position
+
+
+class SearchProgress:
+    """
+    Класс, в котором накапливается ход поиска для показа в графическом интерфейсе. Алгоритм поиска вызывает
+    add_current и add_neighbor из своего потока и записывает состояние ячеек в плоский массив, а интерфейс по таймеру
+    забирает номера изменившихся строк и перерисовывает только их. Если задано ограничение, поиск после заданного
+    количества раскрытых ячеек ждет, пока интерфейс не заберет очередную порцию, так что скорость анимации задается без
+    задержек на каждой ячейке.
+    """
+
+    CLOSED: int = 2
+    FRONTIER: int = 1
+    UNVISITED: int = 0
+
+    def __init__(self, width: int, height: int, cells_per_batch: Optional[int] = None) -> None:
+        """
+        :param width: ширина лабиринта;
+        :param height: высота лабиринта;
+        :param cells_per_batch: сколько ячеек можно раскрыть между двумя обращениями интерфейса. Если не задано, поиск
+        идет без ограничений.
+        """
+
+        self._cells: bytearray = bytearray(width * height)
+        self._cells_per_batch: Optional[int] = cells_per_batch
+        self._condition: threading.Condition = threading.Condition()
+        self._current: Optional[Position] = None
+        self._dirty_rows: Optional[Tuple[int, int]] = None
+        self._expanded_in_batch: int = 0
+        self._height: int = height
+        self._width: int = width
+
+    @property
+    def cells(self) -> bytearray:
+        """
+        :return: состояния ячеек (UNVISITED, FRONTIER или CLOSED), индекс ячейки равен y * width + x.
+        """
+
+        return self._cells
+
+    @property
+    def current(self) -> Optional[Position]:
+        """
+        :return: последняя раскрытая ячейка.
+        """
+
+        return self._current
+
+    @property
+    def height(self) -> int:
+        """
+        :return: высота лабиринта.
+        """
+
+        return self._height
+
+    @property
+    def width(self) -> int:
+        """
+        :return: ширина лабиринта.
+        """
+
+        return self._width
+
+    def _mark(self, x: int, y: int, state: int) -> None:
+        """
+        :param x: горизонтальная координата ячейки;
+        :param y: вертикальная координата ячейки;
+        :param state: новое состояние ячейки.
+        """
+
+        self._cells[y * self._width + x] = state
+        if self._dirty_rows is None:
+            self._dirty_rows = y, y + 1
+        elif not self._dirty_rows[0] <= y < self._dirty_rows[1]:
+            self._dirty_rows = min(self._dirty_rows[0], y), max(self._dirty_rows[1], y + 1)
+
+    def add_current(self, x: int, y: int) -> None:
+        """
+        :param x: горизонтальная координата раскрытой ячейки;
+        :param y: вертикальная координата раскрытой ячейки.
+        """
+
+        with self._condition:
+            # Ожидание в начале, а не в конце, чтобы последняя раскрытая ячейка порции была видна в интерфейсе
+            while self._cells_per_batch and self._expanded_in_batch >= self._cells_per_batch:
+                self._condition.wait()
+
+            self._expanded_in_batch += 1
+            self._current = x, y
+            self._mark(x, y, SearchProgress.CLOSED)
+
+    def add_neighbor(self, x: int, y: int) -> None:
+        """
+        :param x: горизонтальная координата ячейки, добавленной в очередь;
+        :param y: вертикальная координата ячейки, добавленной в очередь.
+        """
+
+        with self._condition:
+            if self._cells[y * self._width + x] != SearchProgress.CLOSED:
+                self._mark(x, y, SearchProgress.FRONTIER)
+
+    def release(self) -> None:
+        """
+        Метод снимает ограничение скорости, чтобы поиск, ожидающий интерфейс, мог завершиться.
+        """
+
+        with self._condition:
+            self._cells_per_batch = None
+            self._condition.notify_all()
+
+    def take_dirty_rows(self) -> Optional[Tuple[int, int]]:
+        """
+        :return: номера первой и следующей за последней строк, изменившихся с прошлого вызова, или None, если изменений
+        нет. После вызова поиск может раскрыть следующую порцию ячеек.
+        """
+
+        with self._condition:
+            dirty_rows = self._dirty_rows
+            self._dirty_rows = None
+            self._expanded_in_batch = 0
+            self._condition.notify_all()
+            return dirty_rows
@@ -0,0 +1,265 @@
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Callable, Optional
+from .cancel import CancelToken
+from .grid import Grid, Position
+from .pathcache import PathCache
+from .solver import create_solver, SearchResult, Solver
+from .stats import SearchStats
+
+
+class SearchJob:
+    """
+    Класс для поиска, поставленного в очередь SolverService. Результат можно получить из Future или дождаться в
+    asyncio. Отмена действует и на поиск в очереди, и на уже идущий поиск.
+    """
+
+    def __init__(self, solver: Solver, grid: Grid, start: Optional[Position], finish: Optional[Position],
+                 timeout: Optional[float], stats: Optional[SearchStats] = None,
+                 cache: Optional[PathCache] = None) -> None:
+        """
+        :param solver: алгоритм поиска;
+        :param grid: сетка лабиринта;
+        :param start: вход в лабиринт, по умолчанию берется из сетки;
+        :param finish: выход из лабиринта, по умолчанию берется из сетки;
+        :param timeout: максимальное время в секундах с момента постановки в очередь;
+        :param stats: объект для статистики поиска;
+        :param cache: кэш найденных путей.
+        """
+
+        self._future: "Future[SearchResult]" = Future()
+        self._token: CancelToken = CancelToken(timeout)
+        self.cache: Optional[PathCache] = cache
+        self.finish: Optional[Position] = finish
+        self.grid: Grid = grid
+        self.solver: Solver = solver
+        self.start: Optional[Position] = start
+        self.stats: Optional[SearchStats] = stats
+
+    @property
+    def future(self) -> "Future[SearchResult]":
+        """
+        :return: объект, в который будет записан результат поиска. Если поиск отменен до запуска, объект отменяется, а
+        если во время поиска - в него записывается исключение SearchCancelled.
+        """
+
+        return self._future
+
+    @property
+    def token(self) -> CancelToken:
+        """
+        :return: токен отмены поиска.
+        """
+
+        return self._token
+
+    def add_done_callback(self, callback: Callable[["SearchJob"], None]) -> None:
+        """
+        :param callback: функция, которая будет вызвана после завершения, отмены или ошибки поиска. Вызывается в
+        рабочем потоке сервиса или сразу, если поиск уже завершен.
+        """
+
+        self._future.add_done_callback(lambda _: callback(self))
+
+    def cancel(self) -> None:
+        """
+        Метод отменяет поиск. Поиск в очереди не будет запущен, а идущий поиск завершится при ближайшей проверке токена.
+        """
+
+        self._token.cancel()
+        self._future.cancel()
+
+    def done(self) -> bool:
+        """
+        :return: Истина, если поиск завершен, отменен или закончился ошибкой.
+        """
+
+        return self._future.done()
+
+    def result(self, timeout: Optional[float] = None) -> SearchResult:
+        """
+        :param timeout: сколько секунд ждать результата.
+        :return: результат поиска.
+        """
+
+        return self._future.result(timeout)
+
+    def run(self) -> None:
+        """
+        Метод выполняет поиск в текущем потоке и записывает результат.
+        """
+
+        if not self._future.set_running_or_notify_cancel():
+            return
+
+        try:
+            if self.cache is not None:
+                result = self.cache.solve(self.solver, self.grid, self.start, self.finish, self._token, self.stats)
+            else:
+                result = self.solver.solve(self.grid, self.start, self.finish, self._token, self.stats)
+        except BaseException as exc:
+            self._future.set_exception(exc)
+        else:
+            self._future.set_result(result)
+
+
+class SolverService:
+    """
+    Класс, который выполняет поиски в отдельном рабочем потоке. Поток ждет задачи в очереди и не просыпается, пока их
+    нет, поэтому поиск начинается сразу после постановки в очередь. Поиски выполняются по одному в порядке очереди:
+    алгоритмы хранят состояние в самих объектах (например, D* Lite сохраняет его между поисками), и параллельный
+    запуск одного алгоритма его бы испортил. Рабочий поток запускается при постановке первой задачи, поэтому создание
+    сервиса, например при запуске графического интерфейса, ничего не стоит, пока поиск не нужен.
+    """
+
+    def __init__(self, solver: Optional[Solver] = None, name: str = "solver-service",
+                 cache: Optional[PathCache] = None) -> None:
+        """
+        :param solver: алгоритм поиска по умолчанию. Если не задан, используется astar;
+        :param name: имя рабочего потока;
+        :param cache: кэш найденных путей. Если задан, повторный поиск на неизмененной карте возвращает запомненный
+        путь.
+        """
+
+        self._cache: Optional[PathCache] = cache
+        self._current_job: Optional[SearchJob] = None
+        self._jobs: "queue.Queue[Optional[SearchJob]]" = queue.Queue()
+        self._lock: threading.Lock = threading.Lock()
+        self._name: str = name
+        self._solver: Solver = solver or create_solver("astar")
+        self._stopped: bool = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def cache(self) -> Optional[PathCache]:
+        """
+        :return: кэш найденных путей или None, если пути не запоминаются.
+        """
+
+        return self._cache
+
+    @property
+    def current_job(self) -> Optional[SearchJob]:
+        """
+        :return: поиск, который сейчас выполняется в рабочем потоке, или None. Обратные вызовы алгоритма выполняются в
+        рабочем потоке, поэтому по этому свойству можно узнать, к какому поиску они относятся.
+        """
+
+        with self._lock:
+            return self._current_job
+
+    @property
+    def solver(self) -> Solver:
+        """
+        :return: алгоритм поиска по умолчанию.
+        """
+
+        return self._solver
+
+    @solver.setter
+    def solver(self, solver: Solver) -> None:
+        """
+        :param solver: алгоритм поиска по умолчанию для следующих задач. Задачи, уже поставленные в очередь, выполняются
+        прежним алгоритмом.
+        """
+
+        self._solver = solver
+
+    def _work(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+
+            with self._lock:
+                self._current_job = job
+
+            job.run()
+            with self._lock:
+                self._current_job = None
+
+    def cancel_all(self) -> None:
+        """
+        Метод отменяет идущий поиск и все поиски в очереди.
+        """
+
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+
+            if job is None:
+                # Сигнал остановки должен остаться в очереди
+                self._jobs.put(None)
+                break
+
+            job.cancel()
+
+        with self._lock:
+            if self._current_job is not None:
+                self._current_job.cancel()
+
+    async def solve(self, grid: Grid, start: Optional[Position] = None, finish: Optional[Position] = None,
+                    timeout: Optional[float] = None, solver: Optional[Solver] = None,
+                    stats: Optional[SearchStats] = None) -> SearchResult:
+        """
+        Метод для asyncio: цикл событий не блокируется, пока идет поиск. Если ожидающая задача asyncio отменена, поиск
+        тоже отменяется.
+        :param grid: сетка лабиринта;
+        :param start: вход в лабиринт, по умолчанию берется из сетки;
+        :param finish: выход из лабиринта, по умолчанию берется из сетки;
+        :param timeout: максимальное время в секундах с момента постановки в очередь. Если время вышло, возникает
+        исключение SearchTimeout;
+        :param solver: алгоритм поиска, по умолчанию - алгоритм сервиса;
+        :param stats: объект, в который записывается статистика поиска.
+        :return: результат поиска.
+        """
+
+        # asyncio нужен только этому методу, а импортируется дольше всего пакета, поэтому импортируется при вызове
+        import asyncio
+
+        job = self.submit(grid, start, finish, timeout, solver, stats)
+        try:
+            return await asyncio.wrap_future(job.future)
+        except asyncio.CancelledError:
+            job.cancel()
+            raise
+
+    def stop(self, wait: bool = True) -> None:
+        """
+        Метод отменяет все поиски и останавливает рабочий поток.
+        :param wait: если Истина, метод ждет завершения рабочего потока.
+        """
+
+        self._stopped = True
+        self.cancel_all()
+        self._jobs.put(None)
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def submit(self, grid: Grid, start: Optional[Position] = None, finish: Optional[Position] = None,
+               timeout: Optional[float] = None, solver: Optional[Solver] = None,
+               stats: Optional[SearchStats] = None) -> SearchJob:
+        """
+        :param grid: сетка лабиринта;
+        :param start: вход в лабиринт, по умолчанию берется из сетки;
+        :param finish: выход из лабиринта, по умолчанию берется из сетки;
+        :param timeout: максимальное время в секундах с момента постановки в очередь;
+        :param solver: алгоритм поиска, по умолчанию - алгоритм сервиса;
+        :param stats: объект, в который записывается статистика поиска.
+        :return: задача поиска, которую можно отменить или дождаться.
+        """
+
+        if self._stopped:
+            raise RuntimeError("Сервис поиска остановлен")
+
+        job = SearchJob(solver or self._solver, grid, start, finish, timeout, stats, self._cache)
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._work, name=self._name, daemon=True)
+                self._thread.start()
+
+        self._jobs.put(job)
+        return job
@@ -0,0 +1,370 @@
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from .buffers import Buffer, create_buffer
+from .cancel import CancelToken, CellCallback
+from .components import get_components
+from .grid import Grid, Position
+from .heuristics import Heuristic, SQRT2
+from .neighborhood import Neighborhood
+from .stats import measure_phase, SearchStats
+
+
+class SearchResult:
+    """
+    Класс для результата поиска пути в лабиринте.
+    """
+
+    def __init__(self, path: List[Position], expanded: int = 0, elapsed: float = 0.0,
+                 cost: Optional[float] = None) -> None:
+        """
+        :param path: список ячеек от входа до выхода, пустой, если путь не найден;
+        :param expanded: количество раскрытых ячеек;
+        :param elapsed: время поиска в секундах;
+        :param cost: стоимость пути с учетом стоимостей ячеек (см. get_path_cost). По умолчанию вычисляется по
+        длинам шагов.
+        """
+
+        self._cost: Optional[float] = cost
+        self._elapsed: float = elapsed
+        self._expanded: int = expanded
+        self._path: List[Position] = path
+
+    @property
+    def cost(self) -> float:
+        """
+        :return: стоимость найденного пути. Если стоимость не задана при создании, шаг по горизонтали или вертикали
+        стоит 1, по диагонали - sqrt(2).
+        """
+
+        if self._cost is not None:
+            return self._cost
+
+        return sum(SQRT2 if x != next_x and y != next_y else 1
+                   for (x, y), (next_x, next_y) in zip(self._path, self._path[1:]))
+
+    @property
+    def elapsed(self) -> float:
+        """
+        :return: время поиска в секундах.
+        """
+
+        return self._elapsed
+
+    @property
+    def expanded(self) -> int:
+        """
+        :return: количество раскрытых ячеек.
+        """
+
+        return self._expanded
+
+    @property
+    def found(self) -> bool:
+        """
+        :return: Истина, если путь найден.
+        """
+
+        return bool(self._path)
+
+    @property
+    def length(self) -> int:
+        """
+        :return: количество шагов в найденном пути.
+        """
+
+        return max(len(self._path) - 1, 0)
+
+    @property
+    def path(self) -> List[Position]:
+        """
+        :return: список ячеек от входа до выхода.
+        """
+
+        return self._path
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        :return: словарь с результатом поиска, пригодный для сериализации в JSON.
+        """
+
+        return {"found": self.found,
+                "length": self.length,
+                "cost": self.cost,
+                "expanded": self._expanded,
+                "elapsed": self._elapsed,
+                "path": [list(position) for position in self._path]}
+
+
+class Solver:
+    """
+    Базовый класс для алгоритмов поиска пути в лабиринте. Все алгоритмы возвращают кратчайший путь в одном и том же
+    формате, поэтому их результаты можно сравнивать между собой.
+    """
+
+    BASELINE: str = ""  # Алгоритм, с которым compare сравнивает количество раскрытых ячеек
+    NAME: str = ""
+    OPTIMAL: bool = True  # Ложь для алгоритмов, которые ради скорости могут находить путь длиннее кратчайшего
+    WEIGHTED: bool = True  # Ложь для алгоритмов, которые считают все шаги одинаковыми и не учитывают стоимости ячеек
+
+    def __init__(self, on_current: Optional[CellCallback] = None, on_neighbor: Optional[CellCallback] = None,
+                 dense: bool = True, connectivity: int = 4, corner_cutting: str = "never",
+                 heuristic: Optional[str] = None, weight: float = 1.0) -> None:
+        """
+        :param on_current: функция, которая вызывается для каждой раскрытой ячейки;
+        :param on_neighbor: функция, которая вызывается для каждой ячейки, добавленной в очередь;
+        :param dense: если Истина, состояние поиска хранится в плоских массивах на все ячейки лабиринта (быстрее и
+        компактнее на ячейку), иначе - в словарях только для посещенных ячеек (выгоднее для коротких путей на огромных
+        картах);
+        :param connectivity: количество соседей ячейки: 4 или 8;
+        :param corner_cutting: правило срезания углов при диагональных шагах: always, never или no-squeeze;
+        :param heuristic: название эвристики. По умолчанию manhattan для 4 соседей и octile для 8 соседей;
+        :param weight: вес эвристики. При весе больше 1 поиск быстрее, но путь может быть длиннее кратчайшего.
+        """
+
+        self._dense: bool = dense
+        self._neighborhood: Neighborhood = Neighborhood(connectivity, corner_cutting)
+        if heuristic is None:
+            heuristic = "octile" if self._neighborhood.diagonal else "manhattan"
+        elif heuristic == "manhattan" and self._neighborhood.diagonal:
+            # Диагональный шаг стоит sqrt(2), а манхэттенское расстояние считает его за 2, поэтому завышает оценку, и
+            # найденный путь может оказаться длиннее кратчайшего
+            raise ValueError("Эвристика manhattan завышает расстояние при диагональных шагах, используйте octile или "
+                             "euclidean")
+
+        self._heuristic: Heuristic = Heuristic(heuristic, weight)
+        self._on_current: Optional[CellCallback] = on_current
+        self._on_neighbor: Optional[CellCallback] = on_neighbor
+
+    @property
+    def cache_key(self) -> Tuple:
+        """
+        :return: название алгоритма и параметры, от которых зависит найденный путь. Результаты поиска с одинаковым
+        ключом на одной и той же карте совпадают, поэтому их можно запоминать в PathCache.
+        """
+
+        return (self.NAME, self._neighborhood.connectivity, self._neighborhood.corner_cutting, self._heuristic.name,
+                self._heuristic.weight)
+
+    @property
+    def heuristic(self) -> Heuristic:
+        """
+        :return: эвристика, которую использует алгоритм.
+        """
+
+        return self._heuristic
+
+    @property
+    def neighborhood(self) -> Neighborhood:
+        """
+        :return: допустимые шаги между ячейками.
+        """
+
+        return self._neighborhood
+
+    @property
+    def optimal(self) -> bool:
+        """
+        :return: Истина, если найденный путь гарантированно кратчайший: алгоритм точный (OPTIMAL), а эвристика не
+        умножается на вес больше 1.
+        """
+
+        return self.OPTIMAL and (self._heuristic.weight == 1 or self._heuristic.name == "zero")
+
+    def _are_connected(self, grid: Grid, start: Position, finish: Position) -> bool:
+        """
+        :param grid: сетка лабиринта;
+        :param start: вход в лабиринт;
+        :param finish: выход из лабиринта.
+        :return: Истина, если путь может существовать. Если вход и выход в разных связных областях, путь не существует
+        и искать его не нужно.
+        """
+
+        return get_components(grid, self._neighborhood).are_connected(start, finish)
+
+    def _create_buffer(self, grid: Grid, typecode: str, fill: float) -> Buffer:
+        """
+        :param grid: сетка лабиринта;
+        :param typecode: тип элементов массива;
+        :param fill: начальное значение для всех ячеек.
+        :return: хранилище состояния ячеек, индекс ячейки равен y * width + x.
+        """
+
+        return create_buffer(self._get_buffer_size(grid), typecode, fill)
+
+    @staticmethod
+    def _create_path(grid: Grid, parents: Buffer, cell: int) -> List[Position]:
+        """
+        :param grid: сетка лабиринта;
+        :param parents: индексы родительских ячеек, -1 для входа в лабиринт;
+        :param cell: индекс финальной ячейки, до которой нужно построить путь.
+        :return: список из ячеек от входа до финальной ячейки.
+        """
+
+        path = []
+        while cell != -1:
+            path.append(grid.position(cell))
+            cell = parents[cell]
+
+        return path[::-1]
+
+    def _get_buffer_size(self, grid: Grid) -> Optional[int]:
+        """
+        :param grid: сетка лабиринта.
+        :return: размер плоских массивов для состояния поиска или None, если состояние хранится в словарях.
+        """
+
+        return grid.width * grid.height if self._dense else None
+
+    def _run_with_hooks(self, search: Callable[[], Any], cancel: Optional[CancelToken],
+                        stats: Optional[SearchStats]) -> Any:
+        """
+        :param search: функция, которая выполняет поиск;
+        :param cancel: токен отмены поиска;
+        :param stats: объект для статистики поиска. Алгоритмы вызывают on_current и on_neighbor для каждой раскрытой
+        ячейки и каждой ячейки, добавленной в очередь, поэтому на время поиска к этим функциям добавляются проверка
+        токена и сбор статистики. Без токена и статистики поиск идет без дополнительных вызовов.
+        :return: результат функции поиска.
+        """
+
+        if cancel is None and stats is None:
+            return search()
+
+        on_current, on_neighbor = self._on_current, self._on_neighbor
+        if stats is not None:
+            self._on_current, self._on_neighbor = stats.wrap(on_current, on_neighbor)
+
+        if cancel is not None:
+            cancel.check()
+            self._on_current = cancel.wrap(self._on_current)
+
+        try:
+            return search()
+        finally:
+            self._on_current, self._on_neighbor = on_current, on_neighbor
+
+    def _search(self, grid: Grid, start: Position, finish: Position) -> SearchResult:
+        """
+        :param grid: сетка лабиринта;
+        :param start: вход в лабиринт;
+        :param finish: выход из лабиринта.
+        :return: результат поиска без учета времени.
+        """
+
+        raise NotImplementedError
+
+    def _solve(self, grid: Grid, start: Optional[Position], finish: Optional[Position], cancel: Optional[CancelToken],
+               stats: Optional[SearchStats]) -> SearchResult:
+        """
+        :param grid: сетка лабиринта;
+        :param start: вход в лабиринт;
+        :param finish: выход из лабиринта;
+        :param cancel: токен отмены поиска;
+        :param stats: объект для статистики поиска.
+        :return: результат поиска.
+        """
+
+        self.check_grid(grid)
+        if start is None or finish is None or not grid.is_free(*start) or not grid.is_free(*finish):
+            return SearchResult([])
+
+        with measure_phase(stats, "components"):
+            connected = self._are_connected(grid, start, finish)
+
+        if not connected:
+            return SearchResult([])
+
+        started_at = time.perf_counter()
+        with measure_phase(stats, "search"):
+            result = self._run_with_hooks(lambda: self._search(grid, start, finish), cancel, stats)
+
+        return SearchResult(result.path, result.expanded, time.perf_counter() - started_at,
+                            get_path_cost(grid, result.path))
+
+    def check_grid(self, grid: Grid) -> None:
+        """
+        Метод позволяет отклонить карту до поиска, например до постановки в очередь или отправки в рабочий процесс.
+        :param grid: сетка лабиринта. Если алгоритм не может искать путь на этой карте (не поддерживает стоимости
+        ячеек), возникает исключение ValueError.
+        """
+
+        if grid.costs is not None and not self.WEIGHTED:
+            raise ValueError(f"Алгоритм {self.NAME} не поддерживает стоимости ячеек")
+
+    def solve(self, grid: Grid, start: Optional[Position] = None, finish: Optional[Position] = None,
+              cancel: Optional[CancelToken] = None, stats: Optional[SearchStats] = None) -> SearchResult:
+        """
+        :param grid: сетка лабиринта;
+        :param start: вход в лабиринт, по умолчанию берется из сетки;
+        :param finish: выход из лабиринта, по умолчанию берется из сетки;
+        :param cancel: токен, через который поиск можно отменить или ограничить по времени. Если поиск отменен,
+        возникает исключение SearchCancelled;
+        :param stats: объект, в который записывается статистика поиска. По умолчанию статистика не собирается.
+        :return: результат поиска.
+        """
+
+        if stats is not None:
+            stats.start_search(grid.width, grid.height)
+
+        with measure_phase(stats, "solve"):
+            result = self._solve(grid, start or grid.start, finish or grid.finish, cancel, stats)
+
+        if stats is not None:
+            stats.set_result(result.found, result.length, result.expanded)
+
+        return result
+
+
+SOLVERS: Dict[str, Type[Solver]] = {}
+
+
+def create_solver(name: str, **kwargs) -> Solver:
+    """
+    :param name: название алгоритма поиска;
+    :param kwargs: параметры, которые передаются в конструктор алгоритма.
+    :return: объект алгоритма поиска.
+    """
+
+    try:
+        solver_class = SOLVERS[name]
+    except KeyError:
+        raise ValueError(f"Неизвестный алгоритм поиска '{name}', доступны: {', '.join(get_solver_names())}") from None
+
+    return solver_class(**kwargs)
+
+
+def get_path_cost(grid: Grid, path: List[Position]) -> float:
+    """
+    :param grid: сетка лабиринта;
+    :param path: список ячеек пути.
+    :return: стоимость пути с учетом стоимостей ячеек сетки.
+    """
+
+    cost = 0
+    for (x, y), (next_x, next_y) in zip(path, path[1:]):
+        cost += grid.get_step_cost(grid.index(x, y), grid.index(next_x, next_y),
+                                   SQRT2 if x != next_x and y != next_y else 1)
+
+    return cost
+
+
+def get_solver_names() -> List[str]:
+    """
+    :return: названия зарегистрированных алгоритмов поиска.
+    """
+
+    return sorted(SOLVERS)
+
+
+def register_solver(name: str) -> Callable[[Type[Solver]], Type[Solver]]:
+    """
+    Декоратор, который регистрирует алгоритм поиска под заданным названием.
+    :param name: название алгоритма поиска.
+    :return: декоратор для класса алгоритма.
+    """
+
+    def decorator(solver_class: Type[Solver]) -> Type[Solver]:
+        solver_class.NAME = name
+        SOLVERS[name] = solver_class
+        return solver_class
+
+    return decorator
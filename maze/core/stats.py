@@ -0,0 +1,264 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Tuple
+from .cancel import CellCallback
+
+
+Phase = Tuple[str, float, float, int]  # Название, начало и длительность в секундах, глубина вложенности
+
+
+class SearchStats:
+    """
+    Класс для статистики поиска: счетчиков раскрытых ячеек и ячеек, добавленных в очередь, наибольших размеров открытого
+    и закрытого множеств и времени отдельных этапов (чтения карты, разметки связных областей, поиска, отрисовки).
+    Статистика собирается, только если объект передан в Solver.solve, поэтому без него поиск работает так же быстро,
+    как раньше. Размеры множеств считаются по состоянию ячеек, а не по внутренним структурам алгоритмов, поэтому
+    одинаково работают для всех алгоритмов.
+    """
+
+    CLOSED: int = 2
+    FRONTIER: int = 1
+    UNVISITED: int = 0
+
+    def __init__(self) -> None:
+        self._closed: int = 0
+        self._created_at: float = time.perf_counter()
+        self._depth: int = 0
+        self._expanded: int = 0
+        self._found: bool = False
+        self._open: int = 0
+        self._path_length: int = 0
+        self._peak_open: int = 0
+        self._phases: List[Phase] = []
+        self._pushed: int = 0
+        self._reopened: int = 0
+        self._states: bytearray = bytearray()
+        self._width: int = 0
+
+    @property
+    def expanded(self) -> int:
+        """
+        :return: количество раскрытых ячеек.
+        """
+
+        return self._expanded
+
+    @property
+    def expansion_ratio(self) -> Optional[float]:
+        """
+        :return: отношение количества раскрытых ячеек к количеству ячеек пути. Чем ближе к 1, тем точнее эвристика
+        направляет поиск. None, если путь не найден.
+        """
+
+        if not self._found:
+            return None
+
+        return self._expanded / (self._path_length + 1)
+
+    @property
+    def peak_closed(self) -> int:
+        """
+        :return: количество раскрытых ячеек без повторов, то есть наибольший размер закрытого множества.
+        """
+
+        return self._closed
+
+    @property
+    def peak_open(self) -> int:
+        """
+        :return: наибольшее количество ячеек, которые одновременно находились в очереди и еще не были раскрыты.
+        """
+
+        return self._peak_open
+
+    @property
+    def phases(self) -> List[Phase]:
+        """
+        :return: этапы: название, начало в секундах от создания объекта, длительность в секундах и глубина
+        вложенности.
+        """
+
+        return self._phases
+
+    @property
+    def pushed(self) -> int:
+        """
+        :return: количество добавлений ячеек в очередь, включая обновления приоритета.
+        """
+
+        return self._pushed
+
+    @property
+    def reopened(self) -> int:
+        """
+        :return: количество повторных раскрытий уже раскрытых ячеек.
+        """
+
+        return self._reopened
+
+    def get_phase_time(self, name: str) -> float:
+        """
+        :param name: название этапа.
+        :return: суммарная длительность этапов с этим названием в секундах.
+        """
+
+        return sum(duration for phase_name, _, duration, _ in self._phases if phase_name == name)
+
+    def on_current(self, x: int, y: int) -> None:
+        """
+        :param x: горизонтальная координата раскрытой ячейки;
+        :param y: вертикальная координата раскрытой ячейки.
+        """
+
+        index = y * self._width + x
+        state = self._states[index]
+        self._expanded += 1
+        if state == SearchStats.CLOSED:
+            self._reopened += 1
+            return
+
+        if state == SearchStats.FRONTIER:
+            self._open -= 1
+
+        self._closed += 1
+        self._states[index] = SearchStats.CLOSED
+
+    def on_neighbor(self, x: int, y: int) -> None:
+        """
+        :param x: горизонтальная координата ячейки, добавленной в очередь;
+        :param y: вертикальная координата ячейки, добавленной в очередь.
+        """
+
+        index = y * self._width + x
+        self._pushed += 1
+        if self._states[index] == SearchStats.UNVISITED:
+            self._states[index] = SearchStats.FRONTIER
+            self._open += 1
+            if self._open > self._peak_open:
+                self._peak_open = self._open
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Контекстный менеджер, который измеряет длительность этапа. Этапы могут быть вложенными.
+        :param name: название этапа.
+        """
+
+        # Этап добавляется в начале, чтобы внешние этапы шли в списке раньше вложенных
+        started_at = time.perf_counter()
+        index = len(self._phases)
+        self._phases.append((name, started_at - self._created_at, 0.0, self._depth))
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self._phases[index] = name, started_at - self._created_at, time.perf_counter() - started_at, self._depth
+
+    def set_result(self, found: bool, path_length: int, expanded: int) -> None:
+        """
+        :param found: Истина, если путь найден;
+        :param path_length: количество шагов в найденном пути;
+        :param expanded: количество раскрытых ячеек по подсчету алгоритма. Алгоритмы, которые не вызывают on_current
+        (например, поле расстояний), считают раскрытые ячейки сами.
+        """
+
+        self._expanded = expanded
+        self._found = found
+        self._path_length = path_length
+
+    def start_search(self, width: int, height: int) -> None:
+        """
+        Метод сбрасывает счетчики перед новым поиском. Время этапов сохраняется.
+        :param width: ширина лабиринта;
+        :param height: высота лабиринта.
+        """
+
+        self._closed = self._expanded = self._open = self._peak_open = self._pushed = self._reopened = 0
+        self._found = False
+        self._path_length = 0
+        self._states = bytearray(width * height)
+        self._width = width
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        :return: статистика в виде словаря, пригодного для сериализации в JSON.
+        """
+
+        return {"expanded": self._expanded,
+                "pushed": self._pushed,
+                "reopened": self._reopened,
+                "peak_open": self._peak_open,
+                "peak_closed": self._closed,
+                "found": self._found,
+                "path_length": self._path_length,
+                "expansion_ratio": self.expansion_ratio,
+                "phases": [{"name": name, "start": start, "duration": duration, "depth": depth}
+                           for name, start, duration, depth in self._phases]}
+
+    def to_trace(self) -> List[Dict[str, Any]]:
+        """
+        :return: этапы в формате Trace Event (JSON-массив событий), который открывают chrome://tracing, Perfetto и
+        speedscope в виде flame graph. Вложенные этапы отображаются друг под другом. Счетчики добавляются как
+        аргументы событий.
+        """
+
+        pid, tid = os.getpid(), threading.get_ident()
+        events = [{"name": name, "ph": "X", "ts": start * 1e6, "dur": duration * 1e6, "pid": pid, "tid": tid}
+                  for name, start, duration, _ in self._phases]
+        if events:
+            events[0]["args"] = {key: value for key, value in self.to_dict().items() if key != "phases"}
+
+        return events
+
+    def wrap(self, on_current: Optional[CellCallback],
+             on_neighbor: Optional[CellCallback]) -> Tuple[CellCallback, CellCallback]:
+        """
+        :param on_current: функция, которую алгоритм вызывает для каждой раскрытой ячейки, или None;
+        :param on_neighbor: функция, которую алгоритм вызывает для каждой ячейки, добавленной в очередь, или None.
+        :return: функции, которые обновляют статистику и вызывают исходные функции.
+        """
+
+        if on_current is None and on_neighbor is None:
+            return self.on_current, self.on_neighbor
+
+        def on_current_with_stats(x: int, y: int) -> None:
+            self.on_current(x, y)
+            if on_current:
+                on_current(x, y)
+
+        def on_neighbor_with_stats(x: int, y: int) -> None:
+            self.on_neighbor(x, y)
+            if on_neighbor:
+                on_neighbor(x, y)
+
+        return on_current_with_stats, on_neighbor_with_stats
+
+    def write_json(self, file_name: str) -> None:
+        """
+        :param file_name: имя файла, в который нужно сохранить статистику.
+        """
+
+        with open(file_name, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, ensure_ascii=False, indent=2)
+
+    def write_trace(self, file_name: str) -> None:
+        """
+        :param file_name: имя файла, в который нужно сохранить этапы в формате Trace Event.
+        """
+
+        with open(file_name, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": self.to_trace(), "displayTimeUnit": "ms"}, file, ensure_ascii=False)
+
+
+def measure_phase(stats: Optional[SearchStats], name: str) -> ContextManager:
+    """
+    :param stats: объект для статистики поиска или None;
+    :param name: название этапа.
+    :return: контекстный менеджер, который измеряет длительность этапа, если статистика собирается.
+    """
+
+    return nullcontext() if stats is None else stats.phase(name)
@@ -0,0 +1,111 @@
+import math
+from collections import OrderedDict
+from typing import Optional, Tuple
+from PyQt5.QtCore import QRectF, Qt
+from PyQt5.QtGui import QImage, QPainter, QPixmap
+from PyQt5.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem, QWidget
+
+
+class ImageLayer(QGraphicsItem):
+    """
+    Класс для слоя сцены, в котором каждой ячейке лабиринта соответствует один пиксель изображения. Ячейка (x, y)
+    занимает на сцене квадрат со стороной 1 и центром в точке (x, y).
+
+    Изображение рисуется плитками, которые переводятся в QPixmap только тогда, когда становятся видны, и запоминаются.
+    Если ячейка на экране меньше пикселя, используются плитки уменьшенного уровня детализации: на уровне n одна плитка
+    покрывает в 2^n раз больше ячеек по каждой стороне, поэтому при любом масштабе рисуется примерно столько пикселей,
+    сколько их на экране. Масштабирование выполняется без сглаживания.
+    """
+
+    MAX_CACHED_TILES: int = 512
+    TILE_SIZE: int = 256
+
+    def __init__(self, image: QImage) -> None:
+        """
+        :param image: изображение, размеры которого равны размерам лабиринта.
+        """
+
+        super().__init__()
+        self._image: QImage = image
+        self._tiles: "OrderedDict[Tuple[int, int, int], QPixmap]" = OrderedDict()
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+
+    @property
+    def image(self) -> QImage:
+        """
+        :return: изображение слоя. После изменения изображения нужно вызвать update_rows.
+        """
+
+        return self._image
+
+    def _get_tile(self, level: int, tile_x: int, tile_y: int) -> QPixmap:
+        """
+        :param level: уровень детализации;
+        :param tile_x: номер плитки по горизонтали;
+        :param tile_y: номер плитки по вертикали.
+        :return: плитка изображения.
+        """
+
+        key = level, tile_x, tile_y
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self._tiles.move_to_end(key)
+            return tile
+
+        cells = ImageLayer.TILE_SIZE << level
+        x = tile_x * cells
+        y = tile_y * cells
+        width = min(cells, self._image.width() - x)
+        height = min(cells, self._image.height() - y)
+        image = self._image.copy(x, y, width, height)
+        if level:
+            image = image.scaled(max(1, width >> level), max(1, height >> level), Qt.IgnoreAspectRatio,
+                                 Qt.FastTransformation)
+
+        tile = QPixmap.fromImage(image)
+        self._tiles[key] = tile
+        if len(self._tiles) > ImageLayer.MAX_CACHED_TILES:
+            self._tiles.popitem(last=False)
+
+        return tile
+
+    def boundingRect(self) -> QRectF:
+        return QRectF(-0.5, -0.5, self._image.width(), self._image.height())
+
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: Optional[QWidget] = None) -> None:
+        exposed_rect = option.exposedRect.intersected(self.boundingRect())
+        if exposed_rect.isEmpty():
+            return
+
+        # Количество пикселей экрана на одну ячейку определяет уровень детализации
+        scale = max(abs(painter.worldTransform().m11()), abs(painter.worldTransform().m22()))
+        level = max(0, int(math.floor(math.log2(1 / scale)))) if scale > 0 else 0
+        cells = ImageLayer.TILE_SIZE << level
+        first_x = max(0, int((exposed_rect.left() + 0.5) // cells))
+        first_y = max(0, int((exposed_rect.top() + 0.5) // cells))
+        last_x = int((exposed_rect.right() + 0.5) // cells)
+        last_y = int((exposed_rect.bottom() + 0.5) // cells)
+        for tile_y in range(first_y, last_y + 1):
+            for tile_x in range(first_x, last_x + 1):
+                x = tile_x * cells
+                y = tile_y * cells
+                if x >= self._image.width() or y >= self._image.height():
+                    continue
+
+                tile = self._get_tile(level, tile_x, tile_y)
+                width = min(cells, self._image.width() - x)
+                height = min(cells, self._image.height() - y)
+                painter.drawPixmap(QRectF(x - 0.5, y - 0.5, width, height), tile, QRectF(tile.rect()))
+
+    def update_rows(self, first_row: int, last_row: int) -> None:
+        """
+        :param first_row: первая изменившаяся строка изображения;
+        :param last_row: строка, следующая за последней изменившейся.
+        """
+
+        for level, tile_x, tile_y in list(self._tiles):
+            cells = ImageLayer.TILE_SIZE << level
+            if tile_y * cells < last_row and (tile_y + 1) * cells > first_row:
+                del self._tiles[level, tile_x, tile_y]
+
+        self.update(QRectF(-0.5, first_row - 0.5, self._image.width(), last_row - first_row))
@@ -1,74 +1,200 @@
-import os
-from typing import List
+import time
+from typing import List, Optional
 from PyQt5.QtCore import pyqtSlot
-from PyQt5.QtWidgets import QFileDialog, QMainWindow
-from PyQt5.uic import loadUi
+from PyQt5.QtGui import QCloseEvent, QIcon
+from PyQt5.QtWidgets import QFileDialog, QMainWindow, QMessageBox
 from . import utils as ut
 from .astar import AStar
 from .cell import Cell
+from .core import get_solver_names, SearchStats
+from .core.stats import measure_phase
 from .maze import Maze
 from .mazewidget import MazeWidget
+from .ui_mainwindow import Ui_MainWindow
 
 
-class MainWindow(QMainWindow):
+class MainWindow(QMainWindow, Ui_MainWindow):
     """
-    Класс с основным окном приложения.
+    Класс с основным окном приложения. Виджеты окна создаются модулем ui_mainwindow, заранее сгенерированным из
+    resources/mainwindow.ui командой pyuic5, поэтому при запуске файл .ui не разбирается. После изменения
+    resources/mainwindow.ui модуль нужно сгенерировать заново.
     """
 
+    FILE_FILTER: str = "Файлы лабиринтов (*.txt *.dat *.maze);;Текстовые файлы (*.txt *.dat);;Двоичные файлы (*.maze)"
+
     def __init__(self) -> None:
         super().__init__()
+        # Объект поиска создается при первом поиске, чтобы не тратить на него время при запуске
+        self._astar: Optional[AStar] = None
         self._maze: Maze = Maze()
+        self._parse_time: Optional[float] = None
+        self._stats: Optional[SearchStats] = None
         self._init_ui()
-        self._create_astar()
 
     def _connect_buttons(self) -> None:
         self.button_find_way_out_of_maze.clicked.connect(self.find_way_out_of_maze)
         self.button_open_file.clicked.connect(self.open_file)
         self.button_save_to_file.clicked.connect(self.save_to_file)
+        self.combo_box_algorithm.currentTextChanged.connect(self.set_algorithm)
+        self.combo_box_animation_speed.currentTextChanged.connect(self.set_animation_speed)
 
     def _create_astar(self) -> None:
-        self._astar: AStar = AStar(self._maze)
-        self._astar.current_cell_signal.connect(self._maze_widget.set_current_cell)
+        self._astar = AStar(self._maze)
+        self._astar.set_algorithm(self.combo_box_algorithm.currentText())
+        self._astar.set_animation_speed(self.combo_box_animation_speed.currentText())
+        self._astar.error_signal.connect(self._show_error)
         self._astar.final_path_signal.connect(self._show_path)
-        self._astar.neighbor_cell_signal.connect(self._maze_widget.set_neighbor_cell)
-        self._astar.start()
+        self._astar.stats_signal.connect(self._set_stats)
 
     def _create_maze_widget(self) -> None:
         self._maze_widget: MazeWidget = MazeWidget(self._maze)
+        self._maze_widget.cell_clicked_signal.connect(self._toggle_wall)
         self.layout_maze.addWidget(self._maze_widget)
 
+    def _fill_algorithms(self) -> None:
+        self.combo_box_algorithm.addItems(get_solver_names())
+        self.combo_box_algorithm.setCurrentText(AStar.DEFAULT_ALGORITHM)
+
+    def _fill_animation_speeds(self) -> None:
+        self.combo_box_animation_speed.addItems(AStar.ANIMATION_SPEEDS)
+        self.combo_box_animation_speed.setCurrentText(AStar.DEFAULT_ANIMATION_SPEED)
+
+    def _get_astar(self) -> AStar:
+        """
+        :return: объект, через который запускается поиск. Создается при первом обращении с алгоритмом и скоростью
+        анимации, выбранными в окне.
+        """
+
+        if self._astar is None:
+            self._create_astar()
+
+        return self._astar
+
     def _init_ui(self) -> None:
-        loadUi(os.path.join("resources", "mainwindow.ui"), self)
+        self.setupUi(self)
+        self.setWindowIcon(QIcon(ut.get_resource_path("icon.jpg")))
+        self._fill_algorithms()
+        self._fill_animation_speeds()
         self._connect_buttons()
         self._create_maze_widget()
 
+    @pyqtSlot(SearchStats)
+    def _set_stats(self, stats: SearchStats) -> None:
+        """
+        :param stats: статистика поиска, который сейчас завершился.
+        """
+
+        self._stats = stats
+
+    @pyqtSlot(str)
+    def _show_error(self, message: str) -> None:
+        """
+        :param message: описание ошибки, из-за которой поиск не завершился.
+        """
+
+        self._maze_widget.stop_progress()
+        self._stats = None
+        ut.show_message("Ошибка", "Не удалось найти выход из лабиринта.", QMessageBox.Critical, message)
+
     @pyqtSlot(list)
     def _show_path(self, path: List[Cell]) -> None:
         """
         :param path: список ячеек, образующих выход из лабиринта.
         """
 
+        self._maze_widget.stop_progress()
+        stats, self._stats = self._stats, None
         if path:
             self._maze.set_path(path)
-            self._maze_widget.show_path()
+            with measure_phase(stats, "render"):
+                self._maze_widget.show_path()
+
+        if stats is not None:
+            self._show_stats(stats)
+
+        if path:
             ut.show_message("Информация", "Выход из лабиринта найден.")
         else:
             ut.show_message("Информация", "Не удалось найти выход из лабиринта.")
 
+    def _show_stats(self, stats: SearchStats) -> None:
+        """
+        :param stats: статистика поиска, которую нужно показать в строке состояния.
+        """
+
+        parts = [f"Раскрыто ячеек: {stats.expanded}"]
+        if stats.expansion_ratio is not None:
+            parts.append(f"на ячейку пути: {stats.expansion_ratio:.2f}")
+
+        parts.append(f"наибольшая очередь: {stats.peak_open}")
+        if self._parse_time is not None:
+            parts.append(f"чтение карты: {self._parse_time * 1000:.1f} мс")
+
+        parts.append(f"поиск: {stats.get_phase_time('solve') * 1000:.1f} мс")
+        cache = self._get_astar().cache
+        parts.append(f"кэш путей: {cache.hits} попаданий, {cache.misses} промахов")
+        parts.append(f"отрисовка: {stats.get_phase_time('render') * 1000:.1f} мс")
+        self.statusBar().showMessage(", ".join(parts))
+
+    @pyqtSlot(Cell)
+    def _toggle_wall(self, cell: Cell) -> None:
+        """
+        :param cell: ячейка, в которой нужно поставить или убрать препятствие. После изменения путь ищется заново;
+        алгоритм dstar-lite при этом исправляет только затронутую часть пути.
+        """
+
+        if (self._astar is None or not self._astar.is_running) and self._maze.toggle_wall(cell.x, cell.y):
+            self.find_way_out_of_maze()
+
+    def closeEvent(self, event: QCloseEvent) -> None:
+        self._maze_widget.stop_progress()
+        if self._astar is not None:
+            self._astar.stop()
+
+        super().closeEvent(event)
+
     @pyqtSlot()
     def find_way_out_of_maze(self) -> None:
         self._maze_widget.update_maze()
-        self._astar.find_path()
+        self._maze_widget.show_progress(self._get_astar().find_path())
 
     @pyqtSlot()
     def open_file(self) -> None:
-        file_name = QFileDialog.getOpenFileName(self, "Открыть файл", ".", "Текстовые файлы (*.txt *.dat)")[0]
+        file_name = QFileDialog.getOpenFileName(self, "Открыть файл", ".", self.FILE_FILTER)[0]
         if file_name:
+            # Путь и ход прежнего поиска не должны попасть на новую карту. Слой хода поиска убирает update_maze
+            if self._astar is not None:
+                self._astar.cancel()
+
+            started_at = time.perf_counter()
             self._maze.read_maze_from_file(file_name)
+            self._parse_time = time.perf_counter() - started_at
+            self.statusBar().showMessage(f"Карта прочитана за {self._parse_time * 1000:.1f} мс")
             self._maze_widget.update_maze()
+            # Путь может быть сохранен вместе с картой в двоичном формате
+            self._maze_widget.show_path()
 
     @pyqtSlot()
     def save_to_file(self) -> None:
-        file_name = QFileDialog.getSaveFileName(self, "Сохранить в файл", ".", "Текстовые файлы (*.txt *.dat)")[0]
+        file_name = QFileDialog.getSaveFileName(self, "Сохранить в файл", ".", self.FILE_FILTER)[0]
         if file_name:
             self._maze.save_maze_to_file(file_name)
+
+    @pyqtSlot(str)
+    def set_algorithm(self, name: str) -> None:
+        """
+        :param name: название алгоритма поиска, выбранного пользователем.
+        """
+
+        # Если поиска еще не было, объект поиска возьмет выбранный алгоритм из окна при создании
+        if self._astar is not None:
+            self._astar.set_algorithm(name)
+
+    @pyqtSlot(str)
+    def set_animation_speed(self, name: str) -> None:
+        """
+        :param name: название скорости анимации хода поиска, выбранной пользователем.
+        """
+
+        if self._astar is not None:
+            self._astar.set_animation_speed(name)
@@ -1,7 +1,10 @@
 from typing import Generator, List, Optional
 from PyQt5.QtCore import QLineF, QPointF, QRectF, QSizeF
+from PyQt5.QtGui import QColor, QImage
 from . import utils as ut
 from .cell import Cell
+from .core import (BINARY_EXTENSION, DistanceField, get_distance_field, Grid, is_binary_map, Position,
+                   read_binary_map, read_grid, write_binary_map, write_grid)
 
 
 class Maze:
@@ -9,23 +12,28 @@ class Maze:
     Класс для лабиринта.
     """
 
+    MAX_COST_ALPHA: int = 160
     POINT_SIZE: float = 0.3
 
     def __init__(self) -> None:
-        self._finish_cell: Optional[Cell] = None
-        self._obstacles: List[QPointF] = []
+        self._grid: Optional[Grid] = None
         self._path: List[Cell] = []
-        self._start_cell: Optional[Cell] = None
-        self._x_size: Optional[int] = None
-        self._y_size: Optional[int] = None
 
     @property
-    def finish_cell(self) -> Optional[Cell]:
+    def finish_cells(self) -> List[Cell]:
         """
-        :return: выход из лабиринта.
+        :return: выходы из лабиринта.
         """
 
-        return self._finish_cell
+        return [Cell(*position) for position in self._grid.finishes] if self._grid is not None else []
+
+    @property
+    def grid(self) -> Optional[Grid]:
+        """
+        :return: сетка лабиринта, с которой работают алгоритмы поиска пути.
+        """
+
+        return self._grid
 
     @property
     def maze_boundaries(self) -> Optional[QRectF]:
@@ -33,18 +41,18 @@ class Maze:
         :return: границы лабиринта.
         """
 
-        if self._x_size is not None and self._y_size is not None:
-            return QRectF(QPointF(-0.5, -0.5), QSizeF(self._x_size, self._y_size))
+        if self._grid is not None:
+            return QRectF(QPointF(-0.5, -0.5), QSizeF(self._grid.width, self._grid.height))
 
         return None
 
     @property
-    def start_cell(self) -> Optional[Cell]:
+    def start_cells(self) -> List[Cell]:
         """
-        :return: вход в лабиринт.
+        :return: входы в лабиринт.
         """
 
-        return self._start_cell
+        return [Cell(*position) for position in self._grid.starts] if self._grid is not None else []
 
     @property
     def x_size(self) -> Optional[int]:
@@ -52,7 +60,7 @@ class Maze:
         :return: ширина лабиринта.
         """
 
-        return self._x_size
+        return self._grid.width if self._grid is not None else None
 
     @property
     def y_size(self) -> Optional[int]:
@@ -60,77 +68,64 @@ class Maze:
         :return: высота лабиринта.
         """
 
-        return self._y_size
+        return self._grid.height if self._grid is not None else None
 
-    def _create_empty_cells(self) -> List[List[str]]:
+    def check_valid_position(self, x: int, y: int) -> bool:
         """
-        :return: список с пробелами, которые представляют пустые ячейки.
+        :param x: горизонтальная координата точки;
+        :param y: вертикальная координата точки.
+        :return: Истина, если ячейка с указанной координатой находится внутри лабиринта и не внутри препятствия.
         """
 
-        if self._x_size and self._y_size:
-            return [[" "] * self._x_size for _ in range(self._y_size)]
+        return self._grid is not None and self._grid.is_free(x, y)
 
-        return []
+    def clear(self) -> None:
+        self._grid = None
+        self._path = []
 
-    def _print_obstacles(self, cells: List[List[str]]) -> None:
+    def get_distance_field(self, source: Optional[Position] = None) -> Optional[DistanceField]:
         """
-        :param cells: список с ячейками.
+        :param source: ячейка-источник, по умолчанию выход из лабиринта.
+        :return: поле расстояний от источника до всех ячеек лабиринта. Поля запоминаются, поэтому путь до того же
+        источника из любой ячейки затем восстанавливается за время, пропорциональное длине пути.
         """
 
-        for obstacle in self._obstacles:
-            cells[int(obstacle.y())][int(obstacle.x())] = "*"
+        source = source or (self._grid.finish if self._grid is not None else None)
+        if source is None:
+            return None
 
-    def _print_path(self, cells: List[List[str]]) -> None:
-        """
-        :param cells: список с ячейками.
-        """
-
-        for cell in self._path:
-            if cells[cell.y][cell.x] not in ("A", "B"):
-                cells[cell.y][cell.x] = "0"
+        return get_distance_field(self._grid, source)
 
-    def _print_start_and_finish_cells(self, cells: List[List[str]]) -> None:
+    def get_image_for_costs(self, color: QColor) -> Optional[QImage]:
         """
-        :param cells: список с ячейками.
+        :param color: цвет самых дорогих ячеек.
+        :return: изображение, в котором каждой ячейке лабиринта соответствует один пиксель: чем дороже проход через
+        ячейку, тем плотнее она закрашена заданным цветом, ячейки со стоимостью 1 прозрачны. None, если стоимости ячеек
+        не заданы.
         """
 
-        if self._start_cell:
-            cells[self._start_cell.y][self._start_cell.x] = "A"
-
-        if self._finish_cell:
-            cells[self._finish_cell.y][self._finish_cell.x] = "B"
-
-    @staticmethod
-    def _transform_to_text(cells: List[List[str]]) -> str:
-        """
-        :param cells: список с ячейками.
-        :return: текст, в котором объединены все ячейки.
-        """
+        if self._grid is None or self._grid.costs is None:
+            return None
 
-        return "\n".join(["".join(row) for row in cells])
+        max_cost = max(self._grid.costs)
+        colors = [QColor(color.red(), color.green(), color.blue(),
+                         Maze.MAX_COST_ALPHA * max(cost - 1, 0) // max(max_cost - 1, 1)).rgba()
+                  for cost in range(max_cost + 1)]
+        return ut.create_indexed_image(self._grid.costs, self._grid.width, self._grid.height, colors)
 
-    def check_valid_position(self, x: int, y: int) -> bool:
+    def get_image_for_obstacles(self, color: QColor) -> Optional[QImage]:
         """
-        :param x: горизонтальная координата точки;
-        :param y: вертикальная координата точки.
-        :return: Истина, если ячейка с указанной координатой находится внутри лабиринта и не внутри препятствия.
+        :param color: цвет препятствий.
+        :return: изображение, в котором каждой ячейке лабиринта соответствует один пиксель: препятствия закрашены
+        заданным цветом, свободные ячейки прозрачны. Изображение строится прямо из сетки препятствий.
         """
 
-        if -1 < x < self._x_size and -1 < y < self._y_size:
-            for obstacle in self._obstacles:
-                if QPointF(x, y) == obstacle:
-                    return False
-
-            return True
+        if self._grid is None:
+            return None
 
-        return False
-
-    def clear(self) -> None:
-        self._finish_cell = None
-        self._obstacles.clear()
-        self._start_cell = None
-        self._x_size = None
-        self._y_size = None
+        colors = {Grid.FREE: QColor(0, 0, 0, 0).rgba(), Grid.WALL: color.rgba()}
+        return ut.create_indexed_image(self._grid.walls, self._grid.width, self._grid.height,
+                                       [colors[value] for value in sorted(colors)])
 
     def get_lines_for_path(self) -> Generator[QLineF, None, None]:
         """
@@ -140,63 +135,45 @@ class Maze:
         for i in range(len(self._path) - 1):
             yield QLineF(self._path[i].point, self._path[i + 1].point)
 
-    def get_rect_for_finish_cell(self) -> Optional[QRectF]:
-        """
-        :return: прямоугольник для рисования выхода из лабиринта.
-        """
-
-        return ut.get_rect_for_cell(self._finish_cell, Maze.POINT_SIZE)
-
-    def get_rect_for_start_cell(self) -> Optional[QRectF]:
+    def get_rects_for_finish_cells(self) -> List[QRectF]:
         """
-        :return: прямоугольник для рисования входа в лабиринт.
+        :return: прямоугольники для рисования выходов из лабиринта.
         """
 
-        return ut.get_rect_for_cell(self._start_cell, Maze.POINT_SIZE)
+        return [ut.get_rect_for_cell(cell, Maze.POINT_SIZE) for cell in self.finish_cells]
 
-    def get_rects_for_obstacles(self) -> Generator[Optional[QRectF], None, None]:
+    def get_rects_for_start_cells(self) -> List[QRectF]:
         """
-        :yield: прямоугольники для рисования препятствий.
+        :return: прямоугольники для рисования входов в лабиринт.
         """
 
-        for obstacle in self._obstacles:
-            yield ut.get_rect_for_cell(Cell(obstacle.x(), obstacle.y()), 1)
+        return [ut.get_rect_for_cell(cell, Maze.POINT_SIZE) for cell in self.start_cells]
 
     def read_maze_from_file(self, file_name: str) -> None:
         """
-        :param file_name: имя файла, в котором содержится карта лабиринта.
+        :param file_name: имя файла, в котором содержится карта лабиринта. Формат файла (текстовый или двоичный)
+        определяется по его содержимому.
         """
 
         self.clear()
-
-        data = ut.read_file(file_name)
-        lines = data.split("\n")
-        self._y_size = len(lines)
-        for y, line in enumerate(lines):
-            for x, symbol in enumerate(line):
-                symbol = symbol.lower()
-                if symbol == "a":
-                    self._start_cell = Cell(x, y)
-                elif symbol == "b":
-                    self._finish_cell = Cell(x, y)
-                elif symbol != " ":
-                    self._obstacles.append(QPointF(x, y))
-
-            if self._x_size is None or len(line) > self._x_size:
-                self._x_size = len(line)
+        if is_binary_map(file_name):
+            self._grid, path = read_binary_map(file_name)
+            self._path = [Cell(x, y) for x, y in path]
+        else:
+            self._grid = read_grid(file_name)
 
     def save_maze_to_file(self, file_name: str) -> None:
         """
-        :param file_name: имя файла, в который сохранить лабиринт.
+        :param file_name: имя файла, в который сохранить лабиринт. Файлы с расширением BINARY_EXTENSION сохраняются в
+        двоичном формате, остальные - в текстовом. Сохраняются все входы и выходы.
         """
 
-        cells = self._create_empty_cells()
-        self._print_start_and_finish_cells(cells)
-        self._print_obstacles(cells)
-        self._print_path(cells)
-
-        text = self._transform_to_text(cells)
-        ut.save_to_file(file_name, text)
+        if self._grid is not None:
+            path = [(cell.x, cell.y) for cell in self._path]
+            if file_name.lower().endswith(BINARY_EXTENSION):
+                write_binary_map(file_name, self._grid, path)
+            else:
+                write_grid(file_name, self._grid, path)
 
     def set_path(self, path: List[Cell]) -> None:
         """
@@ -204,3 +181,31 @@ class Maze:
         """
 
         self._path = path
+
+    def set_wall(self, x: int, y: int, wall: bool = True) -> bool:
+        """
+        :param x: горизонтальная координата ячейки;
+        :param y: вертикальная координата ячейки;
+        :param wall: если Истина, в ячейке ставится препятствие, иначе ячейка освобождается.
+        :return: Истина, если ячейка изменилась. Входы и выходы препятствием стать не могут.
+        """
+
+        if self._grid is None or not self._grid.contains(x, y) or (wall and ((x, y) in self._grid.starts or
+                                                                             (x, y) in self._grid.finishes)):
+            return False
+
+        changed = self._grid.set_wall(x, y, wall)
+        if changed:
+            # Найденный путь мог стать недействительным
+            self._path = []
+
+        return changed
+
+    def toggle_wall(self, x: int, y: int) -> bool:
+        """
+        :param x: горизонтальная координата ячейки;
+        :param y: вертикальная координата ячейки.
+        :return: Истина, если ячейка изменилась.
+        """
+
+        return self._grid is not None and self._grid.contains(x, y) and self.set_wall(x, y, self._grid.is_free(x, y))
@@ -1,25 +1,39 @@
+import math
 from typing import Optional
-from PyQt5.QtCore import QLineF, QPointF, QRectF, QSizeF, Qt
-from PyQt5.QtGui import QBrush, QColor, QPen
-from PyQt5.QtWidgets import QFrame, QGraphicsScene, QGraphicsView
+from PyQt5.QtCore import pyqtSignal, pyqtSlot, QLineF, QPointF, QRectF, QSizeF, Qt, QTimer
+from PyQt5.QtGui import QBrush, QColor, QMouseEvent, QPainter, QPen, QWheelEvent
+from PyQt5.QtWidgets import QFrame, QGraphicsEllipseItem, QGraphicsScene, QGraphicsView
 from . import utils as ut
 from .cell import Cell
+from .core import SearchProgress
+from .imagelayer import ImageLayer
 from .maze import Maze
 
 
 class MazeWidget(QGraphicsView):
     """
-    Виджет для отображения лабиринта.
+    Виджет для отображения лабиринта. Щелчок с нажатой клавишей Ctrl сообщает о ячейке, в которой нужно поставить или
+    убрать препятствие.
     """
 
+    MESH_MIN_SCALE: float = 8  # Сетка рисуется, если ячейка на экране не меньше заданного количества пикселей
+    PROGRESS_INTERVAL_MS: int = 16
+    ZOOM_FACTOR: float = 1.25
+    cell_clicked_signal: pyqtSignal = pyqtSignal(Cell)
+
     def __init__(self, maze: Maze) -> None:
         """
         :param maze: объект, в котором хранятся основные данные лабиринта.
         """
 
         super().__init__()
-        self._current_cell: Optional[QRectF] = None
+        self._current_cell: Optional[QGraphicsEllipseItem] = None
         self._maze: Maze = maze
+        self._progress: Optional[SearchProgress] = None
+        self._progress_layer: Optional[ImageLayer] = None
+        self._progress_timer: QTimer = QTimer(self)
+        self._progress_timer.setInterval(MazeWidget.PROGRESS_INTERVAL_MS)
+        self._progress_timer.timeout.connect(self._update_progress)
         self.setScene(QGraphicsScene())
         self._set_view_parameters()
         self._create_brushes_and_pens()
@@ -28,6 +42,8 @@ class MazeWidget(QGraphicsView):
         self._border_pen: QPen = QPen(QBrush(QColor("black")), 2, Qt.SolidLine)
         self._border_pen.setCosmetic(True)
 
+        self._cost_brush: QBrush = QBrush(QColor("saddlebrown"))
+
         self._current_pen: QPen = QPen(QBrush(QColor("yellow")), 2, Qt.SolidLine)
         self._current_pen.setCosmetic(True)
 
@@ -52,28 +68,61 @@ class MazeWidget(QGraphicsView):
         self._path_pen: QPen = QPen(QBrush(QColor("orange")), 2, Qt.SolidLine)
         self._path_pen.setCosmetic(True)
 
-    def _draw_mesh(self) -> None:
+    def _create_progress_layer(self, progress: SearchProgress) -> None:
+        """
+        :param progress: объект, в который записывается ход поиска.
+        """
+
+        neighbor_color = self._neighbor_pen.color()
+        colors = {SearchProgress.UNVISITED: QColor(0, 0, 0, 0),
+                  SearchProgress.FRONTIER: neighbor_color,
+                  SearchProgress.CLOSED: QColor(neighbor_color.red(), neighbor_color.green(), neighbor_color.blue(),
+                                                80)}
+        image = ut.create_indexed_image(progress.cells, progress.width, progress.height,
+                                        [colors[state].rgba() for state in sorted(colors)])
+        self._progress_layer = ImageLayer(image)
+        self.scene().addItem(self._progress_layer)
+
+    def _draw_border(self) -> None:
         if self._maze.maze_boundaries:
             self.scene().addRect(self._maze.maze_boundaries, self._border_pen)
-            for y in range(self._maze.y_size - 1):
-                self.scene().addLine(QLineF(QPointF(-0.5, y + 0.5), QPointF(self._maze.x_size - 0.5, y + 0.5)),
-                                     self._line_pen)
 
-            for x in range(self._maze.x_size - 1):
-                self.scene().addLine(QLineF(QPointF(x + 0.5, -0.5), QPointF(x + 0.5, self._maze.y_size - 0.5)),
-                                     self._line_pen)
+    def _draw_costs(self) -> None:
+        image = self._maze.get_image_for_costs(self._cost_brush.color())
+        if image is not None:
+            self.scene().addItem(ImageLayer(image))
+
+    def _draw_mesh(self, painter: QPainter, rect: QRectF) -> None:
+        """
+        :param painter: объект для рисования на виджете;
+        :param rect: видимая часть сцены, в которой нужно нарисовать линии сетки.
+        """
+
+        if self._maze.maze_boundaries is None or self.transform().m11() < MazeWidget.MESH_MIN_SCALE:
+            return
+
+        # Линии между ячейками x и x + 1 проходят через x + 0.5, рисуются только видимые линии
+        first_x = max(0, math.floor(rect.left() - 0.5))
+        last_x = min(self._maze.x_size - 1, math.ceil(rect.right() - 0.5))
+        first_y = max(0, math.floor(rect.top() - 0.5))
+        last_y = min(self._maze.y_size - 1, math.ceil(rect.bottom() - 0.5))
+        lines = [QLineF(QPointF(-0.5, y + 0.5), QPointF(self._maze.x_size - 0.5, y + 0.5))
+                 for y in range(first_y, last_y)]
+        lines.extend(QLineF(QPointF(x + 0.5, -0.5), QPointF(x + 0.5, self._maze.y_size - 0.5))
+                     for x in range(first_x, last_x))
+        painter.setPen(self._line_pen)
+        painter.drawLines(lines)
 
     def _draw_obstacles(self) -> None:
-        for obstacle in self._maze.get_rects_for_obstacles():
-            self.scene().addRect(obstacle, self._obstacle_pen, self._obstacle_brush)
+        image = self._maze.get_image_for_obstacles(self._obstacle_brush.color())
+        if image is not None:
+            self.scene().addItem(ImageLayer(image))
 
     def _draw_start_and_finish_cells(self) -> None:
-        finish_cell = self._maze.get_rect_for_finish_cell()
-        if finish_cell:
+        for finish_cell in self._maze.get_rects_for_finish_cells():
             self.scene().addEllipse(finish_cell, self._finish_cell_pen, self._finish_cell_brush)
 
-        start_cell = self._maze.get_rect_for_start_cell()
-        if start_cell:
+        for start_cell in self._maze.get_rects_for_start_cells():
             self.scene().addEllipse(start_cell, self._start_cell_pen, self._start_cell_brush)
 
     def _fit_image(self) -> None:
@@ -89,26 +138,82 @@ class MazeWidget(QGraphicsView):
         self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setDragMode(QGraphicsView.ScrollHandDrag)
+
+    @pyqtSlot()
+    def _update_progress(self) -> None:
+        """
+        Метод переносит в слой хода поиска строки, изменившиеся с прошлого кадра.
+        """
 
-    def set_current_cell(self, cell: Cell) -> None:
-        if self._current_cell:
-            self._current_cell.setPen(self._neighbor_pen)
+        if self._progress is None or self._progress_layer is None:
+            return
 
-        rect = ut.get_rect_for_cell(cell, Maze.POINT_SIZE)
-        self._current_cell = self.scene().addEllipse(rect, self._current_pen)
+        dirty_rows = self._progress.take_dirty_rows()
+        if dirty_rows is not None:
+            ut.copy_rows_to_image(self._progress_layer.image, self._progress.cells, *dirty_rows)
+            self._progress_layer.update_rows(*dirty_rows)
 
-    def set_neighbor_cell(self, cell: Cell) -> None:
-        rect = ut.get_rect_for_cell(cell, Maze.POINT_SIZE)
-        self.scene().addEllipse(rect, self._neighbor_pen)
+        current = self._progress.current
+        if current is not None:
+            rect = ut.get_rect_for_cell(Cell(*current), Maze.POINT_SIZE)
+            if self._current_cell is None:
+                self._current_cell = self.scene().addEllipse(rect, self._current_pen)
+            else:
+                self._current_cell.setRect(rect)
+
+    def drawBackground(self, painter: QPainter, rect: QRectF) -> None:
+        super().drawBackground(painter, rect)
+        self._draw_mesh(painter, rect)
+
+    def mousePressEvent(self, event: QMouseEvent) -> None:
+        if event.button() == Qt.LeftButton and event.modifiers() & Qt.ControlModifier:
+            point = self.mapToScene(event.pos())
+            x, y = round(point.x()), round(point.y())
+            if self._maze.x_size is not None and 0 <= x < self._maze.x_size and 0 <= y < self._maze.y_size:
+                self.cell_clicked_signal.emit(Cell(x, y))
+                return
+
+        super().mousePressEvent(event)
 
     def show_path(self) -> None:
         for line in self._maze.get_lines_for_path():
             self.scene().addLine(line, self._path_pen)
 
+    def show_progress(self, progress: Optional[SearchProgress]) -> None:
+        """
+        :param progress: объект, в который записывается ход поиска, или None, если ход поиска показывать не нужно.
+        """
+
+        self.stop_progress()
+        self._progress = progress
+        if progress is not None:
+            self._create_progress_layer(progress)
+            self._progress_timer.start()
+
+    def stop_progress(self) -> None:
+        """
+        Метод показывает последнюю порцию хода поиска и перестает следить за ним.
+        """
+
+        self._progress_timer.stop()
+        if self._progress is not None:
+            self._update_progress()
+            self._progress.release()
+            self._progress = None
+
     def update_maze(self) -> None:
+        self.stop_progress()
         self.scene().clear()
         self._current_cell = None
-        self._draw_mesh()
+        self._progress_layer = None
+        self._draw_border()
         self._draw_start_and_finish_cells()
+        self._draw_costs()
         self._draw_obstacles()
         self._fit_image()
+
+    def wheelEvent(self, event: QWheelEvent) -> None:
+        if self._maze.maze_boundaries is not None:
+            factor = MazeWidget.ZOOM_FACTOR ** (event.angleDelta().y() / 120)
+            self.scale(factor, factor)
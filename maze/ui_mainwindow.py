@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'resources/mainwindow.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(716, 487)
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.vertica_layout = QtWidgets.QVBoxLayout(self.centralwidget)
+        self.vertica_layout.setContentsMargins(0, 5, 0, 0)
+        self.vertica_layout.setSpacing(5)
+        self.vertica_layout.setObjectName("vertica_layout")
+        self.horizontal_layout = QtWidgets.QHBoxLayout()
+        self.horizontal_layout.setObjectName("horizontal_layout")
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontal_layout.addItem(spacerItem)
+        self.button_open_file = QtWidgets.QPushButton(self.centralwidget)
+        self.button_open_file.setObjectName("button_open_file")
+        self.horizontal_layout.addWidget(self.button_open_file)
+        self.label_algorithm = QtWidgets.QLabel(self.centralwidget)
+        self.label_algorithm.setObjectName("label_algorithm")
+        self.horizontal_layout.addWidget(self.label_algorithm)
+        self.combo_box_algorithm = QtWidgets.QComboBox(self.centralwidget)
+        self.combo_box_algorithm.setObjectName("combo_box_algorithm")
+        self.horizontal_layout.addWidget(self.combo_box_algorithm)
+        self.label_animation_speed = QtWidgets.QLabel(self.centralwidget)
+        self.label_animation_speed.setObjectName("label_animation_speed")
+        self.horizontal_layout.addWidget(self.label_animation_speed)
+        self.combo_box_animation_speed = QtWidgets.QComboBox(self.centralwidget)
+        self.combo_box_animation_speed.setObjectName("combo_box_animation_speed")
+        self.horizontal_layout.addWidget(self.combo_box_animation_speed)
+        self.button_find_way_out_of_maze = QtWidgets.QPushButton(self.centralwidget)
+        self.button_find_way_out_of_maze.setObjectName("button_find_way_out_of_maze")
+        self.horizontal_layout.addWidget(self.button_find_way_out_of_maze)
+        self.button_save_to_file = QtWidgets.QPushButton(self.centralwidget)
+        self.button_save_to_file.setObjectName("button_save_to_file")
+        self.horizontal_layout.addWidget(self.button_save_to_file)
+        spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontal_layout.addItem(spacerItem1)
+        self.vertica_layout.addLayout(self.horizontal_layout)
+        self.widget_maze = QtWidgets.QWidget(self.centralwidget)
+        self.widget_maze.setObjectName("widget_maze")
+        self.layout_maze = QtWidgets.QVBoxLayout(self.widget_maze)
+        self.layout_maze.setContentsMargins(0, 0, 0, 0)
+        self.layout_maze.setSpacing(0)
+        self.layout_maze.setObjectName("layout_maze")
+        self.vertica_layout.addWidget(self.widget_maze)
+        self.vertica_layout.setStretch(1, 1)
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.menubar = QtWidgets.QMenuBar(MainWindow)
+        self.menubar.setGeometry(QtCore.QRect(0, 0, 716, 21))
+        self.menubar.setObjectName("menubar")
+        MainWindow.setMenuBar(self.menubar)
+
+        self.retranslateUi(MainWindow)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "Лабиринт"))
+        self.button_open_file.setText(_translate("MainWindow", "Открыть карту"))
+        self.label_algorithm.setText(_translate("MainWindow", "Алгоритм:"))
+        self.label_animation_speed.setText(_translate("MainWindow", "Анимация:"))
+        self.button_find_way_out_of_maze.setText(_translate("MainWindow", "Найти путь из лабиринта"))
+        self.button_save_to_file.setText(_translate("MainWindow", "Сохранить"))
@@ -1,11 +1,49 @@
 import os
-from typing import Optional
+from typing import List, Optional, Sequence
 from PyQt5.QtCore import QPointF, QRectF, Qt
-from PyQt5.QtGui import QIcon
+from PyQt5.QtGui import QIcon, QImage
 from PyQt5.QtWidgets import QMessageBox
 from .cell import Cell
 
 
+# Ресурсы находятся рядом с пакетом, а не в текущем каталоге, из которого запущено приложение
+RESOURCES_DIR: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources")
+
+
+def copy_rows_to_image(image: QImage, cells: Sequence[int], first_row: int, last_row: int) -> None:
+    """
+    :param image: изображение в формате Indexed8, размеры которого равны размерам лабиринта;
+    :param cells: значения ячеек лабиринта, индекс ячейки равен y * width + x;
+    :param first_row: первая строка, которую нужно скопировать;
+    :param last_row: строка, следующая за последней, которую нужно скопировать.
+    """
+
+    width = image.width()
+    # Строки изображения выровнены по 4 байта, поэтому копировать можно только построчно
+    stride = image.bytesPerLine()
+    bits = image.bits()
+    bits.setsize(image.sizeInBytes())
+    buffer = memoryview(bits)
+    cells = memoryview(cells)
+    for y in range(first_row, last_row):
+        buffer[y * stride:y * stride + width] = cells[y * width:(y + 1) * width]
+
+
+def create_indexed_image(cells: Sequence[int], width: int, height: int, colors: List[int]) -> QImage:
+    """
+    :param cells: значения ячеек лабиринта, индекс ячейки равен y * width + x;
+    :param width: ширина лабиринта;
+    :param height: высота лабиринта;
+    :param colors: цвета для значений ячеек (значение ячейки - индекс в списке).
+    :return: изображение, в котором каждой ячейке соответствует один пиксель.
+    """
+
+    image = QImage(width, height, QImage.Format_Indexed8)
+    image.setColorTable(colors)
+    copy_rows_to_image(image, cells, 0, height)
+    return image
+
+
 def get_rect_for_cell(cell: Optional[Cell], size: float) -> Optional[QRectF]:
     """
     :param cell: ячейка, которую нужно нарисовать;
@@ -21,6 +59,15 @@ def get_rect_for_cell(cell: Optional[Cell], size: float) -> Optional[QRectF]:
     return None
 
 
+def get_resource_path(file_name: str) -> str:
+    """
+    :param file_name: имя файла в каталоге ресурсов.
+    :return: полный путь к файлу ресурсов.
+    """
+
+    return os.path.join(RESOURCES_DIR, file_name)
+
+
 def read_file(file_name: str) -> str:
     """
     :param file_name: имя файла, который нужно прочитать.
@@ -53,7 +100,7 @@ def show_message(title: str, text: str, icon: QMessageBox.Icon = QMessageBox.Inf
 
     message_box = QMessageBox()
     message_box.setWindowTitle(title)
-    message_box.setWindowIcon(QIcon(os.path.join("resources", "icon.jpg")))
+    message_box.setWindowIcon(QIcon(get_resource_path("icon.jpg")))
     message_box.setIcon(icon)
     message_box.setTextFormat(Qt.RichText)
     message_box.setTextInteractionFlags(Qt.TextBrowserInteraction)
@@ -0,0 +1,105 @@
+import copy
+import pytest
+from maze.core import compare_benchmarks, read_benchmark, run_benchmark, write_benchmark
+
+
+@pytest.fixture(scope="module")
+def baseline() -> dict:
+    return run_benchmark(["backtracker", "unreachable"], [(15, 15)], ["astar", "bfs"], seed=1, repeats=1,
+                         solver_options={"connectivity": 4}, measure_memory=False)
+
+
+def _find_record(data: dict, generator: str, algorithm: str) -> dict:
+    """
+    :param data: результаты запуска;
+    :param generator: название генератора;
+    :param algorithm: название алгоритма.
+    :return: результат измерения для заданных генератора и алгоритма.
+    """
+
+    return next(record for record in data["results"]
+                if record["generator"] == generator and record["algorithm"] == algorithm)
+
+
+def test_run_benchmark_records(baseline: dict) -> None:
+    assert len(baseline["results"]) == 4
+    assert _find_record(baseline, "backtracker", "astar")["found"]
+    assert not _find_record(baseline, "unreachable", "bfs")["found"]
+    assert "peak_memory" not in baseline["results"][0]
+
+
+def test_run_benchmark_records_unsupported_options() -> None:
+    data = run_benchmark(["backtracker"], [(9, 9)], ["bfs"], repeats=1, solver_options={"connectivity": 8},
+                         measure_memory=False)
+
+    assert "error" in data["results"][0]
+
+
+def test_run_benchmark_requires_repeats() -> None:
+    with pytest.raises(ValueError):
+        run_benchmark(["backtracker"], [(9, 9)], repeats=0)
+
+
+def test_same_results_have_no_regressions(baseline: dict) -> None:
+    assert compare_benchmarks(baseline, baseline) == []
+
+
+@pytest.mark.parametrize("metric, change", [("expanded", lambda value: value * 2),
+                                            ("search_time", lambda value: value + 1),
+                                            ("length", lambda value: value + 1),
+                                            ("found", lambda value: not value)])
+def test_regressions_are_flagged(baseline: dict, metric: str, change) -> None:
+    current = copy.deepcopy(baseline)
+    record = _find_record(current, "backtracker", "astar")
+    record[metric] = change(record[metric])
+
+    regressions = compare_benchmarks(baseline, current)
+
+    assert [(regression["metric"], regression["current"]) for regression in regressions] == [(metric, record[metric])]
+    assert regressions[0]["key"] == ("backtracker", 15, 15, 1, "astar")
+
+
+def test_small_changes_are_not_regressions(baseline: dict) -> None:
+    old = copy.deepcopy(baseline)
+    _find_record(old, "backtracker", "astar")["search_time"] = 0.0001
+    current = copy.deepcopy(baseline)
+    record = _find_record(current, "backtracker", "astar")
+    record["expanded"] = int(record["expanded"] * 1.1)
+    # Разница меньше миллисекунды считается шумом, даже если время выросло больше допустимого
+    record["search_time"] = 0.0005
+
+    assert compare_benchmarks(old, current, threshold=0.2) == []
+
+
+def test_missing_baseline_entries_are_skipped(baseline: dict) -> None:
+    old = copy.deepcopy(baseline)
+    old["results"] = [record for record in old["results"] if record["algorithm"] != "bfs"]
+    current = copy.deepcopy(baseline)
+    _find_record(current, "backtracker", "bfs")["expanded"] *= 10
+
+    assert compare_benchmarks(old, current) == []
+
+
+def test_error_records_are_skipped(baseline: dict) -> None:
+    current = copy.deepcopy(baseline)
+    record = _find_record(current, "backtracker", "astar")
+    record.clear()
+    record.update({"generator": "backtracker", "width": 15, "height": 15, "seed": 1, "algorithm": "astar",
+                   "error": "ошибка"})
+
+    assert compare_benchmarks(baseline, current) == []
+
+
+def test_write_and_read_benchmark(tmp_path, baseline: dict) -> None:
+    file_name = str(tmp_path / "benchmark.json")
+    write_benchmark(file_name, baseline)
+
+    assert read_benchmark(file_name) == baseline
+
+
+def test_read_benchmark_rejects_other_versions(tmp_path) -> None:
+    file_name = tmp_path / "benchmark.json"
+    file_name.write_text('{"version": 0, "results": []}')
+
+    with pytest.raises(ValueError):
+        read_benchmark(str(file_name))
@@ -0,0 +1,115 @@
+import json
+import pytest
+from maze.cli import main
+from maze.core import read_grid
+
+
+MAP = ("A  *\n"
+       "** *\n"
+       "   B")
+UNREACHABLE_MAP = ("A * \n"
+                   "  *B")
+COSTS_MAP = ("A 9\n"
+             "  B")
+
+
+@pytest.fixture
+def map_file(tmp_path) -> str:
+    file_name = tmp_path / "map.txt"
+    file_name.write_text(MAP)
+    return str(file_name)
+
+
+def _write(tmp_path, name: str, text: str) -> str:
+    """
+    :param tmp_path: временный каталог теста;
+    :param name: имя файла;
+    :param text: содержимое файла.
+    :return: полное имя созданного файла.
+    """
+
+    file_name = tmp_path / name
+    file_name.write_text(text)
+    return str(file_name)
+
+
+def test_solve_found(map_file: str, capsys) -> None:
+    assert main(["solve", map_file]) == 0
+    assert "длина: 5" in capsys.readouterr().out
+
+
+def test_solve_not_found(tmp_path, capsys) -> None:
+    assert main(["solve", _write(tmp_path, "map.txt", UNREACHABLE_MAP)]) == 1
+    assert "не найден" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("arguments", [["--connectivity", "8", "-a", "bfs"],
+                                       ["--connectivity", "8", "--heuristic", "manhattan"],
+                                       ["--weight", "0.5"]])
+def test_solve_rejects_invalid_options(map_file: str, arguments: list, capsys) -> None:
+    assert main(["solve", map_file, *arguments]) == 2
+    assert capsys.readouterr().err.startswith("ошибка:")
+
+
+def test_solve_rejects_costs_for_unweighted_solver(tmp_path, capsys) -> None:
+    assert main(["solve", _write(tmp_path, "map.txt", COSTS_MAP), "-a", "bfs"]) == 2
+    assert "ошибка:" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("command", ["solve", "compare", "components"])
+def test_missing_map(tmp_path, command: str, capsys) -> None:
+    assert main([command, str(tmp_path / "missing.txt")]) == 2
+    assert capsys.readouterr().err.startswith("ошибка:")
+
+
+def test_malformed_binary_map(tmp_path, capsys) -> None:
+    assert main(["solve", _write(tmp_path, "map.maze", "MAZE")]) == 2
+    assert capsys.readouterr().err.startswith("ошибка:")
+
+
+def test_compare(map_file: str, capsys) -> None:
+    assert main(["compare", map_file]) == 0
+    assert "ошибка" not in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("text, code", [(MAP, 0), (UNREACHABLE_MAP, 1)])
+def test_components(tmp_path, text: str, code: int) -> None:
+    assert main(["components", _write(tmp_path, "map.txt", text)]) == code
+
+
+def test_generate_and_convert(tmp_path) -> None:
+    text_file = str(tmp_path / "map.txt")
+    binary_file = str(tmp_path / "map.maze")
+    assert main(["generate", "backtracker", "21x11", text_file, "--seed", "1"]) == 0
+    assert main(["convert", text_file, binary_file]) == 0
+    assert bytes(read_grid(binary_file).walls) == bytes(read_grid(text_file).walls)
+    assert main(["solve", binary_file]) == 0
+
+
+def test_convert_missing_source(tmp_path) -> None:
+    assert main(["convert", str(tmp_path / "missing.txt"), str(tmp_path / "map.maze")]) == 2
+
+
+def test_batch_reports_bad_maps_and_continues(tmp_path, map_file: str, capsys) -> None:
+    missing = str(tmp_path / "missing.txt")
+    assert main(["batch", missing, map_file, "--workers", "0"]) == 0
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+    assert [record["map"] for record in records] == [missing, map_file]
+    assert "error" in records[0]
+    assert records[1]["found"]
+
+
+def test_batch_rejects_bad_queries(tmp_path, map_file: str, capsys) -> None:
+    queries = _write(tmp_path, "queries.jsonl", '{"start": [0, 0]}\n')
+
+    assert main(["batch", map_file, "--queries", queries, "--workers", "0"]) == 2
+    assert capsys.readouterr().err.startswith("ошибка:")
+
+
+@pytest.mark.parametrize("command", [["benchmark", "--repeats", "0"], ["solve", "map.txt", "--connectivity", "6"]])
+def test_invalid_arguments(command: list) -> None:
+    with pytest.raises(SystemExit) as info:
+        main(command)
+
+    assert info.value.code == 2
@@ -0,0 +1,56 @@
+import pytest
+from maze.core import create_solver, generate_maze, get_components, get_generator_names
+
+
+SIZES = [(1, 1), (2, 7), (15, 9), (40, 31)]
+
+
+@pytest.mark.parametrize("name", get_generator_names())
+def test_same_seed_gives_same_grid(name: str) -> None:
+    first = generate_maze(name, 31, 21, 42)
+    second = generate_maze(name, 31, 21, 42)
+
+    assert bytes(first.walls) == bytes(second.walls)
+    assert (first.start, first.finish) == (second.start, second.finish)
+
+
+@pytest.mark.parametrize("name", ["backtracker", "prim", "random", "rooms"])
+def test_different_seeds_give_different_grids(name: str) -> None:
+    assert bytes(generate_maze(name, 31, 21, 1).walls) != bytes(generate_maze(name, 31, 21, 2).walls)
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("name", ["backtracker", "prim", "rooms"])
+def test_generated_maze_is_solvable(name: str, size: tuple) -> None:
+    grid = generate_maze(name, *size, 3)
+
+    assert (grid.width, grid.height) == size
+    assert grid.is_free(*grid.start)
+    assert grid.is_free(*grid.finish)
+    assert create_solver("bfs").solve(grid).found
+
+
+@pytest.mark.parametrize("name", ["backtracker", "prim"])
+def test_perfect_maze_is_connected(name: str) -> None:
+    # В идеальном лабиринте все свободные ячейки образуют одну связную область
+    assert get_components(generate_maze(name, 41, 25, 5)).count == 1
+
+
+def test_random_density() -> None:
+    assert not any(generate_maze("random", 20, 20, 1, density=0).walls)
+    assert sum(generate_maze("random", 20, 20, 1, density=1).walls) == 20 * 20 - 2
+
+    with pytest.raises(ValueError):
+        generate_maze("random", 20, 20, 1, density=1.5)
+
+
+def test_unreachable_has_no_path() -> None:
+    grid = generate_maze("unreachable", 10, 10)
+
+    assert not create_solver("astar").solve(grid).found
+
+
+@pytest.mark.parametrize("name, size", [("backtracker", (0, 5)), ("unreachable", (2, 10)), ("unknown", (5, 5))])
+def test_invalid_arguments_are_rejected(name: str, size: tuple) -> None:
+    with pytest.raises(ValueError):
+        generate_maze(name, *size)
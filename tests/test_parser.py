@@ -0,0 +1,113 @@
+import pytest
+from maze.core import (format_grid, generate_maze, Grid, is_binary_map, parse_binary, parse_bytes, parse_text,
+                       read_binary_map, read_grid, write_binary_map, write_grid)
+
+
+TEXT = ("A  *\n"
+        " 2 * 9\n"
+        "*\n"
+        "  B ")
+
+
+def _assert_same_grid(grid: Grid, expected: Grid) -> None:
+    """
+    :param grid: сетка, которую нужно проверить;
+    :param expected: сетка, с которой она должна совпадать.
+    """
+
+    assert (grid.width, grid.height) == (expected.width, expected.height)
+    assert bytes(grid.walls) == bytes(expected.walls)
+    assert grid.starts == expected.starts
+    assert grid.finishes == expected.finishes
+    assert (bytes(grid.costs) if grid.costs is not None else None) == \
+        (bytes(expected.costs) if expected.costs is not None else None)
+
+
+def test_parse_text_reads_ragged_rows_and_costs() -> None:
+    grid = parse_text(TEXT)
+
+    assert (grid.width, grid.height) == (6, 4)
+    assert grid.start == (0, 0)
+    assert grid.finish == (2, 3)
+    assert not grid.is_free(3, 0)
+    assert not grid.is_free(0, 2)
+    # Короткие строки дополняются свободными ячейками
+    assert grid.is_free(5, 0)
+    assert grid.is_free(5, 2)
+    assert grid.costs[grid.index(1, 1)] == 2
+    assert grid.costs[grid.index(5, 1)] == 9
+    assert grid.costs[grid.index(0, 0)] == 1
+
+
+def test_parse_text_without_costs() -> None:
+    assert parse_text("A *\n  B").costs is None
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_parse_bytes_matches_parse_text(newline: str) -> None:
+    _assert_same_grid(parse_bytes(TEXT.replace("\n", newline).encode("utf-8")), parse_text(TEXT))
+
+
+def test_parse_bytes_reads_non_ascii_symbols_as_walls() -> None:
+    grid = parse_bytes("A█ \n  B".encode("utf-8"))
+
+    assert grid.width == 3
+    assert not grid.is_free(1, 0)
+    assert grid.is_free(2, 0)
+
+
+def test_text_round_trip(tmp_path) -> None:
+    grid = parse_text(TEXT)
+    file_name = str(tmp_path / "map.txt")
+    write_grid(file_name, grid)
+
+    _assert_same_grid(read_grid(file_name), grid)
+    _assert_same_grid(parse_text(format_grid(grid)), grid)
+
+
+def test_format_grid_draws_path() -> None:
+    grid = parse_text("A  \n  B")
+
+    assert format_grid(grid, [(0, 0), (1, 0), (1, 1), (2, 1)]) == "A0 \n 0B"
+
+
+@pytest.mark.parametrize("text", [TEXT, "A B", "A\nB\nB\n A", ""])
+def test_binary_round_trip(tmp_path, text: str) -> None:
+    grid = parse_text(text)
+    path = [(0, 0), (1, 0)] if grid.width > 1 else []
+    file_name = str(tmp_path / "map.maze")
+    write_binary_map(file_name, grid, path)
+
+    assert is_binary_map(file_name)
+    binary_grid, binary_path = read_binary_map(file_name)
+    _assert_same_grid(binary_grid, grid)
+    assert binary_path == path
+    # read_grid распознает двоичный формат по сигнатуре
+    _assert_same_grid(read_grid(file_name), grid)
+
+
+def test_binary_round_trip_of_generated_maze(tmp_path) -> None:
+    grid = generate_maze("backtracker", 33, 17, 5)
+    file_name = str(tmp_path / "map.maze")
+    write_binary_map(file_name, grid)
+
+    _assert_same_grid(read_binary_map(file_name)[0], grid)
+
+
+def test_truncated_binary_map_is_rejected(tmp_path) -> None:
+    file_name = tmp_path / "map.maze"
+    write_binary_map(str(file_name), generate_maze("prim", 15, 15, 1))
+    data = file_name.read_bytes()
+
+    with pytest.raises(ValueError):
+        parse_binary(data[:len(data) - 1])
+
+    with pytest.raises(ValueError):
+        parse_binary(data[:4])
+
+
+def test_text_format_rejects_large_costs(tmp_path) -> None:
+    grid = Grid(2, 1, costs=bytearray([1, 12]))
+
+    with pytest.raises(ValueError):
+        write_grid(str(tmp_path / "map.txt"), grid)
@@ -0,0 +1,134 @@
+import math
+import pytest
+from maze.core import create_solver, generate_maze, get_solver_names, Grid, parse_text, SearchResult
+
+
+# Карты записаны в текстовом формате: A - вход, B - выход, * - стена, цифры - стоимости прохода через ячейки
+MAPS = {"corridor": ("A*   \n"
+                     " * * \n"
+                     " * * \n"
+                     "   *B"),
+        "costs": ("A 9  \n"
+                  " 9*9 \n"
+                  " 9 9 \n"
+                  "  *9B"),
+        "diagonal": ("A    *\n"
+                     " *** *\n"
+                     " *B* *\n"
+                     " * * *\n"
+                     "      "),
+        "open": ("A     \n"
+                 "      \n"
+                 "      \n"
+                 "     B"),
+        "unreachable": ("A * \n"
+                        "  * \n"
+                        "***B")}
+
+
+def _check_path(grid: Grid, path: list, connectivity: int) -> None:
+    """
+    :param grid: сетка лабиринта;
+    :param path: путь, который нужно проверить: от входа до выхода через свободные соседние ячейки;
+    :param connectivity: количество соседей ячейки.
+    """
+
+    assert path[0] == grid.start
+    assert path[-1] == grid.finish
+    for (x, y), (next_x, next_y) in zip(path, path[1:]):
+        assert grid.is_free(next_x, next_y)
+        assert max(abs(next_x - x), abs(next_y - y)) == 1
+        if connectivity == 4:
+            assert abs(next_x - x) + abs(next_y - y) == 1
+
+
+def _get_grids() -> list:
+    grids = [pytest.param(parse_text(text), id=name) for name, text in MAPS.items()]
+    for generator in ("backtracker", "random", "rooms"):
+        grids.append(pytest.param(generate_maze(generator, 21, 15, 7), id=f"{generator}-21x15"))
+
+    return grids
+
+
+def _solve(name: str, grid: Grid, connectivity: int) -> SearchResult:
+    """
+    :param name: название алгоритма;
+    :param grid: сетка лабиринта;
+    :param connectivity: количество соседей ячейки.
+    :return: результат поиска. Если алгоритм не поддерживает параметры или карту, тест пропускается.
+    """
+
+    try:
+        solver = create_solver(name, connectivity=connectivity)
+        solver.check_grid(grid)
+    except ValueError as exc:
+        pytest.skip(str(exc))
+
+    return solver.solve(grid, grid.start, grid.finish)
+
+
+@pytest.mark.parametrize("grid", _get_grids())
+@pytest.mark.parametrize("connectivity", [4, 8])
+@pytest.mark.parametrize("name", get_solver_names())
+def test_solver_agrees_with_dijkstra(name: str, connectivity: int, grid: Grid) -> None:
+    expected = create_solver("dijkstra", connectivity=connectivity).solve(grid)
+    result = _solve(name, grid, connectivity)
+
+    assert result.found == expected.found
+    if not expected.found:
+        assert result.path == []
+        return
+
+    _check_path(grid, result.path, connectivity)
+    if create_solver(name, connectivity=connectivity).optimal:
+        assert result.cost == pytest.approx(expected.cost)
+    else:
+        assert result.cost >= expected.cost - 1e-9
+
+
+@pytest.mark.parametrize("connectivity, cost", [(4, 8), (8, 2 + 3 * math.sqrt(2))])
+def test_dijkstra_finds_shortest_path(connectivity: int, cost: float) -> None:
+    result = create_solver("dijkstra", connectivity=connectivity).solve(parse_text(MAPS["open"]))
+
+    assert result.cost == pytest.approx(cost)
+
+
+def test_manhattan_is_rejected_with_diagonal_moves() -> None:
+    with pytest.raises(ValueError):
+        create_solver("astar", connectivity=8, heuristic="manhattan")
+
+
+@pytest.mark.parametrize("weight, optimal", [(1, True), (1.5, False)])
+def test_weighted_heuristic_is_not_optimal(weight: float, optimal: bool) -> None:
+    assert create_solver("astar", weight=weight).optimal == optimal
+    assert create_solver("dijkstra", weight=weight).optimal
+
+
+def test_unweighted_solver_rejects_costs() -> None:
+    with pytest.raises(ValueError):
+        create_solver("bfs").check_grid(parse_text(MAPS["costs"]))
+
+
+def test_dstar_lite_replans_after_wall_changes() -> None:
+    grid = generate_maze("random", 20, 20, 3)
+    solver = create_solver("dstar-lite")
+    solver.solve(grid)
+    changes = [(x, 10) for x in range(1, 19) if (x, 10) not in (grid.start, grid.finish)]
+    for position in changes:
+        grid.set_wall(*position)
+        result = solver.solve(grid)
+        expected = create_solver("dijkstra").solve(grid)
+        assert result.found == expected.found
+        assert result.cost == pytest.approx(expected.cost)
+
+
+def test_grid_change_log_is_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(Grid, "MAX_CHANGES", 4)
+    grid = Grid(10, 1)
+    revision = grid.revision
+    for x in range(10):
+        grid.set_wall(x, 0)
+
+    assert grid.revision == revision + 10
+    assert grid.get_changes(revision) is None
+    assert grid.get_changes(grid.revision - 2) == [8, 9]
@@ -0,0 +1,27 @@
+import io
+import os
+import pytest
+
+
+uic = pytest.importorskip("PyQt5.uic")
+PROJECT_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _strip_header(code: str) -> list:
+    """
+    :param code: код модуля, созданного pyuic5.
+    :return: строки кода без комментариев заголовка, в которых указаны имя файла и версия PyQt5.
+    """
+
+    return [line for line in code.splitlines() if not line.startswith("#")]
+
+
+def test_ui_module_matches_ui_file(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(PROJECT_DIR)
+    generated = io.StringIO()
+    uic.compileUi("resources/mainwindow.ui", generated)
+    with open(os.path.join("maze", "ui_mainwindow.py"), encoding="utf-8") as file:
+        module = file.read()
+
+    assert _strip_header(module) == _strip_header(generated.getvalue()), \
+        "maze/ui_mainwindow.py устарел: выполните pyuic5 resources/mainwindow.ui -o maze/ui_mainwindow.py"